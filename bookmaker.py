@@ -4,6 +4,8 @@ from fpdf import FPDF
 from pathlib import Path
 import warnings
 
+from src import publisher
+
 # ---------------------------------------------------------
 # SETUP: Fonts
 # ---------------------------------------------------------
@@ -50,10 +52,25 @@ class RoyalPDF(FPDF):
         self.set_text_color(50, 50, 50)
         self.cell(0, 10, f"{self.page_no()}", align="C")
 
+def render_toc(pdf, outline):
+    # Vishay Suchi: har chapter + page number (outline/bookmarks se hi)
+    pdf.set_y(25)
+    pdf.set_font("HindiBook", style="B", size=16)
+    pdf.set_text_color(0, 0, 0)
+    pdf.cell(0, 10, "विषय सूची", align="C", new_x="LMARGIN", new_y="NEXT")
+    pdf.ln(5)
+    pdf.set_font("HindiBook", size=11)
+    for section in outline:
+        if section.level:
+            continue
+        pdf.cell(pdf.epw - 15, 7, section.name)
+        pdf.cell(15, 7, str(section.page_number), align="R", new_x="LMARGIN", new_y="NEXT")
+
 # ---------------------------------------------------------
 # MAIN LOGIC
 # ---------------------------------------------------------
-def create_royal_pdf(book_title="My AI Novel"):
+def write_pdf(book, path):
+    # Publisher ka parsed document -> A5 PDF (bold/italic spans asli fonts se, replace() hack nahi)
     # Check for HarfBuzz (Matra Fixer)
     try:
         import uharfbuzz
@@ -63,34 +80,31 @@ def create_royal_pdf(book_title="My AI Novel"):
         print("👉 Run: pip install uharfbuzz")
         return
 
-    input_dir = Path("data/output_books")
-    
-    clean_title = "".join(c for c in book_title if c.isalnum() or c in (' ', '_')).replace(' ', '_')
-    output_pdf_path = Path(f"{clean_title}_Final_Fixed.pdf")
-    
-    files = sorted(list(input_dir.glob("*.md")))
-    if not files:
-        print("⚠️ Folder khaali hai bhai!")
-        return
-
-    font_paths = setup_fonts()
+    book_title = book["title"]
+    settings = book.get("settings", publisher.DEFAULTS)
+    # Publisher parent me ek baar resolve karta hai (parallel writers ek hi file pe download na karein)
+    font_paths = book.get("fonts") if {"Regular", "Bold"} <= set(book.get("fonts", {})) else setup_fonts()
 
     # Setup PDF (Compact Margins)
     pdf = RoyalPDF(book_title)
     pdf.set_auto_page_break(auto=True, margin=15)
     pdf.set_margins(left=15, top=15, right=15)
+    pdf.set_compression(True)
     
     # -----------------------------------------------------
     # 👇 MAGIC FIX: script="deva" (Devanagari)
     # -----------------------------------------------------
     # Ye batata hai ki Hindi matra kaise judegi
+    # Italic ka alag Devanagari font nahi hai, isliye I/BI wahi Regular/Bold
     pdf.add_font("HindiBook", fname=font_paths["Regular"])
-    pdf.add_font("HindiBookBd", fname=font_paths["Bold"])
+    pdf.add_font("HindiBook", style="B", fname=font_paths["Bold"])
+    pdf.add_font("HindiBook", style="I", fname=font_paths["Regular"])
+    pdf.add_font("HindiBook", style="BI", fname=font_paths["Bold"])
     
     # English Fonts (Standard)
     # Times is built-in
 
-    print(f"📚 Binding {len(files)} chapters (With Matra Fix)...")
+    print(f"📚 Binding {len(book['chapters'])} chapters (With Matra Fix)...")
 
     # --- TITLE PAGE ---
     pdf.add_page()
@@ -109,19 +123,27 @@ def create_royal_pdf(book_title="My AI Novel"):
     pdf.set_font("HindiBook", size=18)
     pdf.cell(0, 10, "✻", align="C", new_x="LMARGIN", new_y="NEXT")
 
+    # --- TOC PAGE (chapters likhne ke baad bharta hai) ---
+    if settings.get("pdf_toc", True):
+        pdf.add_page()
+        pdf.insert_toc_placeholder(render_toc, allow_extra_pages=True)
+
     # --- CHAPTERS ---
-    for file in files:
-        text = file.read_text(encoding="utf-8")
-        lines = text.split("\n")
-        
+    for doc in book["chapters"]:
         pdf.add_page()
-        
-        # Heading
-        heading = lines[0].replace("#", "").strip()
-        
+        blocks = doc["blocks"]
+
+        # Heading (pehla heading block, na ho toh chapter ka title)
+        first = blocks[0] if blocks and blocks[0]["type"] == "heading" else None
+        heading = publisher.plain(first["spans"]) if first else doc["title"]
+        if first:
+            blocks = blocks[1:]
+
         pdf.set_y(25)
-        pdf.set_font("HindiBookBd", size=16)
+        pdf.set_font("HindiBook", style="B", size=16)
         pdf.set_text_color(0, 0, 0)
+        # Outline (sidebar bookmarks) me chapter
+        pdf.start_section(heading, level=0)
         
         # script="deva" forces correct shaping for this cell
         pdf.cell(0, 10, heading, align="C", new_x="LMARGIN", new_y="NEXT")
@@ -134,16 +156,29 @@ def create_royal_pdf(book_title="My AI Novel"):
         pdf.ln(5)
 
         # Body Text
-        pdf.set_font("HindiBook", size=11) 
         pdf.set_text_color(10, 10, 10) 
-        
-        body_text = "\n".join(lines[1:])
-        body_text = body_text.replace("**", "").replace("*", "").replace("#", "")
-        
-        # Enable Shaping here too
-        # Note: FPDF2 with uharfbuzz installed auto-detects complex scripts 
-        # but passing the font correctly is key.
-        pdf.multi_cell(0, 6, body_text, align="J")
+        for block in blocks:
+            if block["type"] == "rule":
+                pdf.set_font("HindiBook", size=11)
+                pdf.cell(0, 8, "* * *", align="C", new_x="LMARGIN", new_y="NEXT")
+                continue
+
+            size = 13 if block["type"] == "heading" else 11
+            spans = block["spans"]
+            if block["type"] == "heading":
+                pdf.set_font("HindiBook", style="B", size=size)
+                pdf.multi_cell(0, 7, publisher.plain(spans), align="C")
+            elif all(not style for _, style in spans):
+                # Sada paragraph: justify
+                pdf.set_font("HindiBook", style="I" if block["type"] == "quote" else "", size=size)
+                pdf.multi_cell(0, 6, publisher.plain(spans), align="J")
+            else:
+                # Bold/italic wale tukde ek line flow me
+                for text, style in spans:
+                    pdf.set_font("HindiBook", style=style.upper(), size=size)
+                    pdf.write(6, text)
+                pdf.ln(6)
+            pdf.ln(2)
 
         # End Mark
         pdf.ln(10)
@@ -151,9 +186,20 @@ def create_royal_pdf(book_title="My AI Novel"):
         pdf.set_text_color(150, 150, 150)
         pdf.cell(0, 10, "--- ❦ ---", align="C", new_x="LMARGIN", new_y="NEXT")
 
-    pdf.output(output_pdf_path)
-    print(f"\n✅ DONE! Check: {output_pdf_path.resolve()}")
+    pdf.output(str(path))
+    # Compress (+ settings me ho toh linearize) aur size/first-page time report
+    publisher.optimize_pdf(path, linearize=settings.get("pdf_linearize", False))
+    return path
+
+
+def create_royal_pdf(book_title="My AI Novel"):
+    # Parse/cache publisher karta hai; yahan sirf PDF format
+    output_pdf_path = publisher.publish(book_title, ["pdf"]).get("pdf")
+    if not output_pdf_path:
+        return
+    print(f"\n✅ DONE! Check: {Path(output_pdf_path).resolve()}")
     print("👉 Ab 'Matra' check kar, 'HarfBuzz' ne sab jod diya hoga!")
+    return output_pdf_path
 
 if __name__ == "__main__":
-    create_royal_pdf(book_title="The Hobbit - Hindi Edition")
\ No newline at end of file
+    create_royal_pdf(book_title="The Hobbit - Hindi Edition")
@@ -1,13 +1,15 @@
 import sys
 import time
 import os
+import argparse
 from pathlib import Path
 from colorama import init, Fore, Style
 
 # Apne modules import karte hain
-from src.cleaner import clean_and_extract, generate_metadata
-from src.translator import translate_book
-from src.bookmaker import create_pdf
+from src.cleaner import clean_and_extract
+from src.translator import translate_book, split_text_smartly, build_prompt, build_system_instruction, load_config
+from src import profiler, shutdown, publisher
+from src.catalog import open_catalog
 
 # Color init (Windows support ke liye)
 init(autoreset=True)
@@ -53,17 +55,33 @@ def step_1_extract():
     target_pdf = pdfs[0]
     print(f"📄 Target PDF detected: {Fore.WHITE}{target_pdf.name}")
     
-    # Process
+    # Process (chapters/words seedha catalog me, book ka naam = PDF ka naam)
     output_dir = Path("data/raw_text")
-    clean_and_extract(target_pdf, output_dir)
-    generate_metadata(output_dir)
+    with profiler.stage("extract"):
+        clean_and_extract(target_pdf, output_dir, catalog=open_catalog(load_config()))
     return True
 
+def profile_text_stages():
+    # Sirf --profile me: chunking aur prompt building alag se naap lo (API call nahi)
+    files = sorted(Path("data/raw_text").glob("*.txt"))
+    with profiler.stage("chunking"):
+        chapters = [split_text_smartly(f.read_text(encoding="utf-8")) for f in files]
+    with profiler.stage("prompts"):
+        build_system_instruction(load_config())
+        for chunks in chapters:
+            prev_o, prev_t = "", ""
+            for idx, chunk in enumerate(chunks):
+                build_prompt(chunk, f"(Part {idx+1}/{len(chunks)})", prev_o, prev_t)
+                prev_o = prev_t = chunk[-1500:]
+
 def step_2_translate():
     print_step("Connecting to Gemini AI Brain...")
     # Translator script call
     try:
-        translate_book()
+        if profiler.enabled():
+            profile_text_stages()
+        with profiler.stage("translate"):
+            translate_book()
         print_success("Translation Phase Complete!")
         return True
     except Exception as e:
@@ -71,15 +89,18 @@ def step_2_translate():
         return False
 
 def step_3_publish():
-    print_step("Generating Final Professional PDF...")
+    print_step("Generating Final Professional PDF / HTML / EPUB...")
     try:
         # PDF Name user se pucho ya default
         book_title = input(f"{Fore.CYAN}📘 Book ka Title kya rakhna hai? (Enter for Default): {Style.RESET_ALL}").strip()
         if not book_title:
             book_title = "My_AI_Novel"
         
-        create_pdf(book_title)
-        return True
+        # Markdown ek baar parse, saare formats parallel
+        config = load_config()
+        with profiler.stage("publish"):
+            outputs = publisher.publish(book_title, settings=config.get("publish"), catalog=open_catalog(config))
+        return any(outputs.values())
     except Exception as e:
         print_error(f"Publishing failed: {e}")
         return False
@@ -95,7 +116,7 @@ def main():
         print(f"\n{Fore.MAGENTA}Select a Mission, Boss:{Style.RESET_ALL}")
         print("1. 📄 Extract Text from PDF")
         print("2. 🤖 Translate with AI (Gemini)")
-        print("3. 📕 Publish PDF (Markdown to PDF)")
+        print("3. 📕 Publish Book (PDF + HTML + EPUB)")
         print(f"{Fore.GREEN}4. 🚀 GOD MODE (Run All Steps){Style.RESET_ALL}")
         print("5. 🚪 Exit")
         
@@ -127,7 +148,18 @@ def main():
             print_error("Galat button daba diya. Phir se try kar.")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="AI Novel Translator")
+    parser.add_argument("--profile", nargs="?", const=str(profiler.REPORT_DIR), metavar="DIR",
+                        help="Har stage cProfile + tracemalloc ke saath; report DIR me (default data/profiles)")
+    parser.add_argument("--sample", type=float, nargs="?", const=0.005, metavar="SECONDS",
+                        help="--profile ke saath sampling profiler bhi (saare threads, .folded output)")
+    args = parser.parse_args()
+    if args.profile:
+        profiler.enable(args.profile, args.sample)
+
     try:
         main()
+    except shutdown.Cancelled:
+        print("\n\n⏸️ Translation roki gayi. Poore hue chunks save hain - dobara chalao, wahin se shuru hoga.")
     except KeyboardInterrupt:
         print("\n\n🛑 Process rok diya gaya.")
\ No newline at end of file
@@ -0,0 +1,237 @@
+import re
+import sys
+import time
+import sqlite3
+import threading
+from pathlib import Path
+
+from src import manifest, telemetry
+
+# -------------------------------
+# BILINGUAL INDEX (review ke liye)
+# -------------------------------
+# Chunks "\n\n" se jud ke .md bante hain aur source <-> translation ka rishta kho jaata hai.
+# Isliye har pass hua chunk translate hote hi yahan: chunk pair + uske sentence pairs (length-based alignment).
+# Sentences pe SQLite FTS5 index dono bhashaon ka; koi bhi English phrase -> Hindi, ya Hindi -> English,
+# poori catalogue (saari books) me milliseconds me.
+INDEX_PATH = Path("data/bitext.sqlite")
+DEFAULTS = {"enabled": True, "path": str(INDEX_PATH)}
+
+# Sentence khatam: . ! ? aur Hindi ka purn viram । ॥ (peeche quote/bracket ho toh wo bhi saath)
+SENTENCE = re.compile(r"[^.!?।॥]+(?:[.!?।॥]+[\"'”’)\]]*|$)")
+DEVANAGARI = re.compile(r"[ऀ-ॿ]")
+# Letters + numbers + combining marks (matra, anusvara, virama) - Hindi words poore rahte hain
+TOKENIZER = "\"unicode61 categories 'L* N* Co M*'\""
+
+# Alignment beads (source sentences, target sentences) -> penalty. 1:1 sabse sasta.
+BEADS = {(1, 1): 0.0, (2, 1): 1.5, (1, 2): 1.5, (1, 0): 4.0, (0, 1): 4.0}
+
+
+def split_sentences(text):
+    return [s.strip() for s in SENTENCE.findall(text) if s.strip()]
+
+
+def align_sentences(src, tgt):
+    """
+    Gale-Church jaisa DP: sentence lengths ka ratio poore block jaisa rahe.
+    Return: [(source, target), ...] - 2:1 / 1:2 merge ho jaate hain, akele sentence ka saathi "" hota hai.
+    """
+    n, m = len(src), len(tgt)
+    ratio = sum(map(len, tgt)) / max(sum(map(len, src)), 1)
+    inf = float("inf")
+    cost = [[inf] * (m + 1) for _ in range(n + 1)]
+    back = [[None] * (m + 1) for _ in range(n + 1)]
+    cost[0][0] = 0.0
+
+    for i in range(n + 1):
+        for j in range(m + 1):
+            if cost[i][j] == inf:
+                continue
+            for (di, dj), penalty in BEADS.items():
+                a, b = i + di, j + dj
+                if a > n or b > m:
+                    continue
+                s_len = sum(len(s) for s in src[i:a]) * ratio
+                t_len = sum(len(t) for t in tgt[j:b])
+                c = cost[i][j] + penalty + abs(t_len - s_len) / ((s_len + t_len) ** 0.5 + 1)
+                if c < cost[a][b]:
+                    cost[a][b] = c
+                    back[a][b] = (i, j)
+
+    pairs = []
+    i, j = n, m
+    while (i, j) != (0, 0):
+        pi, pj = back[i][j]
+        pairs.append((" ".join(src[pi:i]), " ".join(tgt[pj:j])))
+        i, j = pi, pj
+    return pairs[::-1]
+
+
+def align_chunk(source, translation):
+    """Paragraphs barabar hain toh har paragraph ke andar sentences, warna poora chunk ek block."""
+    src_paras = [p.strip() for p in re.split(r"\n+", source) if p.strip()]
+    tgt_paras = [p.strip() for p in re.split(r"\n+", translation) if p.strip()]
+    if len(src_paras) != len(tgt_paras):
+        src_paras, tgt_paras = [source], [translation]
+
+    pairs = []
+    for s, t in zip(src_paras, tgt_paras):
+        pairs.extend(align_sentences(split_sentences(s), split_sentences(t)))
+    return pairs
+
+
+def _phrase(text):
+    # FTS5 phrase query: user ka text jaisa hai waisa (quotes escape)
+    return '"' + text.replace('"', '""') + '"'
+
+
+class BilingualIndex:
+    def __init__(self, path=INDEX_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        # Queue workers alag processes me same file likhte hain - busy ho toh ruk jao
+        self.db = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self.db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS chunks (
+                id INTEGER PRIMARY KEY,
+                book TEXT,
+                chapter TEXT,
+                idx INTEGER,
+                hash TEXT,
+                source TEXT,
+                translation TEXT,
+                UNIQUE (book, chapter, idx)
+            );
+            """
+        )
+        self._ensure_sentences()
+
+    def _ensure_sentences(self):
+        """
+        Default unicode61 Devanagari matra/anusvara (category M*) ko separator maanta hai: "में" -> "म".
+        Isliye M* bhi token ka hissa. Purani file (bina TOKENIZER) ho toh table chunks se dobara banti hai.
+        """
+        row = self.db.execute("SELECT sql FROM sqlite_master WHERE name = 'sentences'").fetchone()
+        if row and "M*" in row[0]:
+            return
+        if row:
+            print("🔁 Bilingual index: purana tokenizer mila, sentences dobara index ho rahe hain...")
+            self.db.execute("DROP TABLE sentences")
+        self.db.execute(
+            "CREATE VIRTUAL TABLE sentences USING fts5("
+            f"source, target, chunk_id UNINDEXED, position UNINDEXED, tokenize = {TOKENIZER})"
+        )
+        rows = self.db.execute("SELECT id, source, translation FROM chunks").fetchall()
+        for chunk_id, source, translation in rows:
+            self.db.executemany(
+                "INSERT INTO sentences (source, target, chunk_id, position) VALUES (?, ?, ?, ?)",
+                [(s, t, chunk_id, pos) for pos, (s, t) in enumerate(align_chunk(source, translation))],
+            )
+        self.db.commit()
+
+    # --- write ---
+    def add_chunk(self, book, chapter, index, source, translation, commit=True):
+        """Chunk pehle se same hai toh kuch nahi; badla hai toh purane sentences hata ke naye."""
+        digest = manifest.text_hash(source + "\x00" + translation)
+        with self._lock:
+            row = self.db.execute(
+                "SELECT id, hash FROM chunks WHERE book = ? AND chapter = ? AND idx = ?", (book, chapter, index)
+            ).fetchone()
+            if row and row[1] == digest:
+                return False
+
+            if row:
+                self.db.execute("DELETE FROM sentences WHERE chunk_id = ?", (row[0],))
+                self.db.execute("UPDATE chunks SET hash = ?, source = ?, translation = ? WHERE id = ?",
+                                (digest, source, translation, row[0]))
+                chunk_id = row[0]
+            else:
+                chunk_id = self.db.execute(
+                    "INSERT INTO chunks (book, chapter, idx, hash, source, translation) VALUES (?, ?, ?, ?, ?, ?)",
+                    (book, chapter, index, digest, source, translation),
+                ).lastrowid
+
+            self.db.executemany(
+                "INSERT INTO sentences (source, target, chunk_id, position) VALUES (?, ?, ?, ?)",
+                [(s, t, chunk_id, pos) for pos, (s, t) in enumerate(align_chunk(source, translation))],
+            )
+            if commit:
+                self.db.commit()
+        telemetry.incr("bitext_chunks_indexed")
+        return True
+
+    # --- read ---
+    def search(self, phrase, lang=None, book=None, limit=20):
+        """
+        lang: "en" (source me dhundo), "hi" (translation me), None = phrase ki script se andaza.
+        Return: [{book, chapter, chunk, source, target, match}, ...] best first.
+        """
+        lang = lang or ("hi" if DEVANAGARI.search(phrase) else "en")
+        column, col_no = ("target", 1) if lang == "hi" else ("source", 0)
+        sql = (
+            f"SELECT c.book, c.chapter, c.idx, s.source, s.target, highlight(sentences, {col_no}, '[', ']') "
+            "FROM sentences s JOIN chunks c ON c.id = s.chunk_id "
+            "WHERE sentences MATCH ?" + (" AND c.book = ?" if book else "") + " ORDER BY rank LIMIT ?"
+        )
+        args = [f"{column} : {_phrase(phrase)}"] + ([book] if book else []) + [limit]
+
+        started = time.perf_counter()
+        with self._lock:
+            rows = self.db.execute(sql, args).fetchall()
+        telemetry.observe("bitext_search_seconds", time.perf_counter() - started)
+        return [
+            {"book": b, "chapter": ch, "chunk": idx, "source": s, "target": t, "match": hit}
+            for b, ch, idx, s, t, hit in rows
+        ]
+
+    def chunk(self, book, chapter, index):
+        """Poora chunk pair (search result ke aas-paas ka context dekhne ke liye)."""
+        with self._lock:
+            row = self.db.execute(
+                "SELECT source, translation FROM chunks WHERE book = ? AND chapter = ? AND idx = ?",
+                (book, chapter, index),
+            ).fetchone()
+        return {"source": row[0], "translation": row[1]} if row else None
+
+    def stats(self):
+        with self._lock:
+            books = self.db.execute("SELECT COUNT(DISTINCT book), COUNT(*) FROM chunks").fetchone()
+            sentences = self.db.execute("SELECT COUNT(*) FROM sentences").fetchone()[0]
+        return {"books": books[0], "chunks": books[1], "sentences": sentences}
+
+    def close(self):
+        with self._lock:
+            self.db.close()
+
+
+# -------------------------------
+# BUILD (purane manifests se)
+# -------------------------------
+def build_index(index, book, manifest_dir=manifest.MANIFEST_DIR):
+    added = 0
+    for path in sorted(Path(manifest_dir).glob("*.json")):
+        for entry in manifest.load(path).get("chunks", []):
+            if entry.get("ok") and entry.get("translation"):
+                added += index.add_chunk(book, path.stem, entry["index"], entry["source"], entry["translation"],
+                                         commit=False)
+    with index._lock:
+        index.db.commit()
+    print(f"🔎 Bilingual index: {added} chunks add/update ({index.stats()}).")
+    return added
+
+
+if __name__ == "__main__":
+    # python -m src.bitext build <book> [manifest_dir]
+    # python -m src.bitext search "phrase" [book]
+    if len(sys.argv) > 2 and sys.argv[1] == "build":
+        build_index(BilingualIndex(), sys.argv[2], sys.argv[3] if len(sys.argv) > 3 else manifest.MANIFEST_DIR)
+    elif len(sys.argv) > 2 and sys.argv[1] == "search":
+        started = time.perf_counter()
+        results = BilingualIndex().search(sys.argv[2], book=sys.argv[3] if len(sys.argv) > 3 else None)
+        for r in results:
+            print(f"📖 {r['book']} / {r['chapter']} #{r['chunk'] + 1}\n   EN: {r['source']}\n   HI: {r['target']}")
+        print(f"🔎 {len(results)} matches ({(time.perf_counter() - started) * 1000:.1f} ms)")
+    else:
+        print('Usage: python -m src.bitext build <book> [manifest_dir] | search "phrase" [book]')
@@ -1,29 +1,88 @@
-import markdown
-import os
+import shutil
 import webbrowser
+from html import escape
 from pathlib import Path
 
-def create_ebook(book_title="My AI Novel"):
-    input_dir = Path("data/output_books")
-    
-    # Filename clean karo
-    clean_title = "".join(c for c in book_title if c.isalnum() or c in (' ', '_')).replace(' ', '_')
-    output_html_path = Path(f"{clean_title}.html")
-    
-    # 1. Files Dhundo
-    files = sorted(list(input_dir.glob("*.md")))
-    
-    if not files:
-        print("⚠️ Bhai 'data/output_books' khaali hai!")
-        return
+from src import publisher
 
-    print(f"📚 Found {len(files)} chapters. Cooking up the E-Book...")
+# CSS Styling (Browser Friendly)
+CSS_STYLE = """
+@import url('https://fonts.googleapis.com/css2?family=Hind:wght@300;400;700&family=Merriweather:ital,wght@0,300;0,700;1,300&display=swap');
+
+body {
+    font-family: 'Hind', sans-serif;
+    line-height: 1.8;
+    color: #222;
+    max-width: 800px; /* Reading width */
+    margin: 0 auto;
+    padding: 40px;
+    background: #fff;
+}
+
+/* Print Specific Styles - Ye tab chalega jab tu PDF save karega */
+@media print {
+    body { max-width: 100%; padding: 0; }
+    .no-print { display: none !important; }
+    .page-break { page-break-before: always; }
+    a { text-decoration: none; color: #000; }
+}
+
+h1, h2, h3 {
+    font-family: 'Merriweather', serif;
+    color: #2c3e50;
+    text-align: center;
+}
+
+.title-page {
+    text-align: center;
+    margin-top: 150px;
+    margin-bottom: 200px;
+}
+
+h1 { font-size: 3em; margin-bottom: 0.2em; }
+.subtitle { font-size: 1.2em; color: #666; font-style: italic; }
+
+p {
+    margin-bottom: 1.5em;
+    text-align: justify;
+    font-size: 12pt;
+}
+
+/* Drop Cap */
+h1 + p::first-letter, h2 + p::first-letter {
+    font-size: 3.5em;
+    float: left;
+    margin-top: -10px;
+    margin-right: 0.1em;
+    line-height: 0.8;
+}
+
+/* Button Style */
+.print-btn {
+    position: fixed;
+    top: 20px;
+    right: 20px;
+    background: #e74c3c;
+    color: white;
+    padding: 10px 20px;
+    border: none;
+    border-radius: 5px;
+    cursor: pointer;
+    font-size: 16px;
+    font-weight: bold;
+    box-shadow: 0 4px 6px rgba(0,0,0,0.1);
+    z-index: 1000;
+}
+.print-btn:hover { background: #c0392b; }
+"""
+
+
+def write_html(book, path):
+    # Publisher ka parsed document -> ek page ki HTML (browser me "Save as PDF")
+    book_title = book["title"]
 
-    # 2. Master Markdown String
-    full_markdown = ""
-    
     # Title Page
-    full_markdown += f"""
+    html_body = f"""
 <div class="title-page">
     <h1>{book_title}</h1>
     <p class="subtitle">Translated by AI & Naveen (The Tech Boss)</p>
@@ -31,94 +90,18 @@ def create_ebook(book_title="My AI Novel"):
 <div class="page-break"></div>
 """
 
-    for file in files:
-        text = file.read_text(encoding="utf-8")
+    for doc in book["chapters"]:
         # Har chapter ke liye div wrap
-        full_markdown += f"\n\n<div class='chapter'>\n\n{text}\n\n</div><div class='page-break'></div>"
-
-    # 3. Convert to HTML
-    print("🔄 Converting Markdown to HTML...")
-    html_body = markdown.markdown(full_markdown, extensions=['extra'])
-
-    # 4. CSS Styling (Browser Friendly)
-    css_style = """
-    @import url('https://fonts.googleapis.com/css2?family=Hind:wght@300;400;700&family=Merriweather:ital,wght@0,300;0,700;1,300&display=swap');
-
-    body {
-        font-family: 'Hind', sans-serif;
-        line-height: 1.8;
-        color: #222;
-        max-width: 800px; /* Reading width */
-        margin: 0 auto;
-        padding: 40px;
-        background: #fff;
-    }
-
-    /* Print Specific Styles - Ye tab chalega jab tu PDF save karega */
-    @media print {
-        body { max-width: 100%; padding: 0; }
-        .no-print { display: none !important; }
-        .page-break { page-break-before: always; }
-        a { text-decoration: none; color: #000; }
-    }
-
-    h1, h2, h3 {
-        font-family: 'Merriweather', serif;
-        color: #2c3e50;
-        text-align: center;
-    }
-
-    .title-page {
-        text-align: center;
-        margin-top: 150px;
-        margin-bottom: 200px;
-    }
-    
-    h1 { font-size: 3em; margin-bottom: 0.2em; }
-    .subtitle { font-size: 1.2em; color: #666; font-style: italic; }
-
-    p {
-        margin-bottom: 1.5em;
-        text-align: justify;
-        font-size: 12pt;
-    }
-
-    /* Drop Cap */
-    h1 + p::first-letter, h2 + p::first-letter {
-        font-size: 3.5em;
-        float: left;
-        margin-top: -10px;
-        margin-right: 0.1em;
-        line-height: 0.8;
-    }
-
-    /* Button Style */
-    .print-btn {
-        position: fixed;
-        top: 20px;
-        right: 20px;
-        background: #e74c3c;
-        color: white;
-        padding: 10px 20px;
-        border: none;
-        border-radius: 5px;
-        cursor: pointer;
-        font-size: 16px;
-        font-weight: bold;
-        box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-        z-index: 1000;
-    }
-    .print-btn:hover { background: #c0392b; }
-    """
+        html_body += f"\n\n<div class='chapter'>\n{publisher.blocks_to_html(doc['blocks'])}\n</div><div class='page-break'></div>"
 
-    # 5. Final HTML with Print Button
+    # Final HTML with Print Button
     final_html = f"""
     <!DOCTYPE html>
     <html>
     <head>
         <meta charset="UTF-8">
         <title>{book_title}</title>
-        <style>{css_style}</style>
+        <style>{CSS_STYLE}</style>
     </head>
     <body>
         <button class="print-btn no-print" onclick="window.print()">🖨️ Save as PDF</button>
@@ -127,16 +110,158 @@ def create_ebook(book_title="My AI Novel"):
     </html>
     """
 
-    output_html_path.write_text(final_html, encoding="utf-8")
-    
+    Path(path).write_text(final_html, encoding="utf-8")
+    return path
+
+
+def create_ebook(book_title="My AI Novel", input_dir="data/output_books", output_dir=".", open_browser=True):
+    # Parse/cache publisher karta hai; yahan sirf HTML format
+    output_html_path = publisher.publish(book_title, ["html"], input_dir, output_dir).get("html")
+    if not output_html_path:
+        return
+    output_html_path = Path(output_html_path)
+
     print(f"\n✅ DONE! Open this file in Chrome/Edge: {output_html_path.resolve()}")
     print("👉 File open kar aur upar 'Save as PDF' button daba dena. Best quality milegi!")
     
-    # Try to open automatically
-    try:
-        webbrowser.open(f"file://{output_html_path.resolve()}")
-    except:
-        pass
-
-if __name__ == "__main__":
-    create_ebook(book_title="The Hobbit - Hindi Edition")
\ No newline at end of file
+    # Try to open automatically (service mode me browser nahi kholte)
+    if open_browser:
+        try:
+            webbrowser.open(f"file://{output_html_path.resolve()}")
+        except:
+            pass
+
+    return output_html_path
+
+
+# -------------------------------
+# SPLIT READER (har chapter alag page)
+# -------------------------------
+# Ek badi HTML ki jagah: index.html + chapter_NNN.html + shared style.css/reader.js + local fonts.
+# Pehla paint sirf ek chapter ka, book kitni bhi badi ho. Neeche pahunchte hi agla chapter
+# fetch hokar isi page me jud jaata hai (http pe); file:// pe "Agla →" link normal chalta hai.
+# Google Fonts ka @import nahi - offline bhi same dikhega.
+READER_FONTS = {"Regular": "Sahitya-Regular.ttf", "Bold": "Sahitya-Bold.ttf"}   # publisher.resolve_fonts() ke styles
+
+READER_CSS = """
+@font-face { font-family: 'BookHindi'; font-weight: normal;
+    src: local('Sahitya'), local('Noto Serif Devanagari'), local('Mangal'), url('fonts/Sahitya-Regular.ttf') format('truetype'); }
+@font-face { font-family: 'BookHindi'; font-weight: bold;
+    src: local('Sahitya Bold'), local('Noto Serif Devanagari Bold'), url('fonts/Sahitya-Bold.ttf') format('truetype'); }
+
+body {
+    font-family: 'BookHindi', 'Noto Sans Devanagari', serif;
+    line-height: 1.8;
+    color: #222;
+    max-width: 800px; /* Reading width */
+    margin: 0 auto;
+    padding: 24px;
+    background: #fff;
+}
+
+h1, h2, h3 { color: #2c3e50; text-align: center; }
+.title-page { text-align: center; margin: 3em 0; }
+.subtitle { color: #666; font-style: italic; }
+p { margin-bottom: 1.5em; text-align: justify; font-size: 12pt; }
+blockquote { margin: 1em 2em; font-style: italic; }
+article { margin-bottom: 4em; }
+
+nav.pager { display: flex; justify-content: space-between; border-top: 1px solid #ddd; padding: 1em 0; }
+nav.pager a { color: #e74c3c; text-decoration: none; font-weight: bold; }
+ol.toc { line-height: 2.2; }
+
+@media print {
+    body { max-width: 100%; padding: 0; }
+    nav.pager { display: none; }
+    article { page-break-before: always; }
+}
+"""
+
+READER_JS = """// Agla chapter neeche pahunchne se pehle hi fetch karke isi page me jod do.
+// file:// pe browsers fetch rok dete hain - wahan normal "Agla" link kaafi hai.
+(function () {
+  var pager = document.querySelector("nav.pager");
+  var next = document.querySelector("nav.pager a.next");
+  if (!pager || !next || location.protocol === "file:" || !("IntersectionObserver" in window)) return;
+  var loading = false;
+  var observer = new IntersectionObserver(function (entries) {
+    if (!entries[0].isIntersecting || loading) return;
+    loading = true;
+    var href = next.getAttribute("href");
+    fetch(href).then(function (r) { return r.text(); }).then(function (html) {
+      var page = new DOMParser().parseFromString(html, "text/html");
+      pager.parentNode.insertBefore(page.querySelector("article"), pager);
+      history.replaceState(null, "", href);
+      document.title = page.title;
+      var more = page.querySelector("nav.pager a.next");
+      if (more) {
+        next.setAttribute("href", more.getAttribute("href"));
+        loading = false;
+      } else {
+        next.remove();
+        observer.disconnect();
+      }
+    }).catch(function () { observer.disconnect(); });
+  }, { rootMargin: "1200px 0px" });
+  observer.observe(pager);
+})();
+"""
+
+
+def _reader_page(title, body, pager=""):
+    return f"""<!DOCTYPE html>
+<html lang="hi">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1">
+    <title>{escape(title)}</title>
+    <link rel="stylesheet" href="style.css">
+</head>
+<body>
+{body}
+{pager}
+<script src="reader.js" defer></script>
+</body>
+</html>
+"""
+
+
+def write_reader(book, path):
+    # path = folder (Book_reader/); return: index.html
+    folder = Path(path)
+    if folder.exists():
+        shutil.rmtree(folder)
+    (folder / "fonts").mkdir(parents=True)
+    # Fonts publisher ne parent process me resolve kiye (book["fonts"]); yahan sirf local copy, download nahi
+    fonts = book.get("fonts", {})
+    missing = []
+    for style, name in READER_FONTS.items():
+        if style in fonts and Path(fonts[style]).exists():
+            shutil.copy(fonts[style], folder / "fonts" / name)
+        else:
+            missing.append(name)
+    if missing:
+        print(f"⚠️ Reader fonts nahi mile ({', '.join(missing)}) - system ke Devanagari font se dikhega.")
+    (folder / "style.css").write_text(READER_CSS, encoding="utf-8")
+    (folder / "reader.js").write_text(READER_JS, encoding="utf-8")
+
+    book_title = book["title"]
+    names = [f"chapter_{n:03d}.html" for n in range(1, len(book["chapters"]) + 1)]
+    for n, (name, doc) in enumerate(zip(names, book["chapters"])):
+        prev_link = f'<a class="prev" href="{names[n - 1]}">← Pichla</a>' if n else '<a href="index.html">← Index</a>'
+        next_link = f'<a class="next" href="{names[n + 1]}">Agla →</a>' if n + 1 < len(names) else '<a href="index.html">Index</a>'
+        pager = f'<nav class="pager">{prev_link}<a href="index.html">☰</a>{next_link}</nav>'
+        article = f"<article id='{doc.get('id', name)}'>\n{publisher.blocks_to_html(doc['blocks'])}\n</article>"
+        (folder / name).write_text(_reader_page(f"{doc['title']} - {book_title}", article, pager), encoding="utf-8")
+
+    toc = "\n".join(f'<li><a href="{name}">{escape(doc["title"])}</a></li>' for name, doc in zip(names, book["chapters"]))
+    index = f"""<div class="title-page">
+    <h1>{escape(book_title)}</h1>
+    <p class="subtitle">Translated by AI & Naveen (The Tech Boss)</p>
+</div>
+<ol class="toc">
+{toc}
+</ol>"""
+    index_path = folder / "index.html"
+    index_path.write_text(_reader_page(book_title, index), encoding="utf-8")
+    return index_path
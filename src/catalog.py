@@ -0,0 +1,247 @@
+import sys
+import time
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+
+# -------------------------------
+# PROJECT CATALOG (SQLite)
+# -------------------------------
+# Purana data/metadata.json: extraction ke baad saari .txt dobara padh ke word count, aur "status: pending"
+# jo kabhi update nahi hota tha. Ab ek catalog: extraction isi pass me chapters likhta hai,
+# translation har chunk pe (tokens, time, model), publishing har artifact ka hash.
+# Progress ek SQL query hai - kitni bhi books, koi file scan nahi.
+CATALOG_PATH = Path("data/catalog.sqlite")
+DEFAULTS = {"enabled": True, "path": str(CATALOG_PATH)}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS books (
+    book TEXT PRIMARY KEY,
+    source TEXT,
+    raw_dir TEXT,
+    output_dir TEXT,
+    status TEXT,
+    chapters INTEGER DEFAULT 0,
+    words INTEGER DEFAULT 0,
+    tokens INTEGER DEFAULT 0,
+    extract_seconds REAL DEFAULT 0,
+    translate_seconds REAL DEFAULT 0,
+    publish_seconds REAL DEFAULT 0,
+    updated REAL
+);
+CREATE TABLE IF NOT EXISTS chapters (
+    book TEXT,
+    chapter TEXT,
+    position INTEGER,
+    title TEXT,
+    word_count INTEGER,
+    tokens INTEGER,
+    page_start INTEGER,
+    page_end INTEGER,
+    status TEXT,
+    chunks_total INTEGER DEFAULT 0,
+    updated REAL,
+    PRIMARY KEY (book, chapter)
+);
+CREATE TABLE IF NOT EXISTS chunks (
+    book TEXT,
+    chapter TEXT,
+    idx INTEGER,
+    ok INTEGER,
+    origin TEXT,
+    model TEXT,
+    tokens_in INTEGER,
+    tokens_out INTEGER,
+    seconds REAL,
+    updated REAL,
+    PRIMARY KEY (book, chapter, idx)
+);
+CREATE TABLE IF NOT EXISTS artifacts (
+    book TEXT,
+    format TEXT,
+    path TEXT,
+    sha256 TEXT,
+    bytes INTEGER,
+    seconds REAL,
+    updated REAL,
+    PRIMARY KEY (book, format)
+);
+"""
+
+
+def artifact_hash(path):
+    """File ka sha256; folder (reader) ho toh andar ki saari files naam ke order me."""
+    path = Path(path)
+    files = sorted(p for p in path.rglob("*") if p.is_file()) if path.is_dir() else [path]
+    digest = hashlib.sha256()
+    size = 0
+    for f in files:
+        digest.update(f.relative_to(path).as_posix().encode() if path.is_dir() else b"")
+        data = f.read_bytes()
+        digest.update(data)
+        size += len(data)
+    return digest.hexdigest(), size
+
+
+class Catalog:
+    def __init__(self, path=CATALOG_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        # Service jobs + queue workers (alag processes) same file likhte hain
+        self.db = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self.db.executescript(SCHEMA)
+
+    def _write(self, sql, args=()):
+        with self._lock:
+            self.db.execute(sql, args)
+            self.db.commit()
+
+    def _ensure_book(self, book):
+        self.db.execute("INSERT OR IGNORE INTO books (book, status, updated) VALUES (?, 'new', ?)", (book, time.time()))
+
+    # --- extraction ---
+    def record_extraction(self, book, source, raw_dir, chapters, seconds):
+        """clean_and_extract ke chapters (word_count/tokens/pages wahi ke wahi) - dobara file padhna nahi."""
+        now = time.time()
+        with self._lock:
+            # Re-extraction = naye chapter files, purana hisaab bekaar
+            for table in ("chapters", "chunks"):
+                self.db.execute(f"DELETE FROM {table} WHERE book = ?", (book,))
+            self._ensure_book(book)
+            self.db.execute(
+                "UPDATE books SET source = ?, raw_dir = ?, status = 'extracted', chapters = ?, words = ?, tokens = ?, "
+                "extract_seconds = ?, translate_seconds = 0, updated = ? WHERE book = ?",
+                (str(source), str(Path(raw_dir).resolve()), len(chapters), sum(c["word_count"] for c in chapters),
+                 sum(c.get("tokens", 0) for c in chapters), seconds, now, book),
+            )
+            self.db.executemany(
+                "INSERT INTO chapters (book, chapter, position, title, word_count, tokens, page_start, page_end, "
+                "status, updated) VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'pending', ?)",
+                [(book, Path(c["filename"]).stem, i, c["title"], c["word_count"], c.get("tokens", 0),
+                  c["pages"][0], c["pages"][1], now) for i, c in enumerate(chapters)],
+            )
+            self.db.commit()
+
+    # --- translation ---
+    def start_translation(self, book, output_dir):
+        with self._lock:
+            self._ensure_book(book)
+            self.db.execute("UPDATE books SET status = 'translating', output_dir = ?, updated = ? WHERE book = ?",
+                            (str(Path(output_dir).resolve()), time.time(), book))
+            self.db.commit()
+
+    def chapter_status(self, book, chapter, status, chunks_total=None):
+        # Extraction catalog se pehle hui ho toh chapter row yahin ban jaati hai
+        with self._lock:
+            self.db.execute(
+                "INSERT INTO chapters (book, chapter, status, chunks_total, updated) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (book, chapter) DO UPDATE SET status = excluded.status, "
+                "chunks_total = COALESCE(?, chunks_total), updated = excluded.updated",
+                (book, chapter, status, chunks_total or 0, time.time(), chunks_total),
+            )
+            self.db.commit()
+
+    def record_chunk(self, book, chapter, index, ok, origin, model=None, tokens_in=0, tokens_out=0, seconds=0.0):
+        if origin == "manifest":
+            # Pichli run ka chunk: pehle se hisaab hai toh wahi rehne do (asli tokens/time usi run ke the)
+            sql = "INSERT OR IGNORE INTO chunks VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+        else:
+            sql = "INSERT OR REPLACE INTO chunks VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+        self._write(sql, (book, chapter, index, int(bool(ok)), origin, model, tokens_in, tokens_out, seconds, time.time()))
+
+    def finish_translation(self, book, seconds, status="translated"):
+        self._write("UPDATE books SET status = ?, translate_seconds = translate_seconds + ?, updated = ? WHERE book = ?",
+                    (status, seconds, time.time(), book))
+
+    # --- publishing ---
+    def record_artifact(self, book, fmt, path, seconds):
+        digest, size = artifact_hash(path)
+        with self._lock:
+            self._ensure_book(book)
+            self.db.execute("INSERT OR REPLACE INTO artifacts VALUES (?, ?, ?, ?, ?, ?, ?)",
+                            (book, fmt, str(path), digest, size, seconds, time.time()))
+            self.db.commit()
+
+    def finish_publish(self, book, seconds):
+        self._write("UPDATE books SET status = 'published', publish_seconds = ?, updated = ? WHERE book = ?",
+                    (seconds, time.time(), book))
+
+    # --- queries ---
+    def resolve(self, directory):
+        """raw_text ya output_books folder -> book naam (CLI steps alag-alag chalte hain)."""
+        directory = str(Path(directory).resolve())
+        with self._lock:
+            row = self.db.execute(
+                "SELECT book FROM books WHERE raw_dir = ? OR output_dir = ? ORDER BY updated DESC LIMIT 1",
+                (directory, directory),
+            ).fetchone()
+        return row[0] if row else None
+
+    def progress(self, book=None):
+        """Har book: chapters done/total, chunks done/failed, tokens, time, artifacts."""
+        sql = """
+            SELECT b.book, b.status, b.chapters, b.words, b.tokens,
+                   b.extract_seconds, b.translate_seconds, b.publish_seconds,
+                   (SELECT COUNT(*) FROM chapters c WHERE c.book = b.book AND c.status = 'done'),
+                   (SELECT COALESCE(SUM(chunks_total), 0) FROM chapters c WHERE c.book = b.book),
+                   COALESCE(SUM(k.ok), 0), COUNT(k.idx) - COALESCE(SUM(k.ok), 0),
+                   COALESCE(SUM(k.tokens_in), 0), COALESCE(SUM(k.tokens_out), 0), COALESCE(SUM(k.seconds), 0),
+                   (SELECT group_concat(format) FROM artifacts a WHERE a.book = b.book)
+            FROM books b LEFT JOIN chunks k ON k.book = b.book
+        """ + ("WHERE b.book = ? " if book else "") + "GROUP BY b.book ORDER BY b.updated DESC"
+        with self._lock:
+            rows = self.db.execute(sql, (book,) if book else ()).fetchall()
+        keys = ("book", "status", "chapters", "words", "tokens", "extract_seconds", "translate_seconds",
+                "publish_seconds", "chapters_done", "chunks_total", "chunks_done", "chunks_failed",
+                "tokens_in", "tokens_out", "chunk_seconds", "artifacts")
+        result = [dict(zip(keys, row)) for row in rows]
+        for item in result:
+            item["artifacts"] = sorted((item["artifacts"] or "").split(",")) if item["artifacts"] else []
+        return result
+
+    def chapters(self, book):
+        sql = """
+            SELECT c.chapter, c.title, c.word_count, c.status, c.chunks_total,
+                   COALESCE(SUM(k.ok), 0), COUNT(k.idx) - COALESCE(SUM(k.ok), 0),
+                   COALESCE(SUM(k.tokens_in), 0), COALESCE(SUM(k.tokens_out), 0), COALESCE(SUM(k.seconds), 0)
+            FROM chapters c LEFT JOIN chunks k ON k.book = c.book AND k.chapter = c.chapter
+            WHERE c.book = ? GROUP BY c.chapter ORDER BY c.position, c.chapter
+        """
+        keys = ("chapter", "title", "word_count", "status", "chunks_total", "chunks_done", "chunks_failed",
+                "tokens_in", "tokens_out", "seconds")
+        with self._lock:
+            return [dict(zip(keys, row)) for row in self.db.execute(sql, (book,))]
+
+    def artifacts(self, book):
+        with self._lock:
+            rows = self.db.execute("SELECT format, path, sha256, bytes, seconds FROM artifacts WHERE book = ?",
+                                   (book,)).fetchall()
+        return [dict(zip(("format", "path", "sha256", "bytes", "seconds"), row)) for row in rows]
+
+    def close(self):
+        with self._lock:
+            self.db.close()
+
+
+def open_catalog(config):
+    settings = {**DEFAULTS, **config.get("catalog", {})}
+    return Catalog(settings["path"]) if settings["enabled"] else None
+
+
+if __name__ == "__main__":
+    # python -m src.catalog          -> saari books ka progress
+    # python -m src.catalog <book>   -> us book ke chapters
+    catalog = Catalog()
+    if len(sys.argv) > 1:
+        for c in catalog.chapters(sys.argv[1]):
+            print(f"  {c['chapter']:<40} {c['status']:<12} {c['chunks_done']}/{c['chunks_total']} chunks"
+                  f"  {c['tokens_in']}→{c['tokens_out']} tokens  {c['seconds']:.1f}s")
+        for a in catalog.artifacts(sys.argv[1]):
+            print(f"  📦 {a['format']:<7} {a['path']}  {a['bytes'] // 1024} KB  sha256:{a['sha256'][:12]}")
+    else:
+        for b in catalog.progress():
+            print(f"📘 {b['book']} [{b['status']}]  chapters {b['chapters_done']}/{b['chapters']}, "
+                  f"chunks {b['chunks_done']}/{b['chunks_total']} ({b['chunks_failed']} fail), "
+                  f"{b['words']} words, artifacts: {', '.join(b['artifacts']) or '-'}")
@@ -1,12 +1,413 @@
 import fitz  # PyMuPDF
+import os
 import re
-import json
+import time
+import hashlib
 import shutil  # Folder saaf karne ke liye
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 
-def clean_and_extract(pdf_path, output_dir):
+from src import profiler, telemetry
+from src.catalog import Catalog
+
+OCR_CACHE_DIR = Path("data/cache/ocr")
+
+# Purana full-text regex ab sirf fallback hai
+CHAPTER_PATTERN = r"^(?:Chapter|CHAPTER|अध्याय|Section)\s+(?:\d+|[IVX]+).*"
+
+# Heading "chapter jaisi" hai ya front/back matter (Title page, Note, Copyright...)
+CHAPTER_TITLE = re.compile(r"^(?:chapter|अध्याय|section|part|book|prologue|epilogue)\b", flags=re.IGNORECASE)
+
+# TOC/heading me ye cheezein chapter nahi hain
+SKIP_TITLES = re.compile(
+    r"^(?:contents|table of contents|index|copyright|cover|title page|विषय[- ]?सूची)$",
+    flags=re.IGNORECASE,
+)
+
+
+# -------------------------------
+# PAGE CLEANING
+# -------------------------------
+def clean_page_text(text):
+    lines = text.split('\n')
+    cleaned_lines = []
+    for line in lines:
+        # Page numbers filter
+        if len(line.strip()) < 4 and line.strip().isdigit():
+            continue
+        cleaned_lines.append(line)
+    return "\n".join(cleaned_lines)
+
+
+def estimate_tokens(text):
+    # Words + punctuation + newlines. Hard line-break ek alag token banta hai,
+    # isliye reflow ka fayda isme dikhta hai (chars/4 me nahi dikhta)
+    return len(re.findall(r"\w+|[^\w\s]|\n", text))
+
+
+# -------------------------------
+# PARALLEL PAGE EXTRACTION
+# -------------------------------
+def page_image_hash(doc, page):
+    # Page ki embedded images ke raw bytes ka hash: render kiye bina cache key
+    digest = hashlib.sha256(f"{page.rect}".encode())
+    for img in page.get_images(full=True):
+        digest.update(doc.xref_stream_raw(img[0]) or b"")
+    return digest.hexdigest()[:24]
+
+
+def ocr_page(doc, page, language="eng", dpi=300, cache_dir=OCR_CACHE_DIR):
+    """
+    Text layer khaali hai (scanned page) toh Tesseract (PyMuPDF OCR) se padho.
+    Result page-image hash se cache hota hai; dobara extraction instant.
+    Return: (text, status) - status "cached" / "ocr" / "failed"
+    """
+    cache_file = Path(cache_dir) / f"{page_image_hash(doc, page)}.{language}.txt"
+    if cache_file.exists():
+        return cache_file.read_text(encoding="utf-8"), "cached"
+
+    try:
+        textpage = page.get_textpage_ocr(language=language, dpi=dpi, full=True)
+        text = page.get_text("text", textpage=textpage)
+    except RuntimeError as e:
+        # Tesseract install nahi / tessdata nahi mila
+        print(f"⚠️ OCR failed on page {page.number + 1}: {e}")
+        return "", "failed"
+
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    cache_file.write_text(text, encoding="utf-8")
+    return text, "ocr"
+
+
+def _extract_lines_worker(job):
+    # Har worker apna doc kholta hai (fitz objects pickle nahi hote)
+    pdf_path, page_numbers, ocr_language = job
+    doc = fitz.open(pdf_path)
+    result = []
+    stats = {"ocr_pages": 0, "ocr_cached": 0, "ocr_failed": 0, "ocr_seconds": 0.0}
+    for n in page_numbers:
+        page = doc[n]
+        text = page.get_text("text")
+
+        # Text layer nahi hai par image hai = scanned page.
+        # Ek baar OCR fail (Tesseract nahi) toh is batch me dobara try nahi.
+        if not text.strip() and page.get_images() and not stats["ocr_failed"]:
+            start = time.process_time()
+            text, status = ocr_page(doc, page, ocr_language)
+            if status == "ocr":
+                stats["ocr_pages"] += 1
+                stats["ocr_seconds"] += time.process_time() - start
+            else:
+                stats[f"ocr_{status}"] += 1
+
+        result.append((n, estimate_tokens(text), clean_page_text(text).split("\n")))
+    return result, stats
+
+
+def extract_all_pages(pdf_path, page_count, pool, ocr_language="eng"):
+    """Return: (pages [[line, ...], ...], raw tokens per page)"""
+    batch = max(1, page_count // ((os.cpu_count() or 1) * 4))
+    jobs = [(str(pdf_path), range(i, min(i + batch, page_count)), ocr_language) for i in range(0, page_count, batch)]
+
+    pages = [None] * page_count
+    raw_tokens = [0] * page_count
+    totals = {"ocr_pages": 0, "ocr_cached": 0, "ocr_failed": 0, "ocr_seconds": 0.0}
+    for result, stats in pool.map(profiler.for_workers(_extract_lines_worker), jobs):
+        for n, tokens, lines in result:
+            pages[n] = lines
+            raw_tokens[n] = tokens
+        for key in totals:
+            totals[key] += stats[key]
+
+    if totals["ocr_pages"] or totals["ocr_cached"]:
+        # CPU seconds worker ke andar naape hain, isliye ye rate per core hai
+        rate = totals["ocr_pages"] / totals["ocr_seconds"] if totals["ocr_seconds"] else 0
+        print(
+            f"🔠 OCR: {totals['ocr_pages']} pages scanned, {totals['ocr_cached']} from cache "
+            f"({rate:.2f} pages/sec per core, {totals['ocr_seconds']:.1f} CPU sec)"
+        )
+    return pages, raw_tokens
+
+
+# -------------------------------
+# HEADER / FOOTER REMOVAL
+# -------------------------------
+def _normalize_edge_line(line):
+    # "The Hobbit  23" aur "The Hobbit 24" ek hi header hain
+    return re.sub(r"\d+", "#", line.strip().lower())
+
+
+def find_repeated_lines(pages, edge_lines=3, min_pages=4, min_fraction=0.05, max_len=80):
     """
-    Ab ye function 'Smart' hai. Ye nakli/chote chapters ko ignore karega.
+    Har page ki upar/neeche ki kuch lines dekho. Jo (chhoti) line bahut saare pages pe
+    same jagah aaye woh running header/footer hai.
+    """
+    counts = Counter()
+    for lines in pages:
+        body = [line for line in lines if line.strip()]
+        edges = {line for line in body[:edge_lines] + body[-edge_lines:] if len(line.strip()) <= max_len}
+        counts.update({_normalize_edge_line(line) for line in edges})
+
+    threshold = max(min_pages, int(len(pages) * min_fraction))
+    return {line for line, n in counts.items() if n >= threshold and line}
+
+
+def strip_repeated_lines(lines, repeated, edge_lines=3):
+    body = [i for i, line in enumerate(lines) if line.strip()]
+    edges = set(body[:edge_lines] + body[-edge_lines:])
+    return [
+        line for i, line in enumerate(lines)
+        if not (i in edges and _normalize_edge_line(line) in repeated)
+    ]
+
+
+# -------------------------------
+# PARAGRAPH REFLOW
+# -------------------------------
+# Page ki seema (_slice_chapter lagata hai): khali line nahi, isliye paragraph apne aap nahi tootta
+PAGE_BREAK = "\f"
+# Line sentence pe khatam: . ! ? … (peeche quote/bracket ho toh bhi)
+TERMINAL = re.compile(r"[.!?…][\"'”’)\]]*$")
+
+
+def book_vocabulary(pages):
+    """Poori book ke (lowercase) words - "-" pe tooti line ka joda hua roop asli word hai ya nahi."""
+    return {w for lines in pages for line in lines for w in re.findall(r"[a-z]+", line.lower())}
+
+
+def _join_hyphenated(head, tail, vocabulary):
+    """
+    "some-" + "thing": juda hua roop book me kahin aur aaya ho toh "something".
+    Warna asli hyphen hai ("dining-" + "rooms" -> "dining-rooms"), sirf space nahi lagta.
+    """
+    first = re.search(r"[A-Za-z]+-$", head)
+    second = re.match(r"[a-z]+", tail)
+    if first and second and vocabulary and (first.group()[:-1] + second.group()).lower() in vocabulary:
+        return head[:-1] + tail
+    return head + tail
+
+
+def reflow_paragraphs(lines, short_fraction=0.75, vocabulary=None):
+    """
+    PDF ki hard line-wraps jod ke asli paragraphs banao.
+    Rule: poori width wali line = paragraph aage chal raha hai;
+    chhoti line (ya khali line) = paragraph khatam. Page badalne pe paragraph tabhi khatam jab
+    pichli line sentence pe rukti ho. "-" pe tooti line bina space ke judti hai (vocabulary: book_vocabulary).
+    """
+    lines = [line if line == PAGE_BREAK else line.strip() for line in lines]
+    widths = sorted(len(line) for line in lines if line and line != PAGE_BREAK)
+    if not widths:
+        return ""
+    # Typical line width (upar wala percentile, taaki chhoti lines median na gira dein)
+    full_width = widths[int(len(widths) * 0.8)]
+
+    paragraphs = []
+    current = []
+    for line in lines:
+        if line == PAGE_BREAK:
+            # Page ke neeche poori line aur sentence adhoora = agle page pe wahi paragraph
+            if current and TERMINAL.search(current[-1]):
+                paragraphs.append(" ".join(current))
+                current = []
+            continue
+        if not line:
+            if current:
+                paragraphs.append(" ".join(current))
+                current = []
+            continue
+
+        if current and current[-1].endswith("-") and line[:1].isalpha():
+            # Line ke aakhir me toota word: "some-" + "thing" -> "something", "dining-" + "rooms" -> "dining-rooms"
+            current[-1] = _join_hyphenated(current[-1], line, vocabulary)
+        else:
+            current.append(line)
+
+        if len(line) < full_width * short_fraction:
+            paragraphs.append(" ".join(current))
+            current = []
+
+    if current:
+        paragraphs.append(" ".join(current))
+
+    return "\n\n".join(paragraphs)
+
+
+# -------------------------------
+# CHAPTER DETECTION
+# -------------------------------
+def _to_ranges(starts, page_count):
+    """
+    [(title, start_page, offset)] -> [(title, start, end, offset, end_offset)]
+    Pages 0-based, end inclusive. offset = heading ka char offset start page pe ("\n".join(lines) me).
+    Agla heading page ke beech me ho toh wo page dono chapters ka: end_offset tak is chapter ka, baaki agle ka.
+    end_offset None = poora end page.
+    """
+    starts = sorted(starts, key=lambda item: (item[1], item[2]))
+    ranges = []
+    for i, (title, start, offset) in enumerate(starts):
+        if i + 1 < len(starts):
+            _, next_page, next_offset = starts[i + 1]
+            end, end_offset = (next_page, next_offset) if next_offset else (next_page - 1, None)
+        else:
+            end, end_offset = page_count - 1, None
+        if end < start:
+            end, end_offset = start, None
+        ranges.append((title, start, end, offset, end_offset))
+    return ranges
+
+
+def _heading_offset(pages, page_no, title):
+    """
+    Heading page pe kahan hai: apni line(s) pe poora title (case/whitespace ki parwah nahi).
+    Na mile (TOC title text se alag, ya pages nahi) toh 0 = page ki shuruaat, purana behaviour.
+    """
+    words = title.split()
+    if pages is None or not words:
+        return 0
+    text = "\n".join(pages[page_no])
+    pattern = r"^[ \t]*" + r"\s+".join(re.escape(w) for w in words) + r"[ \t]*$"
+    match = re.search(pattern, text, flags=re.IGNORECASE | re.MULTILINE)
+    return match.start() if match else 0
+
+
+def _slice_chapter(pages, start, end, offset, end_offset):
+    """
+    Chapter ki lines: start page offset se, end page end_offset tak (baaki pages poore).
+    Pages ke beech PAGE_BREAK; page ke upar/neeche ki khali lines nahi (wo paragraph break nahi hain).
+    """
+    lines = []
+    for n in range(start, end + 1):
+        text = "\n".join(pages[n])
+        cut_end = end_offset if n == end and end_offset is not None else len(text)
+        cut_start = offset if n == start else 0
+        if lines:
+            lines.append(PAGE_BREAK)
+        lines.extend(text[cut_start:cut_end].strip("\n").split("\n"))
+    return lines
+
+
+def detect_chapters_from_toc(doc, pages=None):
+    """PDF outline (bookmarks) se chapters. Sabse bharosemand tareeka."""
+    toc = doc.get_toc(simple=True)  # [[level, title, page(1-based)], ...]
+    if not toc:
+        return []
+
+    # Level 1 pe 2 se kam entries hain (jaise sirf book ka naam) toh next level lo
+    levels = Counter(level for level, _, page in toc if page >= 1)
+    level = next((lvl for lvl in sorted(levels) if levels[lvl] >= 2), None)
+    if level is None:
+        return []
+
+    starts = []
+    seen = set()
+    for lvl, title, page in toc:
+        if lvl != level or page < 1:
+            continue
+        # Ek page pe do chapters tabhi jab dono headings text me alag jagah milein
+        offset = _heading_offset(pages, page - 1, title)
+        if (page - 1, offset) in seen:
+            continue
+        seen.add((page - 1, offset))
+        starts.append((title.strip(), page - 1, offset))
+
+    return _to_ranges(starts, doc.page_count)
+
+
+def detect_chapters_from_layout(doc, pages=None, size_factor=1.35, top_fraction=0.4):
+    """
+    Font-size se headings: body text ka size sabse common hota hai,
+    page ke upar wali badi short line = chapter heading.
+    """
+    sizes = Counter()
+    candidates = []  # (page_no, size, text)
+
+    for page_no, page in enumerate(doc):
+        page_height = page.rect.height
+        page_lines = []
+        for block in page.get_text("dict")["blocks"]:
+            if block.get("type") != 0:
+                continue
+            for line in block["lines"]:
+                text = "".join(span["text"] for span in line["spans"]).strip()
+                if not text:
+                    continue
+                size = max(span["size"] for span in line["spans"])
+                sizes[round(size, 1)] += len(text)
+                if line["bbox"][1] <= page_height * top_fraction:
+                    page_lines.append((round(size, 1), text))
+        candidates.append((page_no, page_lines))
+
+    if not sizes:
+        return []
+    body_size = sizes.most_common(1)[0][0]
+
+    starts = []
+    for page_no, page_lines in candidates:
+        # Page ke upar ki lagataar badi lines = ek heading ("CHAPTER I" + "AN UNEXPECTED PARTY")
+        heading = []
+        for size, text in page_lines:
+            if size >= body_size * size_factor and len(text.split()) <= 12:
+                heading.append(text)
+            elif heading:
+                break
+        if heading:
+            title = " ".join(heading)
+            starts.append((title, page_no, _heading_offset(pages, page_no, title)))
+
+    if len(starts) < 2:
+        return []
+    return _to_ranges(starts, doc.page_count)
+
+
+def detect_chapters_from_regex(doc, pages):
+    """Purana tareeka: text + regex. Sirf jab TOC aur layout dono fail hon (OCR text pe bhi chalta hai)."""
+    starts = []
+    for page_no, lines in enumerate(pages):
+        text = "\n".join(lines)
+        match = re.search(CHAPTER_PATTERN, text, flags=re.MULTILINE)
+        if match:
+            starts.append((match.group().strip(), page_no, match.start()))
+
+    return _to_ranges(starts, doc.page_count)
+
+
+def detect_chapters(doc, pages):
+    for name, detector in (
+        ("PDF outline", lambda: detect_chapters_from_toc(doc, pages)),
+        ("font-size headings", lambda: detect_chapters_from_layout(doc, pages)),
+        ("regex", lambda: detect_chapters_from_regex(doc, pages)),
+    ):
+        chapters = [c for c in detector() if not SKIP_TITLES.match(c[0])]
+        # Kam se kam 2 asli "Chapter ..." mile toh front/back matter hata do.
+        # Ranges pehle ban chuki hain, isliye aakhri chapter back matter tak nahi khinchta.
+        named = [c for c in chapters if CHAPTER_TITLE.match(c[0])]
+        if len(named) >= 2:
+            chapters = named
+        if chapters:
+            print(f"🔎 Chapter detection: {name} ({len(chapters)} candidates)")
+            return chapters
+    return []
+
+
+def safe_name(title):
+    chapter_title = title.strip().replace(" ", "_").replace(":", "")
+    return "".join([c for c in chapter_title if c.isalnum() or c in "_"])[:60]
+
+
+# -------------------------------
+# MAIN EXTRACTOR
+# -------------------------------
+def clean_and_extract(pdf_path, output_dir, workers=None, ocr_language="eng", catalog=None, book=None):
+    """
+    Ab ye function 'Smart' hai. Pehle PDF outline, phir font-size headings,
+    aakhri me regex. Nakli/chote chapters ko ignore karega.
+    Pages parallel workers me nikalte hain (scanned pages OCR hote hain);
+    header/footer hata ke paragraphs reflow hote hain.
+    catalog diya ho toh chapters/words/tokens isi pass me catalog me (book = naam, default PDF ka naam).
+    Return: [{"filename", "title", "word_count", "tokens", "pages", "offset"}, ...]
+    (offset = heading ka char offset pages[0] pe; page ke beech se shuru hua chapter)
     """
     print(f"📂 Processing: {pdf_path}")
     
@@ -16,96 +417,83 @@ def clean_and_extract(pdf_path, output_dir):
     output_dir.mkdir(parents=True, exist_ok=True) # Naya banao
 
     # 1. PDF Load karo
+    started = time.perf_counter()
     doc = fitz.open(pdf_path)
-    full_text = ""
-    
-    print("⏳ Extracting text layer... (thoda time lagega)")
-    for page in doc:
-        text = page.get_text("text")
-        
-        # --- CLEANING ---
-        lines = text.split('\n')
-        cleaned_lines = []
-        for line in lines:
-            # Page numbers filter
-            if len(line.strip()) < 4 and line.strip().isdigit():
-                continue 
-            cleaned_lines.append(line)
-        
-        full_text += "\n".join(cleaned_lines) + "\n"
-
-    # 2. Smart Chapter Detection
-    pattern = r"^(?:Chapter|CHAPTER|अध्याय|Section)\s+(?:\d+|[IVX]+).*"
-    matches = list(re.finditer(pattern, full_text, flags=re.MULTILINE))
-
-    if not matches:
-        print("⚠️ Koi Chapter headings nahi mili! Puri book ek file me save hogi.")
-        (output_dir / "full_book.txt").write_text(full_text, encoding="utf-8")
-        return
-
-    print(f"🔥 Found {len(matches)} Potential Chapters. Filtering junk now...")
-    
-    valid_chapter_count = 0  # Isse count karenge asli chapters
-    
-    for i, match in enumerate(matches):
-        start = match.start()
-        end = matches[i + 1].start() if i + 1 < len(matches) else len(full_text)
-        
-        chapter_content = full_text[start:end]
-        
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # 2. Text layer parallel me (scanned pages ke liye OCR)
+        print("⏳ Extracting text layer... (parallel workers)")
+        pages, raw_tokens = extract_all_pages(pdf_path, doc.page_count, pool, ocr_language)
+
+        if not any(line.strip() for lines in pages for line in lines):
+            print("❌ PDF me koi text nahi mila (OCR bhi khaali). Tesseract install hai?")
+            return []
+
+        # 3. Running headers/footers poori book ke pages dekh ke milte hain
+        repeated = find_repeated_lines(pages)
+        if repeated:
+            print(f"🧹 Removing {len(repeated)} repeated header/footer line(s): {sorted(repeated)[:3]}...")
+        pages = [strip_repeated_lines(lines, repeated) for lines in pages]
+
+        # 4. Smart Chapter Detection (page ranges + heading offset)
+        chapters = detect_chapters(doc, pages)
+
+        if not chapters:
+            print("⚠️ Koi Chapter headings nahi mili! Puri book ek file me save hogi.")
+            chapters = [("full_book", 0, doc.page_count - 1, 0, None)]
+        else:
+            print(f"🔥 Found {len(chapters)} Potential Chapters. Filtering junk now...")
+
+        # 5. Reflow bhi workers me (har chapter ek job). Heading page ke beech me ho toh
+        #    upar ka text pichle chapter ka hai, naye ka nahi.
+        chapter_lines = [_slice_chapter(pages, start, end, offset, end_offset)
+                         for _, start, end, offset, end_offset in chapters]
+        reflow = partial(reflow_paragraphs, vocabulary=book_vocabulary(pages))
+        texts = list(pool.map(profiler.for_workers(reflow), chapter_lines))
+
+    valid_chapters = []  # Isse count karenge asli chapters
+    tokens_before = 0
+    tokens_after = 0
+
+    for (title, start, end, offset, _), chapter_content in zip(chapters, texts):
         # --- 🚧 THE BOUNCER LOGIC (Game Changer) 🚧 ---
         # Agar chapter me 100 words se kam hain, toh wo Chapter nahi hai (TOC/Header hai)
         word_count = len(chapter_content.split())
-        if word_count < 100:
-            print(f"🗑️ Skipped Junk/Header: {match.group().strip()} (Only {word_count} words)")
+        if word_count < 100 and len(chapters) > 1:
+            print(f"🗑️ Skipped Junk/Header: {title} (Only {word_count} words)")
             continue
 
+        tokens = estimate_tokens(chapter_content)
+        tokens_before += sum(raw_tokens[start:end + 1])
+        tokens_after += tokens
+
         # Agar pass ho gaya, toh save karo
-        valid_chapter_count += 1
-        
-        chapter_title = match.group().strip().replace(" ", "_").replace(":", "")
-        safe_filename = "".join([c for c in chapter_title if c.isalnum() or c in "_"])
-        
-        # Filename me 'valid_chapter_count' use karenge taaki sequence (01, 02) na tute
-        file_path = output_dir / f"{valid_chapter_count:02d}_{safe_filename}.txt"
+        # Filename me sequence number use karenge taaki sequence (01, 02) na tute
+        if len(chapters) == 1 and title == "full_book":
+            file_path = output_dir / "full_book.txt"
+        else:
+            file_path = output_dir / f"{len(valid_chapters) + 1:02d}_{safe_name(title)}.txt"
         file_path.write_text(chapter_content, encoding="utf-8")
-        print(f"✅ Saved: {file_path.name} ({word_count} words)")
+        valid_chapters.append({"filename": file_path.name, "title": title, "word_count": word_count,
+                               "tokens": tokens, "pages": [start, end], "offset": offset})
+        print(f"✅ Saved: {file_path.name} ({word_count} words, pages {start + 1}-{end + 1})")
+
+    if tokens_before:
+        saved = 100 * (tokens_before - tokens_after) / tokens_before
+        print(f"📉 Input tokens (approx): {tokens_before} → {tokens_after} ({saved:.1f}% kam)")
+
+    elapsed = time.perf_counter() - started
+    telemetry.observe("stage_duration_seconds", elapsed, stage="extract")
+    if catalog:
+        catalog.record_extraction(book or Path(pdf_path).stem, pdf_path, output_dir, valid_chapters, elapsed)
+        print(f"🗂️ Catalog: {len(valid_chapters)} chapters, {sum(c['word_count'] for c in valid_chapters)} words")
+    return valid_chapters
 
-def generate_metadata(raw_text_dir, output_file="data/metadata.json"):
-    print("\n📊 Generating Metadata report...")
-    raw_path = Path(raw_text_dir)
-    files = sorted(list(raw_path.glob("*.txt")))
-    
-    if not files:
-        print("⚠️ Koi files nahi mili!")
-        return
-
-    total_words = 0
-    chapters_info = []
-
-    for f in files:
-        text = f.read_text(encoding="utf-8")
-        word_count = len(text.split())
-        total_words += word_count
-        chapters_info.append({"filename": f.name, "word_count": word_count, "status": "pending"})
-
-    metadata = {
-        "project_name": "My AI Book",
-        "total_chapters": len(files),
-        "total_words": total_words,
-        "average_words_per_chapter": total_words // len(files) if files else 0,
-        "chapters": chapters_info
-    }
-
-    with open(output_file, "w", encoding="utf-8") as f:
-        json.dump(metadata, f, indent=4)
-    print(f"✅ Metadata saved! Total Real Chapters: {len(files)}")
 
 if __name__ == "__main__":
     pdf_file = "data/input_pdfs/The Hobbt.pdf"
     out_path = Path("data/raw_text")
     if Path(pdf_file).exists():
-        clean_and_extract(pdf_file, out_path)
-        generate_metadata(out_path)
+        clean_and_extract(pdf_file, out_path, catalog=Catalog())
     else:
         print("❌ PDF Missing!")
\ No newline at end of file
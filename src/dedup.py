@@ -0,0 +1,134 @@
+import re
+import hashlib
+import threading
+from collections import Counter
+
+from src import telemetry
+from src.keypool import estimate_tokens
+
+# -------------------------------
+# WITHIN-BOOK DEDUP
+# -------------------------------
+# Gaane, refrains, chitthiyan - novel me same paragraph kai chapters me aata hai.
+# Yahan aise repeated blocks pehle hi pakad lete hain: har block apna alag chunk banta hai,
+# ek baar translate hota hai aur har occurrence pe wahi translation lagti hai.
+DEFAULTS = {
+    "min_paragraph_chars": 20,   # isse chhote paragraph ("Yes.") ko duplicate nahi maante
+    "min_block_chars": 60,       # shared block kam se kam itna bada ho
+}
+
+
+def passage_key(text):
+    # Near-duplicates bhi pakde: case, punctuation, whitespace ignore
+    norm = re.sub(r"[^\w\s]", "", text.lower())
+    norm = re.sub(r"\s+", " ", norm).strip()
+    return hashlib.sha1(norm.encode("utf-8")).hexdigest()[:16]
+
+
+def _paragraphs(text):
+    return [p.strip() for p in text.split("\n") if p.strip()]
+
+
+def _runs(paragraphs, repeated):
+    """Lagataar repeated paragraphs ko ek run me jodo. Yield: (is_run, [paragraphs])"""
+    current = []
+    for para in paragraphs:
+        if passage_key(para) in repeated:
+            current.append(para)
+            continue
+        if current:
+            yield True, current
+            current = []
+        yield False, [para]
+    if current:
+        yield True, current
+
+
+class DedupPlan:
+    def __init__(self, texts, settings=None):
+        """texts: {chapter_name: raw_text}"""
+        cfg = {**DEFAULTS, **(settings or {})}
+        self.min_block_chars = cfg["min_block_chars"]
+
+        # Pass 1: kaunse paragraphs ek se zyada baar aaye
+        counts = Counter(
+            passage_key(p)
+            for text in texts.values()
+            for p in _paragraphs(text)
+            if len(p) >= cfg["min_paragraph_chars"]
+        )
+        self.repeated = {key for key, n in counts.items() if n >= 2}
+
+        # Pass 2: repeated paragraphs ke runs (pura gaana ek block); jo run 2+ baar aaye woh shared
+        blocks = Counter()
+        sample = {}
+        for text in texts.values():
+            for is_run, paras in _runs(_paragraphs(text), self.repeated):
+                block = "\n".join(paras)
+                if is_run and len(block) >= self.min_block_chars:
+                    key = passage_key(block)
+                    blocks[key] += 1
+                    sample.setdefault(key, block)
+
+        self.blocks = {key: {"text": sample[key], "count": n} for key, n in blocks.items() if n >= 2}
+
+        self._results = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    # --- report ---
+    @property
+    def saved_tokens(self):
+        return sum(estimate_tokens(b["text"]) * (b["count"] - 1) for b in self.blocks.values())
+
+    def report(self):
+        copies = sum(b["count"] for b in self.blocks.values())
+        if self.blocks:
+            print(f"♻️ Dedup: {len(self.blocks)} repeated passages ({copies} copies). ~{self.saved_tokens} input tokens bachenge.")
+        telemetry.set_gauge("dedup_tokens_saved", self.saved_tokens)
+
+    # --- chunking ---
+    def is_shared(self, chunk):
+        return passage_key(chunk) in self.blocks
+
+    def split(self, text, chunker):
+        """
+        Chapter ko chunks me todo, par har shared block apna alag chunk bane
+        (taaki woh exactly ek baar translate ho). Baaki text normal chunker se.
+        """
+        chunks = []
+        buffer = []
+
+        def flush():
+            if buffer:
+                chunks.extend(c for c in chunker("\n".join(buffer)) if c.strip())
+                buffer.clear()
+
+        for is_run, paras in _runs(_paragraphs(text), self.repeated):
+            block = "\n".join(paras)
+            if is_run and passage_key(block) in self.blocks:
+                flush()
+                chunks.append(block)
+            else:
+                buffer.extend(paras)
+        flush()
+        return chunks
+
+    # --- fan-out ---
+    def get_or_translate(self, chunk, translate, is_ok):
+        """
+        Shared block ki translation sirf pehli baar bane; baaki chapters (threads bhi) wahi lein.
+        Return: (outcome, reused). Fail hua outcome cache nahi hota, agli occurrence phir try karegi.
+        """
+        key = passage_key(chunk)
+        with self._lock:
+            lock = self._locks.setdefault(key, threading.Lock())
+
+        with lock:
+            if key in self._results:
+                telemetry.incr("dedup_reused")
+                return self._results[key], True
+            outcome = translate()
+            if is_ok(outcome):
+                self._results[key] = outcome
+            return outcome, False
@@ -2,24 +2,34 @@ import os
 import json
 import time
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
 from tqdm import tqdm
 from groq import Groq  # <-- NEW IMPORT
 
+from src import telemetry
+from src.throttle import get_controller
+from src.keypool import KeyPool, load_keys, estimate_tokens, retry_after_seconds
+from src import streaming
+from src.streaming import PartialWriter
+from src import validator, router as difficulty
+
 # -------------------------------
 # ENV + API
 # -------------------------------
 load_dotenv()
-# Note: Ab .env mein GROQ_API_KEY hona chahiye
-API_KEY = os.getenv("GROQ_API_KEY")
+# Note: Ab .env mein GROQ_API_KEY hona chahiye (ya GROQ_API_KEY_1, _2... multiple keys ke liye)
+API_KEYS = load_keys("GROQ_API_KEY")
 
-if not API_KEY:
+if not API_KEYS:
     raise ValueError("❌ Error: 'GROQ_API_KEY' not found in .env file")
 
-# Initialize Groq Client
-client = Groq(api_key=API_KEY)
+# Har key ka apna Groq client
+KEY_POOL = KeyPool("groq", API_KEYS, client_factory=lambda secret: Groq(api_key=secret))
 
 CONFIG_PATH = Path("config/prompts.json")
+# Model ID set kar diya hai Llama 3.3 pe
+MODEL_ID = "llama-3.3-70b-versatile"
 
 # -------------------------------
 # LOAD CONFIG (SAME LOGIC)
@@ -97,23 +107,47 @@ def split_text_smartly(text, max_chars=7000):
 # -------------------------------
 # STRONG RETRY SYSTEM (UPDATED FOR GROQ)
 # -------------------------------
-def generate_with_retry(client, system_instr, user_prompt, max_retries=7):
-    # Model ID set kar diya hai Llama 3.3 pe
-    MODEL_ID = "llama-3.3-70b-versatile"
-    
+def generate_with_retry(pool, system_instr, user_prompt, max_retries=7, controller=None, writer=None, model=MODEL_ID):
+    # Return: (text, finish_reason); stream ke tukde writer me jaate rehte hain
+    if controller is None:
+        controller = get_controller("groq", model)
+
+    tokens = estimate_tokens(system_instr + user_prompt) * 2 # input + output ka andaza
+
     for i in range(max_retries):
+        # Round-robin: har attempt pe pool se agli free key
+        key = pool.acquire(tokens)
+        if writer:
+            writer.start()
         try:
-            # Groq Call Structure
-            completion = client.chat.completions.create(
-                model=MODEL_ID,
-                messages=[
-                    {"role": "system", "content": system_instr},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=0.5, # Thoda balanced temperature
-                max_tokens=4096, # Llama 3.3 ka context bada hai
-            )
-            return completion.choices[0].message.content
+            # Groq Call Structure (AIMD slot ke andar, streaming on)
+            with controller.slot() as timing:
+                stream = key.client.chat.completions.create(
+                    model=model,
+                    messages=[
+                        {"role": "system", "content": system_instr},
+                        {"role": "user", "content": user_prompt}
+                    ],
+                    temperature=0.5, # Thoda balanced temperature
+                    max_tokens=4096, # Llama 3.3 ka context bada hai
+                    stream=True,
+                )
+                pieces = []
+                finish_reason = None
+                for event in stream:
+                    if not event.choices:
+                        continue
+                    choice = event.choices[0]
+                    delta = choice.delta.content or ""
+                    if delta:
+                        timing.first_token()
+                    pieces.append(delta)
+                    if writer:
+                        writer.write(delta)
+                    if choice.finish_reason:
+                        finish_reason = choice.finish_reason
+            pool.report_success(key)
+            return "".join(pieces), finish_reason
             
         except Exception as e:
             err = str(e)
@@ -121,18 +155,78 @@ def generate_with_retry(client, system_instr, user_prompt, max_retries=7):
 
             # Rate Limit Handling (Groq ke liye zaroori hai)
             if "429" in err or "rate limit" in err.lower():
-                print(f"⚠️ Rate Limit (Groq). Waiting {wait}s...")
-                time.sleep(wait)
+                controller.on_rate_limit()
+                cooldown = pool.report_rate_limit(key, retry_after=retry_after_seconds(e))
+                telemetry.incr("retries", provider="groq", model=model)
+                print(f"⚠️ Rate Limit (Groq, {key.label}). Cooldown {cooldown:g}s... (window={controller.window:.1f})")
                 continue
             elif "500" in err or "503" in err:
+                telemetry.incr("retries", provider="groq", model=model)
                 print(f"⚠️ Server Error. Waiting {wait}s...")
                 time.sleep(wait)
                 continue
+            elif "401" in err or "invalid_api_key" in err:
+                pool.report_failure(key)
+                if pool.active_count() > 1:
+                    print(f"⚠️ Key {key.label} reject hui. Agli key try kar rahe hain...")
+                    continue
+                print(f"❌ Fatal Error ({key.label}): {err}")
+                return None, None
             else:
                 print(f"❌ Fatal Error: {err}")
-                return None
+                return None, None
+
+    return None, None
 
-    return None
+# -------------------------------
+# CHUNK TRANSLATOR (max_tokens=4096 pe kata toh sirf tail dobara)
+# -------------------------------
+def translate_chunk(chunk, system_instruction, prompt, controller, writer, expected_ratio=1.0, settings=None,
+                    pool=KEY_POOL, model=MODEL_ID):
+    settings = {**streaming.DEFAULTS, **(settings or {})}
+
+    translated, finish_reason = generate_with_retry(pool, system_instruction, prompt, controller=controller,
+                                                    writer=writer, model=model)
+    if not translated:
+        return None
+    translated = sanitize_output(translated)
+
+    for _ in range(settings["max_continuations"]):
+        if not streaming.looks_truncated(chunk, translated, finish_reason, settings["min_length_ratio"]):
+            break
+
+        tail = streaming.untranslated_tail(chunk, translated, expected_ratio, settings["overlap_chars"])
+        telemetry.incr("truncations", provider="groq", model=model)
+        print(f"✂️ Truncated ({streaming.finish_reason_name(finish_reason) or 'short'}). Tail ({len(tail)} chars) continue kar rahe hain...")
+        streaming.record_continuation("groq", chunk, tail)
+
+        writer.write("\n")
+        writer.keep()
+        more, finish_reason = generate_with_retry(
+            pool, system_instruction, streaming.build_continuation_prompt(translated, tail),
+            controller=controller, writer=writer, model=model
+        )
+        if not more:
+            break
+        translated = translated + "\n" + more
+
+    return translated
+
+def translate_routed(route, chunk, system_instruction, prompt, writer, expected_ratio, settings, glossary, label):
+    # Routing: score ke hisaab se tier, validator reject kare toh agla (bada) model
+    lanes = route.route(chunk)
+    translated = None
+    for step, (model, pool, controller) in enumerate(lanes):
+        translated = translate_chunk(chunk, system_instruction, prompt, controller, writer, expected_ratio,
+                                     settings, pool=pool, model=model)
+        result = validator.validate_chunk(chunk, translated, glossary)
+        if result["ok"]:
+            return translated
+        telemetry.incr("validation_failures", provider="groq", model=model)
+        if step + 1 < len(lanes):
+            telemetry.incr("escalations", model=lanes[step + 1][0])
+            print(f"⬆️ {label} rejected ({', '.join(result['issues'])}): {model} -> {lanes[step + 1][0]}")
+    return translated
 
 # -------------------------------
 # OUTPUT SANITIZER (SAME LOGIC)
@@ -152,46 +246,30 @@ def sanitize_output(text):
     return text.strip()
 
 # -------------------------------
-# MAIN TRANSLATOR (UPDATED)
+# CHAPTER TRANSLATOR (ek worker = ek chapter)
 # -------------------------------
-def translate_book():
-    print("Loading settings...")
-    config = load_config()
+def translate_chapter(file, system_instruction, output_dir, temp_dir, controller, settings=None, route=None, glossary=None):
+    output_file = output_dir / f"{file.stem}.md"
+    temp_file = temp_dir / f"{file.stem}.partial.md"
 
-    input_dir = Path("data/raw_text")
-    output_dir = Path("data/output_books")
-    temp_dir = Path("data/temp")
-    output_dir.mkdir(parents=True, exist_ok=True)
-    temp_dir.mkdir(parents=True, exist_ok=True)
-
-    files = sorted(input_dir.glob("*.txt"))
-    if not files:
-        print("No files found in raw_text")
-        return
-
-    # System Instruction Build karo
-    system_instruction = build_system_instruction(config)
+    raw = clean_text(file.read_text(encoding="utf-8"))
+    chunks = split_text_smartly(raw)
 
+    # Parallel chapters hain, isliye dual context chapter ke andar hi rehta hai
     previous_original = ""
     previous_translated = ""
+    final_output = ""
 
-    for file in tqdm(files, desc="Translating (Groq)"):
-        output_file = output_dir / f"{file.stem}.md"
-        temp_file = temp_dir / f"{file.stem}.partial.md"
-
-        if output_file.exists():
-            continue
-
-        raw = clean_text(file.read_text(encoding="utf-8"))
-        chunks = split_text_smartly(raw)
-
-        final_output = ""
+    # Stream seedha partial file me
+    writer = PartialWriter(temp_file)
+    source_chars = 0
+    failed = 0
 
-        for idx, chunk in enumerate(chunks):
-            part = f"(Part {idx+1}/{len(chunks)})" if len(chunks) > 1 else ""
+    for idx, chunk in enumerate(chunks):
+        part = f"(Part {idx+1}/{len(chunks)})" if len(chunks) > 1 else ""
 
-            # Prompt Construction (Same as before)
-            prompt = f"""
+        # Prompt Construction (Same as before)
+        prompt = f"""
 ---BEGIN---
 Previous Original Context:
 {previous_original[-1200:]}
@@ -204,31 +282,101 @@ Now translate the following {part}:
 {chunk}
 ---END---
 """
-            # Groq function call (Passing system instruction here)
-            translated = generate_with_retry(client, system_instruction, prompt)
+        # Groq function call (Passing system instruction here)
+        expected_ratio = len(final_output) / source_chars if source_chars else 1.0
+        if route:
+            translated = translate_routed(route, chunk, system_instruction, prompt, writer, expected_ratio,
+                                          settings, glossary, f"{file.stem} #{idx+1}")
+        else:
+            translated = translate_chunk(chunk, system_instruction, prompt, controller, writer, expected_ratio, settings)
 
-            if not translated:
-                print(f"❌ Chunk failed: {idx+1}")
-                continue
+        if not translated:
+            print(f"❌ Chunk failed: {file.name} #{idx+1}")
+            failed += 1
+            continue
+
+        final_output += translated + "\n\n"
+        source_chars += len(chunk)
+
+        # Update dual context
+        previous_original = chunk[-1500:]
+        previous_translated = translated[-1500:]
+
+        # Partial save
+        writer.commit(final_output)
+
+    # Koi chunk fail hua toh .md nahi likhni - adhoori file "done" lagti hai aur agli run skip kar deti
+    if failed:
+        print(f"⚠️ {file.name}: {failed}/{len(chunks)} chunks fail. .md nahi likhi, partial {temp_file} me hai - dobara chalao.")
+        return file
 
-            translated = sanitize_output(translated)
-            final_output += translated + "\n\n"
+    # Final save
+    output_file.write_text(final_output.strip(), encoding="utf-8")
+    if temp_file.exists():
+        temp_file.unlink()
+
+    return file
+
+
+# -------------------------------
+# MAIN TRANSLATOR (UPDATED)
+# -------------------------------
+def translate_book():
+    print("Loading settings...")
+    config = load_config()
 
-            # Update dual context
-            previous_original = chunk[-1500:]
-            previous_translated = translated[-1500:]
+    input_dir = Path("data/raw_text")
+    output_dir = Path("data/output_books")
+    temp_dir = Path("data/temp")
+    output_dir.mkdir(parents=True, exist_ok=True)
+    temp_dir.mkdir(parents=True, exist_ok=True)
 
-            # Partial save
-            temp_file.write_text(final_output, encoding="utf-8")
+    files = sorted(input_dir.glob("*.txt"))
+    if not files:
+        print("No files found in raw_text")
+        return
 
-            # Groq Free Tier Cooldown (Thoda safe side)
-            time.sleep(3)
+    files = [f for f in files if not (output_dir / f"{f.stem}.md").exists()]
 
-        # Final save
-        output_file.write_text(final_output.strip(), encoding="utf-8")
-        if temp_file.exists():
-            temp_file.unlink()
+    # System Instruction Build karo
+    system_instruction = build_system_instruction(config)
 
+    KEY_POOL.configure(config.get("key_pool", {}).get("groq", {}))
+    print(f"🔑 {KEY_POOL.size} API key(s) loaded for Groq.")
+
+    # Groq free tier pe fixed sleep ki jagah AIMD window (keys ke saath scale)
+    concurrency = dict(config.get("concurrency", {}))
+    concurrency["max"] = concurrency.get("max", 8) * KEY_POOL.size
+    controller = get_controller("groq", MODEL_ID, **concurrency)
+
+    # Difficulty routing: har model ka apna pool + controller (Groq limits model-wise hain)
+    route = None
+    routing = difficulty.settings_from(config)
+    if routing["enabled"]:
+        lanes = []
+        for model in routing["tiers"]["groq"]:
+            if model == MODEL_ID:
+                lanes.append((model, KEY_POOL, controller))
+                continue
+            model_pool = KeyPool("groq", API_KEYS, client_factory=lambda secret: Groq(api_key=secret))
+            model_pool.configure(config.get("key_pool", {}).get("groq", {}))
+            lanes.append((model, model_pool, get_controller("groq", model, **concurrency)))
+        route = difficulty.Router(lanes, config.get("glossary"), [f.read_text(encoding="utf-8") for f in files], **routing)
+        route.report()
+
+    with ThreadPoolExecutor(max_workers=controller.max_window) as pool:
+        futures = [
+            pool.submit(translate_chapter, file, system_instruction, output_dir, temp_dir, controller,
+                        config.get("streaming"), route, config.get("glossary"))
+            for file in files
+        ]
+        with tqdm(total=len(futures), desc="Translating (Groq)") as bar:
+            for future in as_completed(futures):
+                future.result()
+                bar.set_postfix(window=f"{controller.window:.1f}", in_flight=controller.in_flight)
+                bar.update(1)
+
+    telemetry.dump()
     print("\n✔ DONE. Check the output_books folder.")
 
 
@@ -0,0 +1,208 @@
+import os
+import re
+import time
+import threading
+from collections import deque
+
+from src import telemetry
+
+# -------------------------------
+# API KEY POOL
+# -------------------------------
+# Ek provider ki saari keys yahan rehti hain. Har key ka apna RPM/TPM hisaab,
+# cooldown (429 ke baad) aur parking (baar baar fail hone pe) hota hai.
+# Scheduling round-robin hai: cursor aage badhta rehta hai, isliye koi key bhookhi nahi rehti.
+DEFAULTS = {
+    "rpm": 15,             # requests per minute (per key)
+    "tpm": 1_000_000,      # tokens per minute (per key)
+    "cooldown": 30,        # 429 ke baad kitne second aaram
+    "park_after": 5,       # itni lagataar failures = key park
+    "park_seconds": 900,   # park kitni der
+}
+
+
+def load_keys(env_name):
+    """
+    .env se saari keys uthata hai: GEMINI_API_KEY, GEMINI_API_KEY_1.._N
+    aur comma-separated GEMINI_API_KEYS. Return: [(label, secret), ...]
+    """
+    found = []
+    seen = set()
+
+    def add(label, secret):
+        secret = (secret or "").strip()
+        if secret and secret not in seen:
+            seen.add(secret)
+            found.append((label, secret))
+
+    add(env_name, os.getenv(env_name))
+    for idx, secret in enumerate(os.getenv(f"{env_name}S", "").split(",")):
+        add(f"{env_name}S[{idx}]", secret)
+
+    # Numbered keys; beech me gap ho toh bhi 50 tak dekh lete hain
+    for n in range(1, 51):
+        add(f"{env_name}_{n}", os.getenv(f"{env_name}_{n}"))
+
+    return found
+
+
+# "Retry-After: 12", "retry_delay { seconds: 23 }", "Please retry in 23.5s", "try again in 750ms"
+RETRY_HINT = re.compile(
+    r"(?:retry[-_ ]?after|retry_delay|retry in|try again in)\D{0,20}?(\d+(?:\.\d+)?)\s*(ms|s)?",
+    flags=re.IGNORECASE,
+)
+
+
+def retry_after_seconds(error):
+    """Provider ne bataya ho ki kab retry karein (header ya error text) toh seconds, warna None."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    value = headers.get("retry-after") or headers.get("Retry-After")
+    try:
+        if value is not None:
+            return float(value)
+    except ValueError:
+        pass
+    match = RETRY_HINT.search(str(error))
+    if not match:
+        return None
+    seconds = float(match.group(1))
+    return seconds / 1000 if match.group(2) and match.group(2).lower() == "ms" else seconds
+
+
+def estimate_tokens(text):
+    # Rough hisaab: ~4 chars = 1 token (English). Quota ke liye itna kaafi hai.
+    return max(1, len(text) // 4)
+
+
+class ApiKey:
+    def __init__(self, label, secret, client, **settings):
+        self.label = label
+        self.secret = secret
+        self.client = client
+        self.configure(**settings)
+
+        self.requests = deque()   # timestamps (last 60s)
+        self.tokens = deque()     # (timestamp, tokens)
+        self.cooldown_until = 0.0
+        self.parked_until = 0.0
+        self.failures = 0
+        self.uses = 0
+
+    def configure(self, **settings):
+        cfg = {**DEFAULTS, **settings}
+        self.rpm = int(cfg["rpm"])
+        self.tpm = int(cfg["tpm"])
+        self.cooldown = float(cfg["cooldown"])
+        self.park_after = int(cfg["park_after"])
+        self.park_seconds = float(cfg["park_seconds"])
+
+    def _trim(self, now):
+        while self.requests and now - self.requests[0] >= 60:
+            self.requests.popleft()
+        while self.tokens and now - self.tokens[0][0] >= 60:
+            self.tokens.popleft()
+
+    def ready_at(self, now, tokens):
+        """Ye key kab free hogi (now = abhi)."""
+        self._trim(now)
+        ready = max(now, self.cooldown_until, self.parked_until)
+        if len(self.requests) >= self.rpm:
+            ready = max(ready, self.requests[0] + 60)
+        used = sum(t for _, t in self.tokens)
+        if self.tokens and used + tokens > self.tpm:
+            # Sabse purana token batch nikalne tak ruko
+            ready = max(ready, self.tokens[0][0] + 60)
+        return ready
+
+
+class KeyPool:
+    def __init__(self, provider, keys, client_factory=lambda secret: secret, **settings):
+        if not keys:
+            raise ValueError(f"❌ Error: '{provider}' ke liye ek bhi API key nahi mili!")
+        self.provider = provider
+        self.keys = [ApiKey(label, secret, client_factory(secret), **settings) for label, secret in keys]
+        self._cursor = 0
+        self._cond = threading.Condition()
+        self._publish()
+
+    @property
+    def size(self):
+        return len(self.keys)
+
+    def configure(self, pool_config):
+        """
+        Config format (prompts.json -> "key_pool" -> provider):
+        {"rpm": 15, "tpm": 1000000, "keys": {"GEMINI_API_KEY_2": {"rpm": 1000}}}
+        """
+        overrides = pool_config.get("keys", {})
+        shared = {k: v for k, v in pool_config.items() if k != "keys"}
+        with self._cond:
+            for key in self.keys:
+                key.configure(**{**shared, **overrides.get(key.label, {})})
+            self._cond.notify_all()
+
+    def bind(self, client_factory):
+        # Client baad me banana ho (jaise Gemini model jo system prompt pe depend karta hai)
+        for key in self.keys:
+            key.client = client_factory(key.secret)
+
+    def acquire(self, tokens=1):
+        """Round-robin me agli free key do; sab busy hain toh jo pehle free ho uska wait."""
+        started = time.monotonic()
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                earliest = None
+                for step in range(len(self.keys)):
+                    idx = (self._cursor + step) % len(self.keys)
+                    key = self.keys[idx]
+                    ready = key.ready_at(now, tokens)
+                    if ready <= now:
+                        self._cursor = idx + 1
+                        key.requests.append(now)
+                        key.tokens.append((now, tokens))
+                        key.uses += 1
+                        telemetry.incr("key_requests", provider=self.provider, key=key.label)
+                        # RPM/TPM/cooldown ki wajah se kitna ruke
+                        telemetry.observe("key_wait_seconds", now - started, provider=self.provider)
+                        return key
+                    if earliest is None or ready < earliest:
+                        earliest = ready
+                self._cond.wait(timeout=max(0.05, earliest - now))
+
+    def report_success(self, key):
+        with self._cond:
+            key.failures = 0
+
+    def report_rate_limit(self, key, retry_after=None):
+        """
+        429 = quota ka back-pressure, key kharab nahi: sirf cooldown (provider ka Retry-After, warna config wala).
+        Parking sirf asli failures (auth/permission) pe. Return: cooldown seconds.
+        """
+        cooldown = retry_after or key.cooldown
+        with self._cond:
+            key.cooldown_until = max(key.cooldown_until, time.monotonic() + cooldown)
+            self._cond.notify_all()
+        return cooldown
+
+    def report_failure(self, key):
+        with self._cond:
+            self._fail(key)
+
+    def _fail(self, key):
+        key.failures += 1
+        if key.failures >= key.park_after:
+            key.parked_until = time.monotonic() + key.park_seconds
+            key.failures = 0
+            telemetry.incr("keys_parked", provider=self.provider, key=key.label)
+            print(f"🅿️ Key {key.label} park kar di ({int(key.park_seconds)}s) - baar baar fail ho rahi thi.")
+        self._publish()
+        self._cond.notify_all()
+
+    def active_count(self):
+        now = time.monotonic()
+        return sum(1 for key in self.keys if key.parked_until <= now)
+
+    def _publish(self):
+        telemetry.set_gauge("active_keys", self.active_count(), provider=self.provider)
@@ -0,0 +1,522 @@
+import os
+import re
+import sys
+import json
+import math
+import time
+import random
+import sqlite3
+import threading
+import subprocess
+from pathlib import Path
+from collections import Counter, defaultdict, deque
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# -------------------------------
+# LOAD TEST HARNESS
+# -------------------------------
+# Asli Gemini/Groq pe 50-500 requests ek saath bhejna na sasta hai na repeatable.
+# Isliye ek local fake provider (HTTP): Gemini REST (generateContent / streamGenerateContent) aur
+# Groq/OpenAI chat completions dono bolta hai - latency distribution, 429/503 injection, Retry-After,
+# per-key RPM quota, overload aur beech me kata hua (MAX_TOKENS) jawab.
+# Driver har concurrency level pe ek nayi process me translate_book() chalata hai (GEMINI_API_ENDPOINT se
+# isi server pe), phir throughput, chunk latency (p50/p95/p99) aur error amplification ka chart banata hai.
+DEFAULTS = {
+    "levels": [50, 100, 200, 500],
+    "keys": 10,                  # fake API keys (har key ka apna RPM quota)
+    "waves": 2,                  # har level pe chapters = level x waves (chapters parallel chalte hain)
+    "chunks_per_chapter": 2,
+    "host": "127.0.0.1",
+    "port": 9200,
+    # Time-to-first-token: "lognormal" (median_ms + p99_ms), "uniform" (min_ms..max_ms) ya "fixed" (median_ms)
+    "latency": {"distribution": "lognormal", "median_ms": 800, "p99_ms": 5000, "min_ms": 200, "max_ms": 2000},
+    "tokens_per_second": 400,    # stream ki speed (ek request)
+    "error_429": 0.02,           # itne requests pe random 429
+    "error_503": 0.01,           # itne pe 503 (overloaded)
+    "retry_after": 2,            # 429/503 ke saath Retry-After (seconds)
+    "truncate": 0.03,            # itne jawab beech me kat jaate hain (MAX_TOKENS / "length")
+    "rpm_per_key": 0,            # 0 = koi quota nahi; warna minute me isse zyada -> 429
+    "max_in_flight": 0,          # 0 = unlimited; isse zyada ek saath -> 503
+    "timeout_minutes": 30,       # ek level ka max time
+    "output_dir": "data/loadtest",
+}
+
+ROOT = Path(__file__).resolve().parent.parent
+SOURCE_PATTERNS = (
+    re.compile(r"Now translate the following[^\n]*:\n\n(.*)\n---END---", re.S),
+    re.compile(r"Remaining source text[^\n]*:\n(.*)\n\nContinue the translation", re.S),
+)
+HINDI_WORDS = ("बिल्बो", "ने", "दरवाज़ा", "खोला", "और", "बाहर", "देखा", "पहाड़ों", "के", "पीछे", "सूरज",
+               "डूब", "रहा", "था", "गैंडाल्फ", "धीरे", "से", "मुस्कुराया", "यात्रा", "लंबी", "होगी")
+ENGLISH_WORDS = ("the", "hobbit", "walked", "along", "quiet", "road", "toward", "distant", "mountains", "while",
+                 "wizard", "spoke", "about", "dragons", "gold", "and", "old", "songs", "under", "grey", "sky")
+
+
+def settings_from(config):
+    settings = {**DEFAULTS, **config.get("loadtest", {})}
+    settings["latency"] = {**DEFAULTS["latency"], **config.get("loadtest", {}).get("latency", {})}
+    return settings
+
+
+# Provider jaisa hi error body, taaki SDK wahi exception banaye jo asli me banta
+ERRORS = {
+    "gemini": {
+        429: {"error": {"code": 429, "status": "RESOURCE_EXHAUSTED",
+                        "message": "Resource has been exhausted (e.g. check quota)."}},
+        503: {"error": {"code": 503, "status": "UNAVAILABLE", "message": "The model is overloaded. Please try again later."}},
+    },
+    "openai": {
+        429: {"error": {"type": "tokens", "code": "rate_limit_exceeded", "message": "Rate limit reached. Please try again."}},
+        503: {"error": {"type": "internal_server_error", "message": "Service Unavailable"}},
+    },
+}
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+
+# -------------------------------
+# FAKE PROVIDER
+# -------------------------------
+class FakeProvider:
+    """Faisla + hisaab: kaunsi request 200/429/503 paaye, kitni der lage, jawab kya ho."""
+
+    def __init__(self, settings, seed=None):
+        self.settings = settings
+        self.random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.requests = 0
+            self.status = Counter()
+            self.truncated = 0
+            self.in_flight = 0
+            self.max_in_flight = 0
+            self.latencies = []
+            self._minute = defaultdict(deque)  # key -> pichle 60s ke request times
+
+    def admit(self, key):
+        """Return: (status, retry_after). Admit hua toh in_flight badh jaata hai; done() pe ghatta hai."""
+        s = self.settings
+        now = time.monotonic()
+        with self._lock:
+            self.requests += 1
+            window = self._minute[key]
+            while window and now - window[0] > 60:
+                window.popleft()
+
+            roll = self.random.random()
+            if s["rpm_per_key"] and len(window) >= s["rpm_per_key"]:
+                status, retry_after = 429, max(1, math.ceil(60 - (now - window[0])))
+            elif s["max_in_flight"] and self.in_flight >= s["max_in_flight"]:
+                status, retry_after = 503, s["retry_after"]
+            elif roll < s["error_429"]:
+                status, retry_after = 429, s["retry_after"]
+            elif roll < s["error_429"] + s["error_503"]:
+                status, retry_after = 503, s["retry_after"]
+            else:
+                status, retry_after = 200, None
+                window.append(now)
+                self.in_flight += 1
+                self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            self.status[status] += 1
+        return status, retry_after
+
+    def done(self, seconds):
+        with self._lock:
+            self.in_flight -= 1
+            self.latencies.append(seconds)
+
+    def first_token_delay(self):
+        cfg = self.settings["latency"]
+        with self._lock:
+            if cfg["distribution"] == "uniform":
+                ms = self.random.uniform(cfg["min_ms"], cfg["max_ms"])
+            elif cfg["distribution"] == "fixed":
+                ms = cfg["median_ms"]
+            else:
+                # p99 = median * e^(2.326 sigma)
+                sigma = math.log(max(cfg["p99_ms"], cfg["median_ms"] + 1) / cfg["median_ms"]) / 2.326
+                ms = self.random.lognormvariate(math.log(cfg["median_ms"]), sigma)
+        return ms / 1000
+
+    def respond(self, prompt):
+        """Return: (pieces, truncated). Source ke har paragraph ke barabar lamba Devanagari text."""
+        match = next((m for m in (p.search(prompt) for p in SOURCE_PATTERNS) if m), None)
+        source = match.group(1) if match else prompt
+        with self._lock:
+            paragraphs = []
+            for para in (p for p in source.split("\n") if p.strip()):
+                words, length = [], 0
+                while length < len(para) * 1.1:
+                    word = self.random.choice(HINDI_WORDS)
+                    words.append(word)
+                    length += len(word) + 1
+                paragraphs.append(" ".join(words) + "।")
+            text = "\n\n".join(paragraphs) or "।"
+            truncated = self.random.random() < self.settings["truncate"]
+            if truncated:
+                text = text[:int(len(text) * self.random.uniform(0.3, 0.7))]
+                self.truncated += 1
+        size = max(1, len(text) // 6)
+        return [text[i:i + size] for i in range(0, len(text), size)], truncated
+
+    def report(self):
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "status": {str(k): v for k, v in sorted(self.status.items())},
+                "truncated": self.truncated,
+                "max_in_flight": self.max_in_flight,
+                "server_p50_ms": round(percentile(self.latencies, 50) * 1000),
+                "server_p99_ms": round(percentile(self.latencies, 99) * 1000),
+            }
+
+
+def make_handler(provider):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        server_version = "FakeProvider/1.0"
+
+        def _send(self, code, payload, retry_after=None):
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            if retry_after:
+                self.send_header("Retry-After", str(retry_after))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _chunk(self, data):
+            # Transfer-Encoding: chunked - har tukda alag se client tak
+            data = data.encode("utf-8")
+            self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+            self.wfile.flush()
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+            path = self.path.split("?")[0]
+            if ":generateContent" in path or ":streamGenerateContent" in path:
+                api = "gemini"
+                key = self.headers.get("x-goog-api-key", "")
+                prompt = "".join(p.get("text", "") for c in body.get("contents", []) for p in c.get("parts", []))
+            elif path.endswith("/chat/completions"):
+                api = "openai"
+                key = self.headers.get("Authorization", "")
+                prompt = str((body.get("messages") or [{}])[-1].get("content", ""))
+            else:
+                return self._send(404, {"error": {"code": 404, "message": f"{path} fake provider me nahi hai"}})
+
+            status, retry_after = provider.admit(key)
+            if status != 200:
+                return self._send(status, ERRORS[api][status], retry_after)
+
+            started = time.monotonic()
+            try:
+                time.sleep(provider.first_token_delay())
+                pieces, truncated = provider.respond(prompt)
+                stream = body.get("stream") if api == "openai" else ":streamGenerateContent" in path
+                if api == "gemini":
+                    self._gemini(pieces, truncated, stream)
+                else:
+                    self._openai(pieces, truncated, stream, body.get("model", "fake"))
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # client ne beech me chhod diya
+            finally:
+                provider.done(time.monotonic() - started)
+
+        def _pace(self, piece):
+            time.sleep(max(1, len(piece) // 4) / provider.settings["tokens_per_second"])
+
+        def _gemini(self, pieces, truncated, stream):
+            finish = "MAX_TOKENS" if truncated else "STOP"
+            events = [{"candidates": [{"content": {"role": "model", "parts": [{"text": piece}]}, "index": 0}]}
+                      for piece in pieces]
+            events[-1]["candidates"][0]["finishReason"] = finish
+            if not stream:
+                for piece in pieces:
+                    self._pace(piece)
+                whole = {"candidates": [{"content": {"role": "model", "parts": [{"text": "".join(pieces)}]},
+                                         "finishReason": finish, "index": 0}]}
+                return self._send(200, whole)
+
+            # REST stream = ek JSON array, element ek-ek karke
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for i, (piece, event) in enumerate(zip(pieces, events)):
+                self._pace(piece)
+                self._chunk(("[" if i == 0 else ",") + json.dumps(event, ensure_ascii=False))
+            self._chunk("]")
+            self.wfile.write(b"0\r\n\r\n")
+
+        def _openai(self, pieces, truncated, stream, model):
+            finish = "length" if truncated else "stop"
+            created = int(time.time())
+            if not stream:
+                for piece in pieces:
+                    self._pace(piece)
+                text = "".join(pieces)
+                return self._send(200, {
+                    "id": "chatcmpl-fake", "object": "chat.completion", "created": created, "model": model,
+                    "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": finish}],
+                    "usage": {"prompt_tokens": 0, "completion_tokens": len(text) // 4, "total_tokens": len(text) // 4},
+                })
+
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for i, piece in enumerate(pieces):
+                self._pace(piece)
+                event = {"id": "chatcmpl-fake", "object": "chat.completion.chunk", "created": created, "model": model,
+                         "choices": [{"index": 0, "delta": {"content": piece},
+                                      "finish_reason": finish if i == len(pieces) - 1 else None}]}
+                self._chunk(f"data: {json.dumps(event, ensure_ascii=False)}\n\n")
+            self._chunk("data: [DONE]\n\n")
+            self.wfile.write(b"0\r\n\r\n")
+
+        def log_message(self, fmt, *args):
+            pass  # 500 requests/sec pe har line print nahi karni
+
+    return Handler
+
+
+class FakeServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # listen() backlog: 500 clients ek saath connect karein toh bhi reset na ho
+    request_queue_size = 1024
+
+
+def start_server(provider, host=DEFAULTS["host"], port=DEFAULTS["port"]):
+    server = FakeServer((host, port), make_handler(provider))
+    threading.Thread(target=server.serve_forever, daemon=True, name="fake-provider").start()
+    return server
+
+
+# -------------------------------
+# DRIVER
+# -------------------------------
+def make_book(workdir, chapters, chunks_per_chapter, seed=0):
+    """Synthetic English chapters: har chapter ~chunks_per_chapter chunks (split_text_smartly ke 7000 chars)."""
+    rng = random.Random(seed)
+    raw_dir = Path(workdir) / "data" / "raw_text"
+    raw_dir.mkdir(parents=True, exist_ok=True)
+    for n in range(1, chapters + 1):
+        paragraphs, length = [], 0
+        while length < chunks_per_chapter * 6000:
+            para = " ".join(rng.choice(ENGLISH_WORDS) for _ in range(rng.randint(60, 110))).capitalize() + "."
+            paragraphs.append(para)
+            length += len(para) + 1
+        (raw_dir / f"{n:04d}_Chapter_{n}.txt").write_text("\n".join(paragraphs), encoding="utf-8")
+
+
+def make_config(workdir, config, settings, level):
+    """User ka config, bas concurrency = level aur woh features band jo fake provider nahi samajhta."""
+    config = json.loads(json.dumps(config))
+    per_key = math.ceil(level / settings["keys"])
+    config["concurrency"] = {**config.get("concurrency", {}), "initial": level, "min": 1, "max": per_key}
+    # Client ka apna RPM limiter nahi, server ka quota test ho raha hai
+    config.setdefault("key_pool", {})["gemini"] = {**config.get("key_pool", {}).get("gemini", {}),
+                                                   "rpm": 10 ** 6, "tpm": 10 ** 12}
+    config["glossary"] = {}
+    for section in ("prompt_cache", "routing", "local_backend", "metrics"):
+        config[section] = {**config.get(section, {}), "enabled": False}
+    path = Path(workdir) / "config" / "prompts.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(config, indent=2, ensure_ascii=False), encoding="utf-8")
+
+
+def _child_env(settings):
+    env = dict(os.environ)
+    env["PYTHONPATH"] = str(ROOT) + os.pathsep + env.get("PYTHONPATH", "")
+    env["GEMINI_API_ENDPOINT"] = f"http://{settings['host']}:{settings['port']}"
+    env["GROQ_BASE_URL"] = env["GEMINI_API_ENDPOINT"]
+    # Sirf fake keys: .env ki asli keys (load_dotenv) khaali values se dab jaati hain
+    env["GEMINI_API_KEY"] = env["GEMINI_API_KEYS"] = ""
+    for n in range(1, 51):
+        env[f"GEMINI_API_KEY_{n}"] = f"loadtest-key-{n}" if n <= settings["keys"] else ""
+    return env
+
+
+def client_stats(workdir):
+    """Catalog se (translate_book ne har chunk likha): ok/fail, tokens, har chunk ka poora time (retries samet)."""
+    path = Path(workdir) / "data" / "catalog.sqlite"
+    if not path.exists():
+        return {"chunks_total": 0, "chunks_ok": 0, "chunks_failed": 0, "tokens_out": 0, "chunk_seconds": []}
+    db = sqlite3.connect(path)
+    try:
+        rows = db.execute("SELECT ok, tokens_out, seconds FROM chunks WHERE origin != 'manifest'").fetchall()
+        total = db.execute("SELECT COALESCE(SUM(chunks_total), 0) FROM chapters").fetchone()[0]
+    finally:
+        db.close()
+    return {
+        "chunks_total": total,
+        "chunks_ok": sum(ok for ok, _, _ in rows),
+        "chunks_failed": sum(1 for ok, _, _ in rows if not ok),
+        "tokens_out": sum(t for ok, t, _ in rows if ok),
+        "chunk_seconds": [s for ok, _, s in rows if ok],
+    }
+
+
+def run_level(provider, config, settings, level, run_dir):
+    workdir = Path(run_dir) / f"level-{level}"
+    make_book(workdir, level * settings["waves"], settings["chunks_per_chapter"], seed=level)
+    make_config(workdir, config, settings, level)
+    provider.reset()
+
+    print(f"🏋️ Level {level}: {level * settings['waves']} chapters x {settings['chunks_per_chapter']} chunks...")
+    started = time.perf_counter()
+    with open(workdir / "run.log", "w", encoding="utf-8") as log:
+        try:
+            subprocess.run([sys.executable, "-m", "src.translator", "--book", f"loadtest-{level}"], cwd=workdir,
+                           env=_child_env(settings), stdout=log, stderr=subprocess.STDOUT,
+                           timeout=settings["timeout_minutes"] * 60)
+            timed_out = False
+        except subprocess.TimeoutExpired:
+            timed_out = True
+    seconds = time.perf_counter() - started
+
+    client = client_stats(workdir)
+    server = provider.report()
+    attempted = client["chunks_ok"] + client["chunks_failed"]
+    latencies = client.pop("chunk_seconds")
+    return {
+        "level": level,
+        "seconds": round(seconds, 2),
+        "timed_out": timed_out,
+        **client,
+        "chunks_per_sec": round(client["chunks_ok"] / seconds, 2),
+        "tokens_per_sec": round(client["tokens_out"] / seconds),
+        "chunk_p50": round(percentile(latencies, 50), 2),
+        "chunk_p95": round(percentile(latencies, 95), 2),
+        "chunk_p99": round(percentile(latencies, 99), 2),
+        # 1.0 = har chunk ek hi request; 429/503 retries aur continuations isse upar le jaate hain
+        "amplification": round(server["requests"] / attempted, 2) if attempted else 0.0,
+        **server,
+    }
+
+
+# -------------------------------
+# REPORT (bina matplotlib: SVG haath se)
+# -------------------------------
+def svg_chart(title, levels, series, unit=""):
+    width, height, pad = 560, 300, 50
+    top = max([v for values in series.values() for v in values] + [1e-9]) * 1.1
+    colors = ("#8b0000", "#1f5f8b", "#2e7d32", "#b8860b")
+
+    def x(i):
+        return pad + i * (width - 2 * pad) / max(1, len(levels) - 1)
+
+    def y(v):
+        return height - pad - v / top * (height - 2 * pad)
+
+    parts = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" font-family="sans-serif" font-size="11">',
+             f'<text x="{width / 2}" y="18" text-anchor="middle" font-size="14">{title}</text>',
+             f'<line x1="{pad}" y1="{height - pad}" x2="{width - pad}" y2="{height - pad}" stroke="#555"/>',
+             f'<line x1="{pad}" y1="{pad}" x2="{pad}" y2="{height - pad}" stroke="#555"/>',
+             f'<text x="{width / 2}" y="{height - 12}" text-anchor="middle">requests in flight</text>']
+    for i, level in enumerate(levels):
+        parts.append(f'<text x="{x(i)}" y="{height - pad + 15}" text-anchor="middle">{level}</text>')
+    for step in range(5):
+        value = top * step / 4
+        parts.append(f'<text x="{pad - 5}" y="{y(value) + 4}" text-anchor="end">{value:.3g}{unit}</text>')
+    for n, (name, values) in enumerate(series.items()):
+        color = colors[n % len(colors)]
+        points = " ".join(f"{x(i):.1f},{y(v):.1f}" for i, v in enumerate(values))
+        parts.append(f'<polyline fill="none" stroke="{color}" stroke-width="2" points="{points}"/>')
+        parts.extend(f'<circle cx="{x(i):.1f}" cy="{y(v):.1f}" r="3" fill="{color}"/>' for i, v in enumerate(values))
+        parts.append(f'<text x="{width - pad + 5}" y="{pad + 14 * n}" fill="{color}">{name}</text>')
+    parts.append("</svg>")
+    return "\n".join(parts)
+
+
+def write_report(results, settings, run_dir):
+    levels = [r["level"] for r in results]
+    charts = [
+        svg_chart("Throughput", levels, {"chunks/s": [r["chunks_per_sec"] for r in results]}),
+        svg_chart("Chunk latency (retries samet)", levels,
+                  {"p50": [r["chunk_p50"] for r in results], "p95": [r["chunk_p95"] for r in results],
+                   "p99": [r["chunk_p99"] for r in results]}, "s"),
+        svg_chart("Error amplification (requests / chunk)", levels,
+                  {"amplification": [r["amplification"] for r in results]}),
+    ]
+    keys = ("level", "seconds", "chunks_ok", "chunks_failed", "chunks_per_sec", "tokens_per_sec", "chunk_p50",
+            "chunk_p99", "requests", "amplification", "max_in_flight", "truncated", "status")
+    table = "".join(
+        "<tr>" + "".join(f"<td>{r[k]}</td>" for k in keys) + "</tr>" for r in results
+    )
+    html = f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Load test</title>
+<style>body{{font-family:sans-serif;margin:2em}} td,th{{border:1px solid #ccc;padding:4px 8px}} table{{border-collapse:collapse}}</style>
+</head><body>
+<h1>Load test ({time.strftime('%Y-%m-%d %H:%M')})</h1>
+<pre>{json.dumps({k: v for k, v in settings.items() if k != 'levels'}, indent=2)}</pre>
+{''.join(f'<div>{c}</div>' for c in charts)}
+<table><tr>{''.join(f'<th>{k}</th>' for k in keys)}</tr>{table}</table>
+</body></html>"""
+    (Path(run_dir) / "report.html").write_text(html, encoding="utf-8")
+    (Path(run_dir) / "results.json").write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+
+def run(levels=None, settings=None, config=None):
+    """Har level ek nayi process (fresh KeyPool/controller/telemetry). Return: results list."""
+    if config is None:
+        config = json.loads((ROOT / "config" / "prompts.json").read_text(encoding="utf-8"))
+    settings = {**settings_from(config), **(settings or {})}
+    levels = levels or settings["levels"]
+    run_dir = Path(settings["output_dir"]).resolve() / time.strftime("%Y%m%d-%H%M%S")
+    run_dir.mkdir(parents=True, exist_ok=True)
+
+    provider = FakeProvider(settings)
+    server = start_server(provider, settings["host"], settings["port"])
+    print(f"🧪 Fake provider: http://{settings['host']}:{settings['port']} ({settings['keys']} keys)")
+
+    results = []
+    try:
+        for level in levels:
+            result = run_level(provider, config, settings, level, run_dir)
+            results.append(result)
+            print(f"   {level:>4} in flight: {result['chunks_per_sec']:.1f} chunks/s, "
+                  f"p50 {result['chunk_p50']:.1f}s / p99 {result['chunk_p99']:.1f}s, "
+                  f"{result['requests']} requests (x{result['amplification']}), "
+                  f"{result['chunks_failed']} fail, status {result['status']}")
+            write_report(results, settings, run_dir)
+    finally:
+        server.shutdown()
+        server.server_close()
+    print(f"📈 Report: {run_dir / 'report.html'}")
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Fake provider ke against translate_book ka load test")
+    parser.add_argument("--levels", help="Concurrency levels, jaise 50,100,200,500")
+    parser.add_argument("--keys", type=int)
+    parser.add_argument("--port", type=int)
+    parser.add_argument("--serve", action="store_true",
+                        help="Sirf fake provider chalao (GEMINI_API_ENDPOINT / GROQ_BASE_URL yahan point karo)")
+    args = parser.parse_args()
+
+    overrides = {k: v for k, v in (("keys", args.keys), ("port", args.port)) if v}
+    if args.serve:
+        config = json.loads((ROOT / "config" / "prompts.json").read_text(encoding="utf-8"))
+        settings = {**settings_from(config), **overrides}
+        server = start_server(FakeProvider(settings), settings["host"], settings["port"])
+        print(f"🧪 Fake provider: http://{settings['host']}:{settings['port']}  (Ctrl+C se band)")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            server.shutdown()
+    else:
+        run([int(x) for x in args.levels.split(",")] if args.levels else None, overrides)
@@ -0,0 +1,158 @@
+import os
+import re
+import time
+import threading
+from pathlib import Path
+
+from src import telemetry
+
+# -------------------------------
+# LOCAL CPU BACKEND (offline / bulk)
+# -------------------------------
+# Hosted API ki jagah apne CPU pe EN->HI model (Marian / NLLB, CTranslate2 format).
+# Interface wahi hai jo Gemini model ka: generate_content(prompt, stream=True),
+# isliye KeyPool, throttle, streaming, validator, TM - sab bina badlaav chalte hain.
+# Chunk ke saare sentences ek batch me jaate hain; CTranslate2 saare cores use karta hai.
+DEFAULTS = {
+    "enabled": False,
+    "model_dir": "models/opus-mt-en-hi-ct2",   # ct2-transformers-converter ka output
+    "source_spm": "source.spm",
+    "target_spm": "target.spm",
+    "source_prefix": [],      # NLLB: ["eng_Latn"]
+    "target_prefix": [],      # NLLB: ["hin_Deva"]
+    "compute_type": "int8",
+    "workers": 2,             # ek saath kitne batches (inter_threads)
+    "threads": 0,             # 0 = saare cores
+    "batch_size": 32,         # sentences per batch
+    "beam_size": 2,
+    "max_decoding_length": 256,
+}
+
+SENTENCE_END = re.compile(r"(?:(?<=[.!?…])|(?<=[.!?…][\"'”’)]))\s+(?=[\"'“‘(]?[A-Z0-9])")
+
+
+def extract_source(prompt):
+    """Translator ke prompt me se sirf source text nikaalo (context/hints local model ke kaam ke nahi)."""
+    tail = re.search(r"Remaining source text[^\n]*\n(.*?)\n\s*Continue the translation", prompt, flags=re.S)
+    if tail:
+        return tail.group(1).strip()
+    body = re.search(r"Now translate the following[^\n]*\n(.*?)---END---", prompt, flags=re.S)
+    if body:
+        return body.group(1).strip()
+    return prompt.strip()
+
+
+def split_sentences(paragraph):
+    return [s.strip() for s in SENTENCE_END.split(paragraph) if s.strip()]
+
+
+class _Part:
+    def __init__(self, text):
+        self.text = text
+
+
+class _Candidate:
+    finish_reason = "STOP"
+
+
+class _Response:
+    # Gemini stream jaisa: iterate karo toh paragraph-wise parts, end me candidates
+    def __init__(self, paragraphs):
+        self.parts = [_Part(p + "\n\n") for p in paragraphs]
+        self.candidates = [_Candidate()]
+
+    def __iter__(self):
+        return iter(self.parts)
+
+
+class LocalModel:
+    def __init__(self, glossary=None, **settings):
+        cfg = {**DEFAULTS, **settings}
+        try:
+            import ctranslate2
+            import sentencepiece as spm
+        except ImportError:
+            raise ImportError("❌ Local backend ke liye 'pip install ctranslate2 sentencepiece' chahiye.")
+
+        model_dir = Path(cfg["model_dir"])
+        if not model_dir.exists():
+            raise FileNotFoundError(f"❌ Local model nahi mila: {model_dir} (ct2-transformers-converter se bana le)")
+
+        cores = os.cpu_count() or 1
+        self.workers = max(1, int(cfg["workers"]))
+        threads = int(cfg["threads"]) or cores
+        self.translator = ctranslate2.Translator(
+            str(model_dir),
+            device="cpu",
+            compute_type=cfg["compute_type"],
+            inter_threads=self.workers,
+            intra_threads=max(1, threads // self.workers),
+        )
+        self.source_sp = spm.SentencePieceProcessor(model_file=str(model_dir / cfg["source_spm"]))
+        self.target_sp = spm.SentencePieceProcessor(model_file=str(model_dir / cfg["target_spm"]))
+
+        self.name = model_dir.name
+        self.source_prefix = list(cfg["source_prefix"])
+        self.target_prefix = list(cfg["target_prefix"])
+        self.batch_size = int(cfg["batch_size"])
+        self.beam_size = int(cfg["beam_size"])
+        self.max_decoding_length = int(cfg["max_decoding_length"])
+        self.glossary = glossary or {}
+
+        self._lock = threading.Lock()
+        self._sentences = 0
+        self._started = None
+
+    def _protect_terms(self, text):
+        # Glossary terms pehle hi target script me: model unhe copy kar deta hai, validator khush
+        for term, target in self.glossary.items():
+            text = re.sub(rf"\b{re.escape(term)}\b", target, text)
+        return text
+
+    def translate_paragraphs(self, paragraphs):
+        """Saare paragraphs ke sentences ek batch me; return: translated paragraphs (same order)."""
+        sentences, owners = [], []
+        for idx, para in enumerate(paragraphs):
+            for sentence in split_sentences(self._protect_terms(para)):
+                sentences.append(sentence)
+                owners.append(idx)
+        if not sentences:
+            return ["" for _ in paragraphs]
+
+        start = time.perf_counter()
+        with self._lock:
+            if self._started is None:
+                self._started = start
+
+        tokens = [self.source_prefix + self.source_sp.encode(s, out_type=str) for s in sentences]
+        results = self.translator.translate_batch(
+            tokens,
+            target_prefix=[self.target_prefix] * len(tokens) if self.target_prefix else None,
+            max_batch_size=self.batch_size,
+            beam_size=self.beam_size,
+            max_decoding_length=self.max_decoding_length,
+        )
+
+        out = [[] for _ in paragraphs]
+        for owner, result in zip(owners, results):
+            pieces = result.hypotheses[0][len(self.target_prefix):]
+            out[owner].append(self.target_sp.decode(pieces))
+
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self._sentences += len(sentences)
+            rate = self._sentences / max(time.perf_counter() - self._started, 1e-6)
+        telemetry.incr("local_sentences", len(sentences), model=self.name)
+        telemetry.set_gauge("local_sentences_per_sec", round(rate, 2), model=self.name)
+        telemetry.set_gauge("local_batch_seconds", round(elapsed, 3), model=self.name)
+        return [" ".join(parts) for parts in out]
+
+    def generate_content(self, prompt, stream=False):
+        paragraphs = [p.strip() for p in extract_source(prompt).split("\n") if p.strip()]
+        return _Response(self.translate_paragraphs(paragraphs))
+
+    def throughput(self):
+        with self._lock:
+            if not self._started:
+                return 0.0
+            return self._sentences / max(time.perf_counter() - self._started, 1e-6)
@@ -0,0 +1,48 @@
+import json
+import hashlib
+from pathlib import Path
+
+# -------------------------------
+# CHUNK MANIFEST
+# -------------------------------
+# Har chapter ke chunks ka hisaab: source, translation, validator score.
+# Isse dobara run pe sirf fail/bache hue chunks API ko jaate hain.
+MANIFEST_DIR = Path("data/manifests")
+
+
+def text_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def manifest_path(stem, manifest_dir=MANIFEST_DIR):
+    return Path(manifest_dir) / f"{stem}.json"
+
+
+def load(path):
+    path = Path(path)
+    if not path.exists():
+        return {"chunks": []}
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError:
+        # Aadhi likhi file - naye sire se
+        return {"chunks": []}
+
+
+def save(path, data):
+    # Pehle temp file, phir replace: crash me bhi manifest adhoora nahi hoga
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".json.tmp")
+    tmp.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+    tmp.replace(path)
+
+
+def reusable(entry, chunk):
+    # Chunk wahi hai aur pichli baar validator pass tha
+    return bool(entry) and entry.get("hash") == text_hash(chunk) and entry.get("ok")
+
+
+def has_failures(path):
+    data = load(path)
+    return any(not entry.get("ok") for entry in data.get("chunks", []))
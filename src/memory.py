@@ -0,0 +1,226 @@
+import re
+import sys
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+
+from src import manifest
+from src.bitext import align_sentences, split_sentences
+
+# -------------------------------
+# TRANSLATION MEMORY (TM)
+# -------------------------------
+# Pehle translate ho chuke source/target segments (paragraph level) ka SQLite store.
+# Exact match = seedha reuse (API call zero). Near match = prompt me hint.
+# Fuzzy lookup MinHash + LSH bands se hota hai, isliye poori catalogue pe bhi fast hai.
+TM_PATH = Path("data/tm.sqlite")
+
+NUM_PERM = 64      # MinHash signature length
+BANDS = 16         # LSH bands (16 x 4 rows)
+ROWS = NUM_PERM // BANDS
+_PRIME = (1 << 61) - 1
+_MASK = (1 << 32) - 1
+
+# Fixed seeds se permutations, taaki har run me same signature bane
+_PERMS = [
+    (int.from_bytes(hashlib.sha256(f"a{i}".encode()).digest()[:8], "big") % _PRIME | 1,
+     int.from_bytes(hashlib.sha256(f"b{i}".encode()).digest()[:8], "big") % _PRIME)
+    for i in range(NUM_PERM)
+]
+
+
+def normalize(text):
+    return re.sub(r"\s+", " ", text.strip().lower())
+
+
+def segment_hash(text):
+    return hashlib.sha256(normalize(text).encode("utf-8")).hexdigest()[:20]
+
+
+def split_paragraphs(text):
+    return [p.strip() for p in re.split(r"\n+", text) if p.strip()]
+
+
+def shingles(text, size=3):
+    words = re.findall(r"\w+", normalize(text))
+    if len(words) < size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def minhash(text):
+    hashed = [
+        int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "big")
+        for s in shingles(text)
+    ]
+    if not hashed:
+        return [0] * NUM_PERM
+    return [min(((a * h + b) % _PRIME) & _MASK for h in hashed) for a, b in _PERMS]
+
+
+def similarity(sig_a, sig_b):
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / NUM_PERM
+
+
+def _pack(sig):
+    return b"".join(v.to_bytes(4, "big") for v in sig)
+
+
+def _unpack(blob):
+    return [int.from_bytes(blob[i:i + 4], "big") for i in range(0, len(blob), 4)]
+
+
+def _bands(sig):
+    return [(band, hashlib.md5(_pack(sig[band * ROWS:(band + 1) * ROWS])).hexdigest()[:16]) for band in range(BANDS)]
+
+
+class TranslationMemory:
+    def __init__(self, path=TM_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self.db = sqlite3.connect(self.path, check_same_thread=False)
+        self.db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS segments (
+                id INTEGER PRIMARY KEY,
+                src_hash TEXT UNIQUE,
+                source TEXT,
+                target TEXT,
+                book TEXT,
+                signature BLOB
+            );
+            CREATE TABLE IF NOT EXISTS lsh (
+                band INTEGER,
+                bucket TEXT,
+                seg_id INTEGER
+            );
+            CREATE INDEX IF NOT EXISTS lsh_lookup ON lsh(band, bucket);
+            """
+        )
+
+    # --- write ---
+    def add(self, source, target, book="", commit=True):
+        source, target = source.strip(), target.strip()
+        if not source or not target:
+            return
+        sig = minhash(source)
+        with self._lock:
+            cur = self.db.execute(
+                "INSERT OR IGNORE INTO segments (src_hash, source, target, book, signature) VALUES (?, ?, ?, ?, ?)",
+                (segment_hash(source), source, target, book, _pack(sig)),
+            )
+            if cur.rowcount:
+                self.db.executemany(
+                    "INSERT INTO lsh (band, bucket, seg_id) VALUES (?, ?, ?)",
+                    [(band, bucket, cur.lastrowid) for band, bucket in _bands(sig)],
+                )
+            if commit:
+                self.db.commit()
+
+    def add_aligned(self, source, target, book="", commit=True):
+        """
+        Chunk/chapter pair: paragraphs barabar hain toh paragraph-level pairs,
+        warna sentence alignment (bitext wala Gale-Church) - poora block ek segment ho toh fuzzy kuch nahi pakadta.
+        """
+        src_paras = split_paragraphs(source)
+        tgt_paras = split_paragraphs(target)
+        if len(src_paras) == len(tgt_paras):
+            pairs = zip(src_paras, tgt_paras)
+        else:
+            pairs = align_sentences(split_sentences(" ".join(src_paras)), split_sentences(" ".join(tgt_paras)))
+        for s, t in pairs:
+            self.add(s, t, book, commit=False)  # add() khali side (1:0 bead) chhod deta hai
+        if commit:
+            with self._lock:
+                self.db.commit()
+
+    def build(self, raw_dir="data/raw_text", output_dir="data/output_books",
+              manifest_dir=manifest.MANIFEST_DIR, book=""):
+        """
+        Manifests ke chunk pairs se (source/translation chunk-wise pehle se hain).
+        Jis chapter ka manifest nahi (purani runs), uska .txt/.md sentence-align hoke.
+        """
+        before = self.count()
+        covered = set()
+        for path in sorted(Path(manifest_dir).glob("*.json")):
+            covered.add(path.stem)
+            for entry in manifest.load(path).get("chunks", []):
+                if entry.get("ok") and entry.get("translation"):
+                    self.add_aligned(entry["source"], entry["translation"], book or path.stem, commit=False)
+
+        for md in sorted(Path(output_dir).glob("*.md")):
+            txt = Path(raw_dir) / f"{md.stem}.txt"
+            if md.stem not in covered and txt.exists():
+                self.add_aligned(txt.read_text(encoding="utf-8"), md.read_text(encoding="utf-8"), book or md.stem,
+                                 commit=False)
+
+        with self._lock:
+            self.db.commit()
+        added = self.count() - before
+        print(f"🧠 Translation memory: {added} naye segments (total {self.count()}).")
+        return added
+
+    # --- read ---
+    def exact(self, source):
+        with self._lock:
+            row = self.db.execute("SELECT target FROM segments WHERE src_hash = ?", (segment_hash(source),)).fetchone()
+        return row[0] if row else None
+
+    def fuzzy(self, source, k=3, threshold=0.5):
+        """Return: [(score, source, target), ...] best first."""
+        sig = minhash(source)
+        with self._lock:
+            ids = set()
+            for band, bucket in _bands(sig):
+                ids.update(r[0] for r in self.db.execute(
+                    "SELECT seg_id FROM lsh WHERE band = ? AND bucket = ?", (band, bucket)
+                ))
+            if not ids:
+                return []
+            marks = ",".join("?" * len(ids))
+            rows = self.db.execute(f"SELECT source, target, signature FROM segments WHERE id IN ({marks})", list(ids)).fetchall()
+
+        scored = [(similarity(sig, _unpack(blob)), s, t) for s, t, blob in rows]
+        scored = [item for item in scored if item[0] >= threshold]
+        return sorted(scored, reverse=True)[:k]
+
+    def lookup_chunk(self, chunk, threshold=0.5, max_hints=4):
+        """
+        Chunk ke har paragraph ka exact match mila toh poori translation return.
+        Warna (None, hints) jahan hints = [(score, source, target)] near matches.
+        """
+        whole = self.exact(chunk)
+        if whole:
+            return whole, []
+
+        paragraphs = split_paragraphs(chunk)
+        exact_hits = [self.exact(p) for p in paragraphs]
+        if paragraphs and all(exact_hits):
+            return "\n\n".join(exact_hits), []
+
+        hints = []
+        for para, hit in zip(paragraphs, exact_hits):
+            if hit:
+                hints.append((1.0, para, hit))
+            elif len(para) > 40:
+                hints.extend(self.fuzzy(para, k=1, threshold=threshold))
+        hints.sort(reverse=True)
+        return None, hints[:max_hints]
+
+    def count(self):
+        with self._lock:
+            return self.db.execute("SELECT COUNT(*) FROM segments").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self.db.close()
+
+
+if __name__ == "__main__":
+    # python -m src.memory build [book_name]
+    if len(sys.argv) > 1 and sys.argv[1] == "build":
+        TranslationMemory().build(book=sys.argv[2] if len(sys.argv) > 2 else "")
+    else:
+        print("Usage: python -m src.memory build [book_name]")
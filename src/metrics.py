@@ -0,0 +1,120 @@
+import re
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from src import telemetry
+
+# -------------------------------
+# PROMETHEUS EXPORTER
+# -------------------------------
+# Telemetry store ko Prometheus text format (0.0.4) me dikhata hai.
+# Lambi run ke dauran dashboards throughput gir-ne ko turant pakad sakein:
+#   translator_chunks_done_total{origin="api|tm|dedup|manifest"}, translator_chunks_pending,
+#   translator_request_latency_seconds (histogram), translator_retries_total, translator_rate_limits_total,
+#   translator_key_wait_seconds, translator_tokens_in_total / _out_total, translator_concurrency_window,
+#   translator_stage_duration_seconds{stage="extract|translate|render"}
+PREFIX = "translator_"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Default sirf isi machine pe. Doosre interfaces (0.0.0.0, LAN IP) pe tabhi jab "expose": true ho -
+# /metrics me book/chapter naam aur key usage hai, bina auth ke.
+DEFAULTS = {"enabled": False, "host": "127.0.0.1", "port": 9108, "expose": False}
+LOOPBACK = {"127.0.0.1", "localhost", "::1"}
+
+
+def _metric_name(name):
+    return PREFIX + re.sub(r"[^a-zA-Z0-9_]", "_", name)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels, extra=None):
+    items = {**labels, **(extra or {})}
+    if not items:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in sorted(items.items())) + "}"
+
+
+def _number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render(snapshot=None):
+    snapshot = snapshot or telemetry.snapshot()
+    lines = []
+    typed = set()
+
+    def header(name, kind):
+        if name not in typed:
+            typed.add(name)
+            lines.append(f"# TYPE {name} {kind}")
+
+    for item in sorted(snapshot["counters"], key=lambda i: i["name"]):
+        name = _metric_name(item["name"]) + "_total"
+        header(name, "counter")
+        lines.append(f"{name}{_labels(item['labels'])} {_number(item['value'])}")
+
+    for item in sorted(snapshot["gauges"], key=lambda i: i["name"]):
+        if not isinstance(item["value"], (int, float)):
+            continue
+        name = _metric_name(item["name"])
+        header(name, "gauge")
+        lines.append(f"{name}{_labels(item['labels'])} {_number(item['value'])}")
+
+    for item in sorted(snapshot.get("histograms", []), key=lambda i: i["name"]):
+        name = _metric_name(item["name"])
+        header(name, "histogram")
+        for bound, count in zip(item["buckets"], item["counts"]):
+            lines.append(f"{name}_bucket{_labels(item['labels'], {'le': _number(float(bound))})} {count}")
+        lines.append(f"{name}_bucket{_labels(item['labels'], {'le': '+Inf'})} {item['count']}")
+        lines.append(f"{name}_sum{_labels(item['labels'])} {_number(float(item['sum']))}")
+        lines.append(f"{name}_count{_labels(item['labels'])} {item['count']}")
+
+    return "\n".join(lines) + "\n"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, fmt, *args):
+        # Prometheus har 15s scrape karta hai - terminal me kachra nahi chahiye
+        pass
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def start_server(host=DEFAULTS["host"], port=DEFAULTS["port"]):
+    """Background thread me /metrics. Ek process me ek hi baar chalta hai (dobara call = same server)."""
+    global _server
+    with _server_lock:
+        if _server is None:
+            _server = ThreadingHTTPServer((host, int(port)), _Handler)
+            threading.Thread(target=_server.serve_forever, name="metrics", daemon=True).start()
+            print(f"📈 Metrics: http://{host}:{port}/metrics")
+        return _server
+
+
+def start_from_config(config):
+    settings = {**DEFAULTS, **config.get("metrics", {})}
+    if not settings["enabled"]:
+        return None
+    host = settings["host"]
+    if host not in LOOPBACK and not settings["expose"]:
+        print(f"⚠️ Metrics host {host} ke liye \"expose\": true chahiye - abhi sirf 127.0.0.1 pe.")
+        host = "127.0.0.1"
+    return start_server(host, settings["port"])
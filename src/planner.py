@@ -0,0 +1,230 @@
+import re
+import json
+import math
+from datetime import datetime
+from pathlib import Path
+
+from src.keypool import DEFAULTS as KEY_DEFAULTS, load_keys, estimate_tokens
+
+# -------------------------------
+# COST + TIME PLANNER (dry run)
+# -------------------------------
+# Job shuru karne se pehle andaza: kitni requests, kitne tokens, kitna paisa, kitna time.
+# Model simple hai par wahi limits use karta hai jo asli run pe lagti hain:
+# key pool ka RPM/TPM, AIMD ki max window, aur chapter ke andar chunks ka sequential chalna.
+PLAN_PATH = Path("data/plan.json")
+
+DEFAULTS = {
+    "output_token_ratio": 2.5,   # Hindi (Devanagari) output tokens / English input tokens
+    "context_chars": 2400,       # prompt me pichla original + translated context
+    "providers": {
+        # Price USD per 1M tokens; latency = pehla token aane tak, phir output_tokens_per_sec
+        "gemini": {"input_per_million": 0.30, "output_per_million": 2.50, "latency_seconds": 2.0, "output_tokens_per_sec": 120},
+        "groq": {"input_per_million": 0.59, "output_per_million": 0.79, "latency_seconds": 0.5, "output_tokens_per_sec": 250},
+        "local": {"input_per_million": 0.0, "output_per_million": 0.0, "latency_seconds": 0.2, "output_tokens_per_sec": 60},
+    },
+}
+
+KEY_ENV = {"gemini": "GEMINI_API_KEY", "groq": "GROQ_API_KEY"}
+
+
+def parse_deadline(value, now=None):
+    """'6h', '90m', '1d', '45s' ya ISO time ('2026-10-20T18:00') -> seconds from now."""
+    now = now or datetime.now()
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([smhd])\s*", str(value))
+    if match:
+        return float(match.group(1)) * {"s": 1, "m": 60, "h": 3600, "d": 86400}[match.group(2)]
+    return (datetime.fromisoformat(str(value)) - now).total_seconds()
+
+
+def format_seconds(seconds):
+    if seconds == math.inf:
+        return "∞"
+    seconds = int(round(seconds))
+    h, rest = divmod(seconds, 3600)
+    m, s = divmod(rest, 60)
+    return f"{h}h {m:02d}m" if h else f"{m}m {s:02d}s"
+
+
+# -------------------------------
+# TOKENS
+# -------------------------------
+def estimate_chapter(name, chunks, system_tokens, settings):
+    """Ek chapter ke pending chunks ka hisaab (har chunk = ek request)."""
+    context_tokens = estimate_tokens("x" * settings["context_chars"])
+    outputs = [int(estimate_tokens(c) * settings["output_token_ratio"]) for c in chunks]
+    return {
+        "chapter": name,
+        "requests": len(chunks),
+        "input_tokens": sum(system_tokens + context_tokens + estimate_tokens(c) for c in chunks),
+        "output_tokens": sum(outputs),
+    }
+
+
+# -------------------------------
+# PROVIDER LIMITS
+# -------------------------------
+def provider_profile(name, config, settings, keys=None):
+    """
+    Provider ki capacity: keys x RPM/TPM, max window, latency aur price.
+    Hisaab ke liye asli key nahi chahiye: keys na di ho aur env me bhi na mile toh 1 maan lo (assumed_keys).
+    """
+    price = settings["providers"][name]
+    assumed = False
+    if name == "local":
+        keys = 1
+        rpm = tpm = math.inf
+        max_window = config.get("local_backend", {}).get("workers", 2)
+    else:
+        if keys is None:
+            keys = len(load_keys(KEY_ENV[name]))
+            if not keys:
+                keys, assumed = 1, True
+        limits = {**KEY_DEFAULTS, **config.get("key_pool", {}).get(name, {})}
+        rpm = limits["rpm"] * keys
+        tpm = limits["tpm"] * keys
+        # translate_book() bhi window ko keys ke saath scale karta hai
+        max_window = config.get("concurrency", {}).get("max", 8) * max(keys, 1)
+    return {"name": name, "keys": keys, "assumed_keys": assumed, "rpm": rpm, "tpm": tpm,
+            "max_window": int(max_window), **price}
+
+
+def simulate(estimates, profile, concurrency):
+    """
+    Wall time = sabse dheema bottleneck:
+    RPM, TPM, window (busy seconds / concurrency) ya sabse lamba chapter (chunks sequential hain).
+    """
+    if not estimates:
+        return {"seconds": 0.0, "cost": 0.0, "chapters": []}
+    if not profile["keys"]:
+        return {"seconds": math.inf, "cost": math.inf, "chapters": [], "bottleneck": "no keys"}
+
+    chapters = []
+    for est in estimates:
+        busy = est["requests"] * profile["latency_seconds"] + est["output_tokens"] / profile["output_tokens_per_sec"]
+        cost = (est["input_tokens"] * profile["input_per_million"] + est["output_tokens"] * profile["output_per_million"]) / 1e6
+        chapters.append({**est, "seconds": busy, "cost": cost})
+
+    requests = sum(c["requests"] for c in chapters)
+    tokens = sum(c["input_tokens"] + c["output_tokens"] for c in chapters)
+    window = max(1, min(concurrency, len(chapters)))
+
+    bounds = {
+        "longest chapter": max(c["seconds"] for c in chapters),
+        "concurrency": sum(c["seconds"] for c in chapters) / window,
+        "rpm": requests / (profile["rpm"] / 60),
+        "tpm": tokens / (profile["tpm"] / 60),
+    }
+    bottleneck = max(bounds, key=bounds.get)
+    return {
+        "seconds": bounds[bottleneck],
+        "bottleneck": bottleneck,
+        "cost": sum(c["cost"] for c in chapters),
+        "requests": requests,
+        "chapters": chapters,
+    }
+
+
+def pick_concurrency(estimates, profile, deadline):
+    """Sabse chhoti window jo deadline me khatam kare; na ho sake toh None."""
+    for window in range(1, profile["max_window"] + 1):
+        if simulate(estimates, profile, window)["seconds"] <= deadline:
+            return window
+    return None
+
+
+def plan_mix(estimates, profiles, deadline):
+    """
+    Deadline ke liye provider mix: sasta provider pehle, lambe chapters pehle,
+    jab tak us provider ka set max window pe deadline me fit ho. Bache chapters agle provider ko.
+    Return: ({provider: {"chapters": [...], "concurrency": n}}, unassigned)
+    """
+    def unit_cost(p):
+        return p["input_per_million"] + p["output_per_million"] * DEFAULTS["output_token_ratio"]
+
+    remaining = sorted(estimates, key=lambda e: e["output_tokens"], reverse=True)
+    mix = {}
+    for profile in sorted((p for p in profiles if p["keys"]), key=unit_cost):
+        taken, left = [], []
+        for est in remaining:
+            if simulate(taken + [est], profile, profile["max_window"])["seconds"] <= deadline:
+                taken.append(est)
+            else:
+                left.append(est)
+        if taken:
+            mix[profile["name"]] = {
+                "chapters": [e["chapter"] for e in taken],
+                "concurrency": pick_concurrency(taken, profile, deadline),
+                **{k: simulate(taken, profile, profile["max_window"])[k] for k in ("seconds", "cost")},
+            }
+        remaining = left
+    return mix, [e["chapter"] for e in remaining]
+
+
+# -------------------------------
+# DRY RUN REPORT
+# -------------------------------
+def plan_book(chapters, config, system_instruction, provider="gemini", finish_by=None, path=PLAN_PATH, keys=None):
+    """
+    chapters: {chapter_name: [pending chunks]} (translate_book(dry_run=True) banata hai)
+    keys: provider ki kitni keys maano (--keys); None = env se, wahan bhi nahi toh 1.
+    Ek bhi API call nahi hoti; report print + data/plan.json me save.
+    """
+    settings = {**DEFAULTS, **config.get("planner", {})}
+    settings["providers"] = {**DEFAULTS["providers"], **settings.get("providers", {})}
+    system_tokens = estimate_tokens(system_instruction)
+
+    estimates = [estimate_chapter(name, chunks, system_tokens, settings) for name, chunks in chapters.items() if chunks]
+    profile = provider_profile(provider, config, settings, keys)
+    result = simulate(estimates, profile, profile["max_window"])
+
+    print(f"\n🧮 DRY RUN ({provider}, {profile['keys']} key(s), window up to {profile['max_window']})")
+    if profile["assumed_keys"]:
+        print(f"ℹ️ {KEY_ENV[provider]} nahi mili - 1 key maan ke hisaab. Zyada keys ke liye --keys N.")
+    print(f"{'Chapter':<40} {'Req':>5} {'In tok':>9} {'Out tok':>9} {'Time':>9} {'Cost $':>8}")
+    for ch in result["chapters"]:
+        print(f"{ch['chapter'][:40]:<40} {ch['requests']:>5} {ch['input_tokens']:>9} {ch['output_tokens']:>9} "
+              f"{format_seconds(ch['seconds']):>9} {ch['cost']:>8.4f}")
+    print(f"📚 Book: {result.get('requests', 0)} requests, ~{format_seconds(result['seconds'])} wall time "
+          f"(bottleneck: {result.get('bottleneck', '-')}), ~${result['cost']:.4f}")
+
+    report = {
+        "provider": provider,
+        "keys": profile["keys"],
+        "assumed_keys": profile["assumed_keys"],
+        "max_window": profile["max_window"],
+        "wall_seconds": result["seconds"],
+        "bottleneck": result.get("bottleneck"),
+        "cost_usd": result["cost"],
+        "requests": result.get("requests", 0),
+        "chapters": result["chapters"],
+    }
+
+    if finish_by:
+        deadline = parse_deadline(finish_by)
+        window = pick_concurrency(estimates, profile, deadline)
+        report["deadline_seconds"] = deadline
+        if window:
+            print(f"🎯 {format_seconds(deadline)} me khatam: {provider} pe concurrency max={window} kaafi hai.")
+            report["recommended"] = {provider: {"chapters": [e["chapter"] for e in estimates], "concurrency": window}}
+        else:
+            profiles = [provider_profile(name, config, settings) for name in settings["providers"]
+                        if name != "local" or config.get("local_backend", {}).get("enabled")]
+            mix, unassigned = plan_mix(estimates, profiles, deadline)
+            report["recommended"] = mix
+            report["unassigned"] = unassigned
+            print(f"🎯 {provider} akele {format_seconds(deadline)} me nahi kar payega."
+                  + (" Suggested mix:" if mix else ""))
+            assumed = {p["name"] for p in profiles if p["assumed_keys"]}
+            for name, part in mix.items():
+                print(f"   - {name}: {len(part['chapters'])} chapters, concurrency {part['concurrency']}, "
+                      f"~{format_seconds(part['seconds'])}, ~${part['cost']:.4f}"
+                      + (" (1 key maan ke)" if name in assumed else ""))
+            if unassigned:
+                print(f"⚠️ Deadline possible nahi: {len(unassigned)} chapters kisi provider pe fit nahi hue "
+                      f"(ek chapter ke chunks sequential chalte hain). Keys badhao ya deadline.")
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=4, ensure_ascii=False, default=str), encoding="utf-8")
+    return report
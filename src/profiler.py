@@ -0,0 +1,226 @@
+import io
+import os
+import sys
+import uuid
+import json
+import time
+import pstats
+import cProfile
+import threading
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+# -------------------------------
+# STAGE PROFILER (--profile)
+# -------------------------------
+# Har stage (extract, chunking, prompts, translate, publish) cProfile + tracemalloc ke neeche.
+# Report folder me har stage ki:
+#   <stage>.prof        - raw cProfile (snakeviz / gprof2dot se call graph)
+#   <stage>.txt         - top functions (cumulative + self time) aur unke callers
+#   <stage>.alloc.txt   - top allocators (line wise) + peak memory
+#   <stage>.folded      - (optional) sampling profile, saare threads; flamegraph.pl / speedscope me kholo
+# cProfile ek hi thread dekhta hai, isliye stage ke andar:
+#   - naye threads (translate ka ThreadPoolExecutor) ko threading.setprofile se apna Profile milta hai
+#   - worker processes (extract/reflow, publish writers) for_workers() se apna .prof likhte hain
+# Sab ek hi <stage>.prof me merge. Profiling band ho toh stage() kuch nahi karta, isliye code me kahin bhi laga sakte hain.
+REPORT_DIR = Path("data/profiles")
+
+_state = {"dir": None, "sample_interval": None, "worker_dir": None}
+
+# 3.12+ me cProfile sys.monitoring pe hai: ek hi Profile saare threads dekhta hai (doosra enable = error)
+PER_THREAD = sys.version_info < (3, 12)
+
+
+def enable(report_dir=REPORT_DIR, sample_interval=None):
+    run_dir = Path(report_dir) / datetime.now().strftime("%Y%m%d-%H%M%S")
+    run_dir.mkdir(parents=True, exist_ok=True)
+    _state.update(dir=run_dir, sample_interval=sample_interval)
+    print(f"🔬 Profiling ON -> {run_dir}")
+    return run_dir
+
+
+def enabled():
+    return _state["dir"] is not None
+
+
+class Sampler:
+    """
+    Chhota sampling profiler: har interval pe saare threads ke stack (sys._current_frames).
+    Stage se pehle bane threads aur native kaam (jo cProfile nahi dekhta) bhi yahan dikhte hain.
+    """
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="sampler", daemon=True)
+
+    def _run(self):
+        me = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for tid, frame in sys._current_frames().items():
+                if tid == me:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{Path(code.co_filename).name}:{code.co_name}")
+                    frame = frame.f_back
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def folded(self):
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common())
+
+
+class Profiled:
+    """Worker process me func ko cProfile ke neeche chalao; har call ka .prof stage ke workers folder me."""
+
+    def __init__(self, func, out_dir):
+        self.func = func
+        self.out_dir = out_dir
+
+    def __call__(self, *args):
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            return self.func(*args)
+        finally:
+            profile.disable()
+            profile.dump_stats(Path(self.out_dir) / f"{os.getpid()}-{uuid.uuid4().hex[:8]}.prof")
+
+
+def for_workers(func):
+    """ProcessPool ko do: stage profile ho raha hai toh Profiled(func), warna func jaisa hai."""
+    if _state["worker_dir"] is None:
+        return func
+    return Profiled(func, _state["worker_dir"])
+
+
+def _thread_profiler():
+    """Stage ke dauraan shuru hue har thread ka apna cProfile (pehle hi call pe enable)."""
+    profiles = []
+    lock = threading.Lock()
+
+    def hook(frame, event, arg):
+        sys.setprofile(None)
+        profile = cProfile.Profile()
+        with lock:
+            profiles.append(profile)
+        profile.enable()
+
+    return profiles, hook
+
+
+def _cpu_report(stats, name, elapsed, coverage):
+    out = io.StringIO()
+    stats.stream = out
+    out.write(f"Stage: {name}  wall: {elapsed:.3f}s\n{coverage}\n\n=== Top by cumulative time ===\n")
+    stats.sort_stats("cumulative").print_stats(40)
+    out.write("\n=== Top by self time ===\n")
+    stats.sort_stats("tottime").print_stats(25)
+    out.write("\n=== Callers of the hottest functions ===\n")
+    stats.sort_stats("tottime").print_callers(10)
+    return out.getvalue()
+
+
+def _top_functions(stats, limit=5):
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)[:limit]
+    return [{"function": f"{Path(f).name}:{line}({func})", "self_seconds": round(tt, 4), "calls": nc}
+            for (f, line, func), (cc, nc, tt, ct, callers) in rows]
+
+
+def _alloc_report(snapshot, peak, limit=25):
+    lines = [f"Peak traced memory: {peak / 1024 / 1024:.2f} MB", "", "=== Top allocators (by line) ==="]
+    top = snapshot.statistics("lineno")[:limit]
+    for stat in top:
+        lines.append(str(stat))
+    lines.append("")
+    lines.append("=== Tracebacks of the 3 biggest ===")
+    for stat in snapshot.statistics("traceback")[:3]:
+        lines.append(f"{stat.size / 1024:.1f} KiB in {stat.count} blocks")
+        lines.extend("    " + line for line in stat.traceback.format())
+    return "\n".join(lines)
+
+
+@contextmanager
+def stage(name):
+    if not enabled():
+        yield
+        return
+
+    run_dir = _state["dir"]
+    worker_dir = run_dir / f"{name}.workers"
+    worker_dir.mkdir(exist_ok=True)
+    _state["worker_dir"] = worker_dir
+    tracemalloc.start(25)
+    sampler = Sampler(_state["sample_interval"]) if _state["sample_interval"] else None
+    if sampler:
+        sampler.start()
+    thread_profiles, hook = _thread_profiler()
+    if PER_THREAD:
+        threading.setprofile(hook)
+    profile = cProfile.Profile()
+    start = time.perf_counter()
+    profile.enable()
+    try:
+        yield
+    finally:
+        profile.disable()
+        threading.setprofile(None)
+        _state["worker_dir"] = None
+        elapsed = time.perf_counter() - start
+        if sampler:
+            sampler.stop()
+
+        # Main thread + stage ke threads + worker processes -> ek Stats
+        stats = pstats.Stats(profile)
+        for thread_profile in thread_profiles:
+            thread_profile.disable()
+            stats.add(thread_profile)
+        worker_files = sorted(worker_dir.glob("*.prof"))
+        for path in worker_files:
+            stats.add(str(path))
+            path.unlink()
+        worker_dir.rmdir()
+        stats.files = []  # per-job files mit gaye, report header me unka naam nahi
+        coverage = (
+            f"Covered: main thread, {len(thread_profiles) if PER_THREAD else 'all'} stage threads, "
+            f"{len(worker_files)} worker-process jobs (merged; cumulative times overlap across them).\n"
+            "Not covered: threads started before this stage and native (C/CUDA) threads, "
+            "e.g. the local model backend - use --sample for those."
+        )
+        _, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ])
+        tracemalloc.stop()
+
+        stats.dump_stats(run_dir / f"{name}.prof")
+        (run_dir / f"{name}.txt").write_text(_cpu_report(stats, name, elapsed, coverage), encoding="utf-8")
+        (run_dir / f"{name}.alloc.txt").write_text(_alloc_report(snapshot, peak), encoding="utf-8")
+        if sampler:
+            (run_dir / f"{name}.folded").write_text(sampler.folded(), encoding="utf-8")
+
+        summary_path = run_dir / "summary.json"
+        summary = json.loads(summary_path.read_text(encoding="utf-8")) if summary_path.exists() else []
+        summary.append({
+            "stage": name,
+            "seconds": round(elapsed, 3),
+            "peak_mb": round(peak / 1024 / 1024, 2),
+            "threads": len(thread_profiles) if PER_THREAD else None,
+            "worker_jobs": len(worker_files),
+            "top_self_time": _top_functions(stats),
+        })
+        summary_path.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+        print(f"🔬 {name}: {elapsed:.2f}s, peak {peak / 1024 / 1024:.1f} MB -> {run_dir / name}.txt")
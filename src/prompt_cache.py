@@ -0,0 +1,203 @@
+import time
+import threading
+import datetime
+
+from src import telemetry
+from src.keypool import estimate_tokens
+
+# -------------------------------
+# CONTEXT CACHE (system prompt)
+# -------------------------------
+# System instruction (role + style rules + glossary) har chunk me same hai.
+# Provider ke context cache me book ke shuru me ek baar register; har request sirf cache ka naam bhejti hai.
+# Cache har API key (project) ka alag hota hai, isliye har key ka apna ContextCache.
+# TTL khatam hone se pehle refresh; expire ho gaya toh agli request pe naya ban jaata hai.
+# Har run (book/job) apni registry list deta hai aur khatam hone pe sirf wahi caches release karta hai -
+# service me ek hi process me kai jobs chalte hain, kisi ka cache doosre ke khatam hone pe nahi mitna chahiye.
+DEFAULTS = {
+    "enabled": False,
+    "backend": "gemini",            # "memory" = local stand-in (bina provider ke, tests/smoke runs)
+    "ttl_minutes": 60,
+    "refresh_before_minutes": 10,   # itna time bacha ho toh TTL aage badha do
+    "min_tokens": 1024,             # isse chhota prefix provider cache nahi karta
+}
+
+
+class GeminiCacheBackend:
+    """google.generativeai caching. genai.configure() global hai, isliye har call translator ke lock me."""
+
+    def __init__(self, api_key, lock, configure=None):
+        self.api_key = api_key
+        self.lock = lock
+        # translator.configure_genai (custom endpoint ho toh wahi)
+        self.configure = configure or self._configure
+
+    @staticmethod
+    def _configure(api_key):
+        import google.generativeai as genai
+        genai.configure(api_key=api_key)
+
+    def create(self, model_name, system_instruction, ttl_seconds):
+        from google.generativeai import caching
+        with self.lock:
+            self.configure(self.api_key)
+            cache = caching.CachedContent.create(
+                model=model_name,
+                display_name="novel-translator-system",
+                system_instruction=system_instruction,
+                ttl=datetime.timedelta(seconds=ttl_seconds),
+            )
+        return cache
+
+    def refresh(self, cache, ttl_seconds):
+        with self.lock:
+            self.configure(self.api_key)
+            cache.update(ttl=datetime.timedelta(seconds=ttl_seconds))
+
+    def delete(self, cache):
+        with self.lock:
+            self.configure(self.api_key)
+            cache.delete()
+
+    def model(self, cache, generation_config):
+        import google.generativeai as genai
+        from google.generativeai import client as genai_client
+        with self.lock:
+            self.configure(self.api_key)
+            model = genai.GenerativeModel.from_cached_content(cached_content=cache, generation_config=generation_config)
+            model._client = genai_client.get_default_generative_client()
+        return model
+
+
+class MemoryCacheBackend:
+    """
+    Local stand-in: provider jaisa create/refresh/expiry ka hisaab, par model wahi normal wala
+    (model_factory() system instruction ke saath). Fake models ke saath poora cache flow chal jaata hai.
+    """
+
+    def __init__(self, model_factory):
+        self.model_factory = model_factory
+        self.created = 0
+        self.refreshed = 0
+
+    def create(self, model_name, system_instruction, ttl_seconds):
+        self.created += 1
+        return {"name": f"cachedContents/local-{self.created}", "model": model_name}
+
+    def refresh(self, cache, ttl_seconds):
+        self.refreshed += 1
+
+    def delete(self, cache):
+        pass
+
+    def model(self, cache, generation_config):
+        return self.model_factory()
+
+
+class ContextCache:
+    def __init__(self, backend, system_instruction, model_name, generation_config=None,
+                 ttl_minutes=DEFAULTS["ttl_minutes"], refresh_before_minutes=DEFAULTS["refresh_before_minutes"],
+                 registry=None):
+        self.backend = backend
+        self.system_instruction = system_instruction
+        self.model_name = model_name
+        self.generation_config = generation_config
+        self.ttl = ttl_minutes * 60
+        self.refresh_before = refresh_before_minutes * 60
+        self.prefix_tokens = estimate_tokens(system_instruction)
+        self._lock = threading.Lock()
+        self._cache = None
+        self._model = None
+        self._expires = 0.0
+        (_registry if registry is None else registry).append(self)
+
+    def ensure(self):
+        """Cache zinda rakho: pehli baar bana do, expiry paas ho toh refresh, nikal gaya toh naya."""
+        with self._lock:
+            now = time.monotonic()
+            if self._cache is not None and now < self._expires - self.refresh_before:
+                return self._model
+            if self._cache is not None and now < self._expires:
+                try:
+                    self.backend.refresh(self._cache, self.ttl)
+                    self._expires = now + self.ttl
+                    telemetry.incr("prompt_cache_refreshes")
+                    return self._model
+                except Exception as e:
+                    print(f"⚠️ Prompt cache refresh fail ({e}), naya bana rahe hain...")
+            self._cache = self.backend.create(self.model_name, self.system_instruction, self.ttl)
+            self._model = self.backend.model(self._cache, self.generation_config)
+            self._expires = now + self.ttl
+            telemetry.incr("prompt_cache_creates")
+            return self._model
+
+    def client(self):
+        return CachedClient(self)
+
+    def release(self):
+        with self._lock:
+            if self._cache is not None:
+                try:
+                    self.backend.delete(self._cache)
+                except Exception:
+                    pass  # TTL se apne aap chala jaayega
+            self._cache = self._model = None
+
+
+class CachedClient:
+    """KeyPool ka client: generate_content() se pehle cache check, aur bache hue prefix tokens ka hisaab."""
+
+    cached = True
+
+    def __init__(self, cache):
+        self.cache = cache
+
+    def generate_content(self, prompt, stream=False):
+        model = self.cache.ensure()
+        telemetry.incr("prompt_cache_requests")
+        telemetry.incr("prompt_cache_tokens", self.cache.prefix_tokens)
+        return model.generate_content(prompt, stream=stream)
+
+
+_registry = []
+
+
+def settings_from(config):
+    return {**DEFAULTS, **config.get("prompt_cache", {})}
+
+
+def release_all(registry=None):
+    # Book khatam: cache storage ka paisa mat bharo (sirf is run ki registry; None = bina registry wale)
+    registry = _registry if registry is None else registry
+    while registry:
+        registry.pop().release()
+
+
+def report():
+    """Kitne input tokens cache se gaye, aur first-token latency cached vs bina cache."""
+    snap = telemetry.snapshot()
+    counters = {c["name"]: c["value"] for c in snap["counters"] if not c["labels"]}
+    requests = counters.get("prompt_cache_requests", 0)
+    if not requests:
+        return None
+
+    cached_tokens = counters.get("prompt_cache_tokens", 0)
+    prompt_tokens = sum(c["value"] for c in snap["counters"] if c["name"] == "tokens_in")
+    share = 100 * cached_tokens / (cached_tokens + prompt_tokens) if prompt_tokens else 100.0
+
+    latency = {}
+    for h in snap.get("histograms", []):
+        if h["name"] == "first_token_seconds" and h["count"]:
+            cached = h["labels"].get("cached", "no")
+            total, count = latency.get(cached, (0.0, 0))
+            latency[cached] = (total + h["sum"], count + h["count"])
+    avg = {k: total / count for k, (total, count) in latency.items()}
+
+    line = (f"🗄️ Prompt cache: {requests} requests, {cached_tokens} system-prompt tokens cache se "
+            f"({share:.0f}% of input), {counters.get('prompt_cache_refreshes', 0)} refresh")
+    if "yes" in avg:
+        line += f", first token ~{avg['yes']:.2f}s"
+        if "no" in avg:
+            line += f" (bina cache ~{avg['no']:.2f}s)"
+    print(line)
+    return {"requests": requests, "cached_tokens": cached_tokens, "share": share, "first_token": avg}
@@ -0,0 +1,394 @@
+import re
+import os
+import json
+import time
+import shutil
+import subprocess
+import uuid
+import hashlib
+import zipfile
+import importlib
+from html import escape
+from datetime import datetime, timezone
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+from src import profiler, telemetry
+
+# -------------------------------
+# PUBLISHER (parse once, sab formats saath me)
+# -------------------------------
+# Har chapter ka Markdown ek hi baar parse hota hai ek chhote document model me:
+#   {"title", "blocks": [{"type": "heading"|"paragraph"|"quote"|"rule", "level", "spans": [[text, style]]}]}
+# (style: "" / "b" / "i" / "bi"). Model data/cache/publish me cache, chapter badla tabhi dobara parse.
+# Phir PDF, HTML, EPUB writers alag processes me ek saath chalte hain:
+# kul time ~ ek parse + sabse dheema writer.
+CACHE_DIR = Path("data/cache/publish")
+
+DEFAULTS = {
+    "formats": ["pdf", "html", "epub", "reader"],
+    "pdf_toc": True,           # title ke baad "Vishay Suchi" page (outline/bookmarks hamesha bante hain)
+    "pdf_linearize": False,    # fast web view: pikepdf ya qpdf chahiye
+}
+
+# format -> "module:function" (lazy import, taaki fpdf wagairah sirf zaroorat pe load ho)
+WRITERS = {
+    "html": "src.bookmaker:write_html",
+    "reader": "src.bookmaker:write_reader",   # har chapter alag page (folder)
+    "pdf": "bookmaker:write_pdf",
+    "epub": "src.publisher:write_epub",
+}
+
+HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+RULE = re.compile(r"^\s*([-*_])(\s*\1){2,}\s*$")
+# **bold**, __bold__, *italic*, _italic_ (word ke beech ka _ italic nahi)
+INLINE = re.compile(r"\*\*(.+?)\*\*|__(.+?)__|\*(?!\s)(.+?)(?<!\s)\*|(?<!\w)_(?!\s)(.+?)(?<!\s)_(?!\w)")
+
+
+def parse_inline(text, style=""):
+    spans = []
+    pos = 0
+    for m in INLINE.finditer(text):
+        if m.start() > pos:
+            spans.append([text[pos:m.start()], style])
+        bold = m.group(1) or m.group(2)
+        inner = bold if bold is not None else (m.group(3) or m.group(4))
+        extra = "b" if bold is not None else "i"
+        spans.extend(parse_inline(inner, "".join(sorted(set(style + extra)))))
+        pos = m.end()
+    if pos < len(text):
+        spans.append([text[pos:], style])
+    # Bache hue akele * / # (model ka kachra) hata do
+    return [[re.sub(r"(?<!\S)[*#]+(?!\S)", "", t).replace("**", ""), s] for t, s in spans if t]
+
+
+def parse_markdown(text, fallback_title=""):
+    blocks = []
+    paragraph = []
+    kind = "paragraph"
+
+    def flush():
+        nonlocal kind
+        if paragraph:
+            blocks.append({"type": kind, "spans": parse_inline(" ".join(paragraph))})
+            paragraph.clear()
+        kind = "paragraph"
+
+    for line in text.replace("\r", "").split("\n"):
+        stripped = line.strip()
+        heading = HEADING.match(stripped)
+        if not stripped:
+            flush()
+        elif heading:
+            flush()
+            blocks.append({"type": "heading", "level": len(heading.group(1)), "spans": parse_inline(heading.group(2))})
+        elif RULE.match(stripped):
+            flush()
+            blocks.append({"type": "rule"})
+        elif stripped.startswith(">"):
+            if kind != "quote":
+                flush()
+                kind = "quote"
+            paragraph.append(stripped.lstrip("> ").strip())
+        else:
+            if kind == "quote":
+                flush()
+            paragraph.append(stripped)
+    flush()
+
+    title = next((plain(b["spans"]) for b in blocks if b["type"] == "heading"), fallback_title)
+    return {"title": title, "blocks": blocks}
+
+
+def plain(spans):
+    return "".join(text for text, _ in spans)
+
+
+# -------------------------------
+# CACHE
+# -------------------------------
+def load_chapter(path, cache_dir=CACHE_DIR):
+    path = Path(path)
+    raw = path.read_bytes()
+    digest = hashlib.sha256(raw).hexdigest()
+    cache_file = Path(cache_dir) / f"{path.stem}.json"
+    if cache_file.exists():
+        cached = json.loads(cache_file.read_text(encoding="utf-8"))
+        if cached.get("sha") == digest:
+            telemetry.incr("publish_parse_cached")
+            return cached["doc"]
+
+    doc = parse_markdown(raw.decode("utf-8"), path.stem)
+    doc["id"] = path.stem
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    cache_file.write_text(json.dumps({"sha": digest, "doc": doc}, ensure_ascii=False), encoding="utf-8")
+    telemetry.incr("publish_parsed")
+    return doc
+
+
+def load_book(book_title, input_dir="data/output_books", cache_dir=CACHE_DIR):
+    files = sorted(Path(input_dir).glob("*.md"))
+    return {"title": book_title, "chapters": [load_chapter(f, cache_dir) for f in files]}
+
+
+def clean_title(book_title):
+    return "".join(c for c in book_title if c.isalnum() or c in (' ', '_')).replace(' ', '_')
+
+
+def output_name(book_title, fmt):
+    name = clean_title(book_title)
+    if fmt == "pdf":
+        return f"{name}_Final_Fixed.pdf"
+    if fmt == "reader":
+        return f"{name}_reader"
+    return f"{name}.{fmt}"
+
+
+# -------------------------------
+# EPUB WRITER (stdlib zipfile, EPUB 3)
+# -------------------------------
+def _xhtml_spans(spans):
+    out = []
+    for text, style in spans:
+        text = escape(text)
+        if "i" in style:
+            text = f"<em>{text}</em>"
+        if "b" in style:
+            text = f"<strong>{text}</strong>"
+        out.append(text)
+    return "".join(out)
+
+
+def blocks_to_html(blocks):
+    """Document blocks -> HTML (HTML aur EPUB dono writers yahi use karte hain)."""
+    parts = []
+    for block in blocks:
+        if block["type"] == "heading":
+            level = block["level"]
+            parts.append(f"<h{level}>{_xhtml_spans(block['spans'])}</h{level}>")
+        elif block["type"] == "rule":
+            parts.append("<hr/>")
+        elif block["type"] == "quote":
+            parts.append(f"<blockquote><p>{_xhtml_spans(block['spans'])}</p></blockquote>")
+        else:
+            parts.append(f"<p>{_xhtml_spans(block['spans'])}</p>")
+    return "\n".join(parts)
+
+
+EPUB_CSS = """
+body { font-family: serif; line-height: 1.6; }
+h1, h2, h3 { text-align: center; }
+p { text-align: justify; margin: 0 0 0.8em; }
+blockquote { margin: 1em 2em; font-style: italic; }
+.title-page { text-align: center; margin-top: 30%; }
+"""
+
+
+def _xhtml(title, body, lang):
+    return (f'<?xml version="1.0" encoding="utf-8"?>\n<!DOCTYPE html>\n'
+            f'<html xmlns="http://www.w3.org/1999/xhtml" xmlns:epub="http://www.idpf.org/2007/ops" '
+            f'xml:lang="{lang}" lang="{lang}">\n<head><meta charset="utf-8"/><title>{escape(title)}</title>'
+            f'<link rel="stylesheet" type="text/css" href="style.css"/></head>\n<body>\n{body}\n</body>\n</html>\n')
+
+
+def write_epub(book, path, lang="hi"):
+    chapters = [(f"chapter_{n:03d}.xhtml", doc) for n, doc in enumerate(book["chapters"], 1)]
+    modified = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    book_id = f"urn:uuid:{uuid.uuid5(uuid.NAMESPACE_URL, book['title'])}"
+
+    manifest = ['<item id="nav" href="nav.xhtml" media-type="application/xhtml+xml" properties="nav"/>',
+                '<item id="css" href="style.css" media-type="text/css"/>',
+                '<item id="title" href="title.xhtml" media-type="application/xhtml+xml"/>']
+    spine = ['<itemref idref="title"/>']
+    for n, (name, _) in enumerate(chapters, 1):
+        manifest.append(f'<item id="c{n}" href="{name}" media-type="application/xhtml+xml"/>')
+        spine.append(f'<itemref idref="c{n}"/>')
+
+    manifest_xml = "\n    ".join(manifest)
+    spine_xml = "\n    ".join(spine)
+    opf = f"""<?xml version="1.0" encoding="utf-8"?>
+<package xmlns="http://www.idpf.org/2007/opf" version="3.0" unique-identifier="book-id">
+  <metadata xmlns:dc="http://purl.org/dc/elements/1.1/">
+    <dc:identifier id="book-id">{book_id}</dc:identifier>
+    <dc:title>{escape(book["title"])}</dc:title>
+    <dc:language>{lang}</dc:language>
+    <meta property="dcterms:modified">{modified}</meta>
+  </metadata>
+  <manifest>
+    {manifest_xml}
+  </manifest>
+  <spine>
+    {spine_xml}
+  </spine>
+</package>
+"""
+    toc = "\n".join(f'<li><a href="{name}">{escape(doc["title"])}</a></li>' for name, doc in chapters)
+    nav = _xhtml(book["title"], f'<nav epub:type="toc" id="toc"><h1>{escape(book["title"])}</h1><ol>\n{toc}\n</ol></nav>', lang)
+    title_page = _xhtml(book["title"], f'<div class="title-page"><h1>{escape(book["title"])}</h1></div>', lang)
+
+    path = Path(path)
+    with zipfile.ZipFile(path, "w") as z:
+        # mimetype pehli file aur bina compression - EPUB readers yahi dekhte hain
+        z.writestr(zipfile.ZipInfo("mimetype"), "application/epub+zip", compress_type=zipfile.ZIP_STORED)
+        z.writestr("META-INF/container.xml", """<?xml version="1.0" encoding="utf-8"?>
+<container version="1.0" xmlns="urn:oasis:names:tc:opendocument:xmlns:container">
+  <rootfiles><rootfile full-path="OEBPS/content.opf" media-type="application/oebps-package+xml"/></rootfiles>
+</container>
+""", compress_type=zipfile.ZIP_DEFLATED)
+        z.writestr("OEBPS/content.opf", opf, compress_type=zipfile.ZIP_DEFLATED)
+        z.writestr("OEBPS/nav.xhtml", nav, compress_type=zipfile.ZIP_DEFLATED)
+        z.writestr("OEBPS/style.css", EPUB_CSS, compress_type=zipfile.ZIP_DEFLATED)
+        z.writestr("OEBPS/title.xhtml", title_page, compress_type=zipfile.ZIP_DEFLATED)
+        for name, doc in chapters:
+            z.writestr(f"OEBPS/{name}", _xhtml(doc["title"], blocks_to_html(doc["blocks"]), lang),
+                       compress_type=zipfile.ZIP_DEFLATED)
+    return path
+
+
+# -------------------------------
+# PDF POST-PROCESSING (compress + linearize)
+# -------------------------------
+def first_page_seconds(path, runs=3):
+    """PDF khol ke pehla page render karne ka time (reader ka 'open' jaisa). Kai baar, sabse kam."""
+    import fitz
+    best = None
+    for _ in range(runs):
+        started = time.perf_counter()
+        with fitz.open(path) as doc:
+            doc[0].get_pixmap(dpi=72)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def _linearize(src, dst):
+    try:
+        import pikepdf
+    except ImportError:
+        pikepdf = None
+    if pikepdf:
+        with pikepdf.open(src) as pdf:
+            pdf.save(dst, linearize=True, compress_streams=True,
+                     object_stream_mode=pikepdf.ObjectStreamMode.generate)
+        return "pikepdf"
+    if shutil.which("qpdf"):
+        subprocess.run(["qpdf", "--linearize", "--object-streams=generate", str(src), str(dst)], check=True)
+        return "qpdf"
+    return None
+
+
+def optimize_pdf(path, linearize=False):
+    """
+    fpdf ka PDF -> garbage collect + deflate (streams, fonts) + object streams; chaaho toh linearize.
+    Pehle/baad ka size aur first-page time print karta hai.
+    """
+    import fitz
+    path = Path(path)
+    before_size, before_open = path.stat().st_size, first_page_seconds(path)
+
+    tmp = path.with_suffix(".opt.pdf")
+    with fitz.open(path) as doc:
+        doc.save(tmp, garbage=4, deflate=True, deflate_fonts=True, use_objstms=1)
+    os.replace(tmp, path)
+
+    # PyMuPDF ab linearize nahi karta - pikepdf/qpdf se
+    tool = None
+    if linearize:
+        tool = _linearize(path, tmp)
+        if tool:
+            os.replace(tmp, path)
+        else:
+            print("⚠️ Linearize ke liye pikepdf (pip install pikepdf) ya qpdf chahiye. Sirf compress kiya.")
+
+    after_size, after_open = path.stat().st_size, first_page_seconds(path)
+    print(f"🗜️ PDF: {before_size / 1024:.0f} KB -> {after_size / 1024:.0f} KB, "
+          f"first page {before_open * 1000:.0f} ms -> {after_open * 1000:.0f} ms"
+          + (f", linearized ({tool})" if tool else ""))
+    return {"before_bytes": before_size, "after_bytes": after_size,
+            "before_open": before_open, "after_open": after_open, "linearized": tool}
+
+
+# -------------------------------
+# PUBLISH
+# -------------------------------
+def resolve_fonts(formats):
+    """
+    PDF/reader ke Sahitya fonts parent process me ek baar (setup_fonts() zaroorat pe download karta hai),
+    writers ko sirf paths - parallel processes ek hi font file pe download na karein.
+    Return: {"Regular": path, "Bold": path} sirf jo local maujood hain.
+    """
+    if not {"pdf", "reader"} & set(formats):
+        return {}
+    try:
+        from bookmaker import setup_fonts
+    except ImportError:
+        paths = {"Regular": "Sahitya-Regular.ttf", "Bold": "Sahitya-Bold.ttf"}
+    else:
+        paths = setup_fonts()
+    return {style: str(Path(p).resolve()) for style, p in paths.items()
+            if Path(p).exists() and Path(p).stat().st_size}
+
+
+def _run_writer(fmt, book, path):
+    """Worker process me: writer chalao, (path, seconds) wapas."""
+    module, func = WRITERS[fmt].split(":")
+    started = time.perf_counter()
+    result = getattr(importlib.import_module(module), func)(book, path)
+    return (str(result) if result else None), time.perf_counter() - started
+
+
+def publish(book_title, formats=None, input_dir="data/output_books", output_dir=".", cache_dir=CACHE_DIR,
+            settings=None, catalog=None):
+    """
+    settings: config ka "publish" section. catalog: artifacts (path, sha256, size, time) wahan likhe jaate hain,
+    book ka naam input_dir se (translation wala), na mile toh book_title.
+    Return: {format: path ya None}. Ek format ho toh seedha isi process me.
+    """
+    settings = {**DEFAULTS, **(settings or {})}
+    formats = list(formats or settings["formats"])
+    unknown = [f for f in formats if f not in WRITERS]
+    if unknown:
+        raise ValueError(f"❌ Format nahi pata: {', '.join(unknown)} (options: {', '.join(WRITERS)})")
+
+    started = time.perf_counter()
+    book = load_book(book_title, input_dir, cache_dir)
+    book["settings"] = settings
+    if not book["chapters"]:
+        print(f"⚠️ Bhai '{input_dir}' khaali hai!")
+        return {}
+    book["fonts"] = resolve_fonts(formats)
+    parse_seconds = time.perf_counter() - started
+    print(f"📚 {len(book['chapters'])} chapters parsed ({parse_seconds:.2f}s). Writing: {', '.join(formats)}...")
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    jobs = {fmt: output_dir / output_name(book_title, fmt) for fmt in formats}
+
+    if len(jobs) == 1:
+        results = {fmt: _run_writer(fmt, book, path) for fmt, path in jobs.items()}
+    else:
+        with ProcessPoolExecutor(max_workers=len(jobs)) as pool:
+            futures = {fmt: pool.submit(profiler.for_workers(_run_writer), fmt, book, path) for fmt, path in jobs.items()}
+            results = {}
+            for fmt, future in futures.items():
+                try:
+                    results[fmt] = future.result()
+                except Exception as e:
+                    print(f"❌ {fmt} writer fail: {e}")
+                    results[fmt] = (None, 0.0)
+
+    book_key = (catalog.resolve(input_dir) or book_title) if catalog else None
+    outputs = {}
+    for fmt, (path, seconds) in results.items():
+        telemetry.observe("stage_duration_seconds", seconds, stage="render", format=fmt)
+        outputs[fmt] = path
+        if path:
+            print(f"✅ {fmt.upper()}: {Path(path).resolve()} ({seconds:.2f}s)")
+            if catalog:
+                # Reader ek folder hai; hash poore folder ka
+                catalog.record_artifact(book_key, fmt, Path(path).parent if fmt == "reader" else path, seconds)
+    elapsed = time.perf_counter() - started
+    telemetry.observe("stage_duration_seconds", elapsed, stage="publish")
+    if catalog and any(outputs.values()):
+        catalog.finish_publish(book_key, elapsed)
+    return outputs
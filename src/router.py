@@ -0,0 +1,103 @@
+import re
+from collections import Counter
+
+from src import telemetry
+
+# -------------------------------
+# DIFFICULTY ROUTER
+# -------------------------------
+# Har chunk ko bina API call ek score (0 = aasaan, 1 = mushkil):
+#   length, rare words (poori book me <= 2 baar aaye), glossary terms ki density, dialogue kitna hai.
+# Score se shuruaati tier (sasta/tez model); validator reject kare tabhi agla, strong tier.
+# Do line ka dialogue lite model pe, ghana descriptive prose seedha bade model pe.
+DEFAULTS = {
+    "enabled": False,
+    # Har provider ke models, saste -> strong
+    "tiers": {
+        "gemini": ["gemini-flash-lite-latest", "gemini-flash-latest", "gemini-2.5-pro"],
+        "groq": ["llama-3.1-8b-instant", "llama-3.3-70b-versatile"],
+    },
+    "thresholds": [0.35, 0.65],   # score < 0.35 -> tier 0, < 0.65 -> tier 1, baaki tier 2
+    "weights": {"length": 0.25, "rarity": 0.35, "glossary": 0.2, "dialogue": 0.2},
+    "max_chars": 7000,            # split_text_smartly ka max chunk
+}
+
+WORD = re.compile(r"[A-Za-z][A-Za-z'-]+")
+# "..." ya “...” ke andar ka text = dialogue
+QUOTED = re.compile(r"\"[^\"\n]*\"|“[^”\n]*”|‘[^’\n]*’")
+
+SCORE_BUCKETS = (0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0)
+
+
+def settings_from(config):
+    settings = {**DEFAULTS, **config.get("routing", {})}
+    settings["tiers"] = {**DEFAULTS["tiers"], **config.get("routing", {}).get("tiers", {})}
+    settings["weights"] = {**DEFAULTS["weights"], **config.get("routing", {}).get("weights", {})}
+    return settings
+
+
+def book_vocabulary(texts):
+    """Poori book ke word counts - rarity isi se (kisi bahar ki word list ki zaroorat nahi)."""
+    counts = Counter()
+    for text in texts:
+        counts.update(w.lower() for w in WORD.findall(text))
+    return counts
+
+
+def score_chunk(chunk, glossary=None, vocabulary=None, weights=DEFAULTS["weights"], max_chars=DEFAULTS["max_chars"]):
+    """Return: (score 0..1, har feature ki value)."""
+    words = [w.lower() for w in WORD.findall(chunk)]
+    if not words:
+        return 0.0, {}
+
+    content = [w for w in words if len(w) > 3]
+    if vocabulary:
+        rare = sum(1 for w in content if vocabulary.get(w, 0) <= 2)
+    else:
+        # Book ka vocabulary na ho (queue worker) toh lambe words ko rare maano
+        rare = sum(1 for w in content if len(w) >= 10)
+
+    lowered = chunk.lower()
+    glossary_hits = sum(lowered.count(term.lower()) for term in (glossary or {}))
+    dialogue = sum(len(m) for m in QUOTED.findall(chunk)) / len(chunk)
+
+    features = {
+        "length": min(1.0, len(chunk) / max_chars),
+        "rarity": min(1.0, 4 * rare / max(len(content), 1)),
+        "glossary": min(1.0, 10 * glossary_hits / len(words)),
+        # Dialogue aasaan hota hai: jitna zyada dialogue, utna kam score
+        "dialogue": 1.0 - min(1.0, dialogue),
+    }
+    total = sum(weights.values()) or 1
+    score = sum(weights[name] * value for name, value in features.items()) / total
+    return round(score, 3), features
+
+
+class Router:
+    """
+    lanes: [(model_name, key_pool, controller), ...] sasta -> strong.
+    route(chunk) shuruaati tier se aage ki lanes deta hai; produce_chunk har reject pe agli lane leta hai.
+    """
+
+    def __init__(self, lanes, glossary=None, texts=(), thresholds=DEFAULTS["thresholds"],
+                 weights=DEFAULTS["weights"], max_chars=DEFAULTS["max_chars"], **_):
+        self.lanes = lanes
+        self.glossary = glossary or {}
+        self.vocabulary = book_vocabulary(texts)
+        self.thresholds = thresholds
+        self.weights = weights
+        self.max_chars = max_chars
+
+    def tier(self, score):
+        return min(sum(1 for t in self.thresholds if score >= t), len(self.lanes) - 1)
+
+    def route(self, chunk):
+        score, _ = score_chunk(chunk, self.glossary, self.vocabulary, self.weights, self.max_chars)
+        start = self.tier(score)
+        telemetry.observe("chunk_difficulty", score, buckets=SCORE_BUCKETS)
+        telemetry.incr("routed_chunks", model=self.lanes[start][0])
+        return self.lanes[start:]
+
+    def report(self):
+        names = " -> ".join(name for name, _, _ in self.lanes)
+        print(f"🧭 Routing ON: {names} (thresholds {self.thresholds})")
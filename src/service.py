@@ -0,0 +1,349 @@
+import json
+import time
+import uuid
+import threading
+from pathlib import Path
+from email.parser import BytesParser
+from email.policy import default as email_policy
+from urllib.parse import urlparse, parse_qs, unquote
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from concurrent.futures import ThreadPoolExecutor
+
+from src import manifest, telemetry, metrics, shutdown, bitext
+from src.cleaner import clean_and_extract
+from src.catalog import open_catalog
+from src.translator import translate_book, split_text_smartly, clean_text, load_config
+from src import publisher
+from src import watcher as folder_watcher
+
+# -------------------------------
+# TRANSLATION SERVICE (HTTP)
+# -------------------------------
+# Ek warm process: SDK/modules ek hi baar import, jobs queue me.
+# POST /jobs (PDF)  -> job id
+# GET  /jobs        -> saare jobs
+# GET  /jobs/<id>   -> status + har chapter ka progress
+# GET  /jobs/<id>/artifacts/<file> -> .html / .epub / .pdf / .md download
+# GET  /metrics     -> Prometheus text format (telemetry se)
+# GET  /catalog    -> saari books ka progress (catalog DB se, koi file scan nahi)
+# GET  /catalog/<book> -> chapters + artifacts
+# GET  /search?q=<phrase>[&lang=en|hi][&book=<title>] -> saari books me source <-> translation sentences
+# Har job ka apna folder (data/jobs/<id>/), isliye jobs aapas me nahi takraate.
+#
+# Per-job vs shared (ek process me):
+#   - per-job: folders (raw_text, manifests, output_books, publish cache), extract/publish ke process pools
+#   - shared by design: API key pool + AIMD controller (quota provider ki keys pe hai, job pe nahi),
+#     telemetry (/metrics poore process ka)
+#   - translate stage ek waqt me ek hi job: key clients, prompt caches aur controller settings run ke
+#     saath bind hote hain, do books ek saath inhe overwrite kar deti. Ek book already saari keys ki
+#     poori window use karti hai, isliye doosri book ke saath chalne se throughput nahi badhta.
+#     max_jobs > 1 ka fayda: ek job translate kare tab doosra extract/publish.
+DEFAULTS = {
+    "host": "127.0.0.1",
+    "port": 8080,
+    "max_jobs": 1,          # ek saath kitne jobs; translate stage phir bhi ek-ek karke (upar dekho)
+    "jobs_dir": "data/jobs",
+    "max_upload_mb": 200,
+}
+
+
+ARTIFACT_TYPES = {
+    ".html": "text/html; charset=utf-8",
+    ".md": "text/markdown; charset=utf-8",
+    ".epub": "application/epub+zip",
+    ".pdf": "application/pdf",
+    ".css": "text/css; charset=utf-8",
+    ".js": "text/javascript; charset=utf-8",
+    ".ttf": "font/ttf",
+}
+
+
+class JobStore:
+    def __init__(self, jobs_dir, max_jobs):
+        self.jobs_dir = Path(jobs_dir)
+        self.jobs_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self.jobs = {}
+        self.pool = ThreadPoolExecutor(max_workers=max_jobs, thread_name_prefix="job")
+        self._translate_lock = threading.Lock()
+
+        # Restart ke baad purane jobs wapas; adhoore jobs phir se queue (manifests se resume hote hain)
+        for path in sorted(self.jobs_dir.glob("*/job.json")):
+            job = json.loads(path.read_text(encoding="utf-8"))
+            self.jobs[job["id"]] = job
+            if job["status"] not in ("done", "failed"):
+                self._update(job["id"], status="queued")
+                self.pool.submit(self._run, job["id"])
+
+    def job_dir(self, job_id):
+        return self.jobs_dir / job_id
+
+    def _save(self, job):
+        path = self.job_dir(job["id"]) / "job.json"
+        tmp = path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(job, indent=2, ensure_ascii=False), encoding="utf-8")
+        tmp.replace(path)
+
+    def _update(self, job_id, **fields):
+        with self._lock:
+            job = self.jobs[job_id]
+            job.update(fields, updated=time.time())
+            self._save(job)
+            return dict(job)
+
+    def submit(self, pdf_bytes, filename, title):
+        job_id = uuid.uuid4().hex[:12]
+        folder = self.job_dir(job_id)
+        folder.mkdir(parents=True)
+        (folder / "input.pdf").write_bytes(pdf_bytes)
+
+        job = {"id": job_id, "filename": filename, "title": title, "status": "queued",
+               "error": None, "created": time.time(), "updated": time.time()}
+        with self._lock:
+            self.jobs[job_id] = job
+            self._save(job)
+        telemetry.incr("service_jobs_submitted")
+        self.pool.submit(self._run, job_id)
+        return job
+
+    def _run(self, job_id):
+        folder = self.job_dir(job_id)
+        raw_dir, books_dir, manifest_dir = folder / "raw_text", folder / "output_books", folder / "manifests"
+        try:
+            # Extraction dobara nahi karni agar pichli baar ho chuki (restart ke baad resume)
+            if not any(raw_dir.glob("*.txt")):
+                self._update(job_id, status="extracting")
+                clean_and_extract(folder / "input.pdf", raw_dir, catalog=open_catalog(load_config()),
+                                  book=self.jobs[job_id]["title"])
+
+            # Shared key pool/caches/controller: translate ek waqt me ek job (upar dekho)
+            self._update(job_id, status="waiting")
+            with self._translate_lock:
+                self._update(job_id, status="translating")
+                translate_book(input_dir=raw_dir, output_dir=books_dir, manifest_dir=manifest_dir,
+                               book=self.jobs[job_id]["title"])
+
+            failed = [c["chapter"] for c in self.progress(job_id) if c["failed"]]
+            if failed:
+                raise RuntimeError(f"{len(failed)} chapters me validation fail: {', '.join(failed)}")
+
+            self._update(job_id, status="publishing")
+            config = load_config()
+            publisher.publish(self.jobs[job_id]["title"], input_dir=books_dir, output_dir=folder,
+                              cache_dir=folder / "publish_cache", settings=config.get("publish"),
+                              catalog=open_catalog(config))
+            self._update(job_id, status="done")
+            telemetry.incr("service_jobs_done")
+        except shutdown.Cancelled:
+            # Status jaisa hai waisa; restart pe job phir queue hoga aur manifests se resume
+            print(f"⏸️ Job {job_id} drain me ruka, restart pe aage badhega.")
+        except Exception as e:
+            print(f"❌ Job {job_id} fail: {e}")
+            self._update(job_id, status="failed", error=str(e))
+            telemetry.incr("service_jobs_failed")
+
+    # --- status ---
+    def progress(self, job_id):
+        """Disk se hi: har chapter ke kitne chunks ho gaye (manifest) / total."""
+        folder = self.job_dir(job_id)
+        chapters = []
+        for txt in sorted((folder / "raw_text").glob("*.txt")):
+            entries = manifest.load(manifest.manifest_path(txt.stem, folder / "manifests")).get("chunks", [])
+            # Manifest na ho toh andaza (dedup wale chunk manifest me hi pata chalte hain)
+            total = len(entries) or len(split_text_smartly(clean_text(txt.read_text(encoding="utf-8"))))
+            chapters.append({
+                "chapter": txt.stem,
+                "chunks_total": total,
+                "chunks_done": sum(1 for e in entries if e.get("ok")),
+                "failed": sum(1 for e in entries if not e.get("ok")),
+                "ready": (folder / "output_books" / f"{txt.stem}.md").exists(),
+            })
+        return chapters
+
+    def status(self, job_id):
+        with self._lock:
+            job = dict(self.jobs[job_id])
+        chapters = self.progress(job_id)
+        done = sum(c["chunks_done"] for c in chapters)
+        total = sum(c["chunks_total"] for c in chapters)
+        job.update(
+            chapters=chapters,
+            percent=min(100.0, round(100 * done / total, 1)) if total else 0.0,
+            artifacts=self.artifacts(job_id),
+        )
+        return job
+
+    def artifacts(self, job_id):
+        folder = self.job_dir(job_id)
+        files = [f for ext in ("html", "epub", "pdf") for f in sorted(folder.glob(f"*.{ext}")) if f.name != "input.pdf"]
+        files += sorted((folder / "output_books").glob("*.md"))
+        # Split reader: browser me seedha padho (/jobs/<id>/artifacts/<Book>_reader/index.html)
+        files += sorted(f for f in folder.glob("*_reader/**/*") if f.is_file())
+        return [str(f.relative_to(folder)) for f in files]
+
+    def artifact_path(self, job_id, name):
+        # Sirf job folder ke andar ki files (../ se bahar nahi)
+        folder = self.job_dir(job_id).resolve()
+        path = (folder / name).resolve()
+        if folder not in path.parents or str(path.relative_to(folder)) not in self.artifacts(job_id):
+            return None
+        return path
+
+
+# -------------------------------
+# HTTP HANDLER
+# -------------------------------
+def make_handler(store, max_upload):
+    class Handler(BaseHTTPRequestHandler):
+        server_version = "NovelTranslator/1.0"
+
+        def _json(self, code, payload):
+            body = json.dumps(payload, indent=2, ensure_ascii=False).encode("utf-8")
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _read_upload(self, query):
+            length = int(self.headers.get("Content-Length") or 0)
+            if not length:
+                return None, None, "PDF body khaali hai"
+            if length > max_upload:
+                return None, None, f"File bahut badi hai (max {max_upload // (1024 * 1024)} MB)"
+            body = self.rfile.read(length)
+
+            ctype = self.headers.get("Content-Type", "")
+            filename = query.get("filename", ["book.pdf"])[0]
+            if ctype.startswith("multipart/form-data"):
+                # curl -F file=@book.pdf
+                message = BytesParser(policy=email_policy).parsebytes(
+                    f"Content-Type: {ctype}\r\n\r\n".encode("latin-1") + body
+                )
+                for part in message.iter_parts():
+                    if part.get_filename():
+                        return part.get_payload(decode=True), part.get_filename(), None
+                return None, None, "multipart me file nahi mili"
+            return body, filename, None
+
+        def do_POST(self):
+            url = urlparse(self.path)
+            if url.path.rstrip("/") != "/jobs":
+                return self._json(404, {"error": "not found"})
+            query = parse_qs(url.query)
+            data, filename, error = self._read_upload(query)
+            if error:
+                return self._json(400, {"error": error})
+            if not data.startswith(b"%PDF"):
+                return self._json(400, {"error": "ye PDF nahi lagti"})
+            title = query.get("title", [Path(filename).stem])[0]
+            job = store.submit(data, filename, title)
+            self._json(202, {"id": job["id"], "status": job["status"], "url": f"/jobs/{job['id']}"})
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            parts = [unquote(p) for p in url.path.strip("/").split("/") if p]
+            if parts == ["health"]:
+                return self._json(200, {"ok": True, "jobs": len(store.jobs)})
+            if parts == ["metrics"]:
+                body = metrics.render(telemetry.snapshot()).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", metrics.CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                return
+            if parts and parts[0] == "catalog" and len(parts) <= 2:
+                catalog = open_catalog(load_config())
+                if not catalog:
+                    return self._json(404, {"error": "catalog band hai (config 'catalog.enabled')"})
+                try:
+                    if len(parts) == 1:
+                        return self._json(200, catalog.progress())
+                    progress = catalog.progress(parts[1])
+                    if not progress:
+                        return self._json(404, {"error": "book catalog me nahi hai"})
+                    return self._json(200, {**progress[0], "chapters": catalog.chapters(parts[1]),
+                                            "artifacts": catalog.artifacts(parts[1])})
+                finally:
+                    catalog.close()
+            if parts == ["search"]:
+                query = parse_qs(url.query)
+                if not query.get("q"):
+                    return self._json(400, {"error": "q= me phrase do"})
+                settings = {**bitext.DEFAULTS, **load_config().get("bitext", {})}
+                index = bitext.BilingualIndex(settings["path"])
+                try:
+                    results = index.search(query["q"][0], query.get("lang", [None])[0], query.get("book", [None])[0],
+                                           int(query.get("limit", ["20"])[0]))
+                finally:
+                    index.close()
+                return self._json(200, results)
+            if parts == ["jobs"]:
+                return self._json(200, [store.status(job_id) for job_id in list(store.jobs)])
+            if len(parts) < 2 or parts[0] != "jobs" or parts[1] not in store.jobs:
+                return self._json(404, {"error": "not found"})
+            if len(parts) == 2:
+                return self._json(200, store.status(parts[1]))
+            if parts[2] == "artifacts" and len(parts) > 3:
+                path = store.artifact_path(parts[1], "/".join(parts[3:]))
+                if not path:
+                    return self._json(404, {"error": "artifact nahi mila"})
+                body = path.read_bytes()
+                self.send_response(200)
+                self.send_header("Content-Type", ARTIFACT_TYPES.get(path.suffix, "application/octet-stream"))
+                if not any(part.endswith("_reader") for part in path.parts):
+                    self.send_header("Content-Disposition", f'attachment; filename="{path.name}"')
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                return
+            self._json(404, {"error": "not found"})
+
+        def log_message(self, fmt, *args):
+            print(f"🌐 {self.address_string()} {fmt % args}")
+
+    return Handler
+
+
+def serve(host=None, port=None, watch=False):
+    config = load_config()
+    settings = {**DEFAULTS, **config.get("service", {})}
+    host = host or settings["host"]
+    port = int(port or settings["port"])
+
+    store = JobStore(settings["jobs_dir"], settings["max_jobs"])
+
+    # Watch-folder: naye PDFs isi store me jaate hain, same max_jobs limit
+    watcher = None
+    if watch:
+        watch_settings = {**folder_watcher.DEFAULTS, **config.get("watch", {})}
+        watcher = folder_watcher.FolderWatcher(store, watch_settings["folder"], watch_settings["settle_seconds"],
+                                               watch_settings["poll_seconds"])
+        watcher.start()
+
+    server = ThreadingHTTPServer((host, port), make_handler(store, settings["max_upload_mb"] * 1024 * 1024))
+    print(f"🚀 Translation service chalu: http://{host}:{port}  (jobs: {settings['jobs_dir']})")
+
+    # SIGTERM/Ctrl+C: naye jobs/uploads band, chal rahe jobs apne chunks drain karke rukte hain
+    shutdown_settings = {**shutdown.DEFAULTS, **config.get("shutdown", {})}
+    threading.Thread(target=lambda: shutdown.wait() and server.shutdown(), daemon=True).start()
+    with shutdown.guard(shutdown_settings["drain_seconds"]):
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+            if watcher:
+                watcher.stop()
+            store.pool.shutdown(wait=True, cancel_futures=True)
+    print("\n🛑 Service band.")
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Novel translator HTTP service")
+    parser.add_argument("--host")
+    parser.add_argument("--port", type=int)
+    parser.add_argument("--watch", action="store_true", help="data/input_pdfs pe nazar rakho, naye PDFs khud jobs banenge")
+    args = parser.parse_args()
+    serve(args.host, args.port, args.watch)
@@ -0,0 +1,74 @@
+import os
+import signal
+import threading
+from contextlib import contextmanager
+
+from src import telemetry
+
+# -------------------------------
+# GRACEFUL SHUTDOWN (Ctrl+C / SIGTERM)
+# -------------------------------
+# Pehla signal: naye chunks shuru nahi honge, jo request chal rahi hai wo poori hogi
+# aur manifest me likhi jaayegi (drain). drain_seconds ke baad ya doosre signal pe turant exit.
+# Har poora chunk manifest me already saved hai, isliye restart pe sirf bacha kaam jaata hai.
+DEFAULTS = {"drain_seconds": 60}
+
+_event = threading.Event()
+_state = {"timer": None, "drain_seconds": DEFAULTS["drain_seconds"]}
+
+
+class Cancelled(KeyboardInterrupt):
+    """Drain poora hua; kaam manifests me safe hai, dobara chalao toh wahin se."""
+
+
+def requested():
+    return _event.is_set()
+
+
+def wait(timeout=None):
+    return _event.wait(timeout)
+
+
+def _force_exit(reason):
+    print(f"\n💥 {reason} - abhi band kar rahe hain. Jo chunks poore ho chuke the wo manifest me safe hain.")
+    telemetry.dump()
+    os._exit(130)
+
+
+def request(reason="Signal mila"):
+    if _event.is_set():
+        _force_exit("Doosra signal")
+    _event.set()
+    drain = _state["drain_seconds"]
+    print(f"\n🛑 {reason}: naye chunks band, chal rahe chunks ke liye {drain}s ruk rahe hain "
+          f"(turant band karna ho toh dobara Ctrl+C).")
+    timer = threading.Timer(drain, _force_exit, args=("Drain ka time khatam",))
+    timer.daemon = True
+    timer.start()
+    _state["timer"] = timer
+
+
+def _handler(signum, frame):
+    request(f"{signal.Signals(signum).name} mila")
+
+
+@contextmanager
+def guard(drain_seconds=DEFAULTS["drain_seconds"]):
+    """
+    Is block ke dauran SIGINT/SIGTERM = graceful drain. Bahar nikalte hi purane handlers wapas.
+    Signal handler sirf main thread me lag sakta hai; baaki threads me ye kuch nahi karta
+    (service jobs ke liye serve() khud guard lagata hai).
+    """
+    if threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    _state["drain_seconds"] = drain_seconds
+    previous = {sig: signal.signal(sig, _handler) for sig in (signal.SIGINT, signal.SIGTERM)}
+    try:
+        yield
+    finally:
+        for sig, old in previous.items():
+            signal.signal(sig, old)
+        if _state["timer"]:
+            _state["timer"].cancel()
@@ -0,0 +1,100 @@
+from src import telemetry
+
+# -------------------------------
+# STREAMING + TRUNCATION HELPERS
+# -------------------------------
+# Provider (Gemini/Groq) koi bhi ho, ye helpers same rehte hain:
+# - PartialWriter: stream ke tukde seedha .partial.md me likhta hai
+# - looks_truncated: finish reason + length ratio se kati hui output pakadta hai
+# - untranslated_tail: source ka sirf bacha hua hissa nikalta hai (poora chunk dobara nahi)
+
+# Provider ke "output limit pe ruk gaya" wale finish reasons
+TRUNCATED_REASONS = {"MAX_TOKENS", "length"}
+
+DEFAULTS = {
+    "min_length_ratio": 0.5,   # output/input chars isse kam = shayad kata hua
+    "max_continuations": 3,    # ek chunk ke liye max kitni baar "aage likho"
+    "overlap_chars": 300,      # tail thoda peeche se shuru, taaki beech ka sentence na chhute
+}
+
+
+class PartialWriter:
+    """
+    Temp file = ab tak ke pakke chunks + abhi stream ho raha text.
+    Retry aaye toh file wapas pakke hisse tak truncate ho jaati hai.
+    """
+
+    def __init__(self, path, committed=""):
+        self.path = path
+        self.commit(committed)
+
+    def commit(self, text):
+        # Chunk pura hua: sanitized text ke saath poori file rewrite
+        self.path.write_text(text, encoding="utf-8")
+        self.base = self.path.stat().st_size
+
+    def start(self):
+        # Naya attempt: adhoora stream hata do
+        with open(self.path, "r+b") as f:
+            f.truncate(self.base)
+
+    def keep(self):
+        # Jo stream hua woh rakh lo (continuation isi ke aage likhega)
+        self.base = self.path.stat().st_size
+
+    def write(self, delta):
+        if not delta:
+            return
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(delta)
+
+
+def finish_reason_name(reason):
+    # Gemini enum deta hai, Groq string; dono ko string bana do
+    if reason is None:
+        return ""
+    return getattr(reason, "name", str(reason))
+
+
+def looks_truncated(source, translated, finish_reason, min_length_ratio=DEFAULTS["min_length_ratio"]):
+    if finish_reason_name(finish_reason) in TRUNCATED_REASONS:
+        return True
+    return len(translated.strip()) < len(source.strip()) * min_length_ratio
+
+
+def untranslated_tail(source, translated, expected_ratio=1.0, overlap_chars=DEFAULTS["overlap_chars"]):
+    """
+    Output ki length se andaza lagao ki source ka kitna hissa ho gaya,
+    phir thoda overlap rakh ke paragraph/sentence boundary se baaki source return karo.
+    """
+    done = int(len(translated) / max(expected_ratio, 0.1))
+    start = max(0, min(len(source), done) - overlap_chars)
+
+    # Boundary pe cut karo: paragraph ya sentence, jo bhi start ke sabse paas ho
+    para = source.rfind("\n", 0, start)
+    sentence = source.rfind(". ", 0, start)
+    start = max(para + 1 if para >= 0 else 0, sentence + 2 if sentence >= 0 else 0)
+
+    return source[start:].strip()
+
+
+def build_continuation_prompt(translated_so_far, tail):
+    return f"""
+---BEGIN---
+The previous translation of this passage stopped before the end.
+
+Translation so far ends with:
+{translated_so_far[-800:]}
+
+Remaining source text (its first lines may already be translated above):
+{tail}
+
+Continue the translation from exactly where it stopped. Do not repeat anything already translated.
+---END---
+"""
+
+
+def record_continuation(provider, chunk, tail):
+    # Poora chunk dobara bhejne ke mukable kitne chars bache
+    telemetry.incr("continuations", provider=provider)
+    telemetry.incr("continuation_chars_saved", max(0, len(chunk) - len(tail)), provider=provider)
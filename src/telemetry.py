@@ -0,0 +1,82 @@
+import json
+import threading
+from pathlib import Path
+
+# -------------------------------
+# TELEMETRY STORE
+# -------------------------------
+# Chhota sa in-process store: gauges (current value), counters (badhte rehte hain)
+# aur histograms (latency/duration ke buckets).
+# Har entry ka key = (name, sorted labels), taaki provider/model wise alag dikhe.
+TELEMETRY_PATH = Path("data/telemetry.json")
+
+# Seconds ke buckets: 50ms se 10 min tak (chunk request aur poore stage dono fit ho jaate hain)
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+_lock = threading.Lock()
+_gauges = {}
+_counters = {}
+_histograms = {}
+
+
+def _key(name, labels):
+    return (name, tuple(sorted(labels.items())))
+
+
+def set_gauge(name, value, **labels):
+    with _lock:
+        _gauges[_key(name, labels)] = value
+
+
+def add_gauge(name, amount, **labels):
+    # Gauge ko upar/neeche karo (jaise chunks_pending)
+    with _lock:
+        key = _key(name, labels)
+        _gauges[key] = _gauges.get(key, 0) + amount
+
+
+def incr(name, amount=1, **labels):
+    with _lock:
+        key = _key(name, labels)
+        _counters[key] = _counters.get(key, 0) + amount
+
+
+def observe(name, value, buckets=DEFAULT_BUCKETS, **labels):
+    with _lock:
+        key = _key(name, labels)
+        hist = _histograms.get(key)
+        if hist is None:
+            hist = _histograms[key] = {"buckets": list(buckets), "counts": [0] * len(buckets), "sum": 0.0, "count": 0}
+        for i, bound in enumerate(hist["buckets"]):
+            if value <= bound:
+                hist["counts"][i] += 1
+        hist["sum"] += value
+        hist["count"] += 1
+
+
+def snapshot():
+    # Copy return karte hain taaki caller lock ke bahar aaram se padh sake
+    with _lock:
+        return {
+            "gauges": [
+                {"name": name, "labels": dict(labels), "value": value}
+                for (name, labels), value in _gauges.items()
+            ],
+            "counters": [
+                {"name": name, "labels": dict(labels), "value": value}
+                for (name, labels), value in _counters.items()
+            ],
+            "histograms": [
+                {"name": name, "labels": dict(labels), "buckets": list(h["buckets"]),
+                 "counts": list(h["counts"]), "sum": h["sum"], "count": h["count"]}
+                for (name, labels), h in _histograms.items()
+            ],
+        }
+
+
+def dump(path=TELEMETRY_PATH):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(snapshot(), f, indent=4, ensure_ascii=False)
+    return path
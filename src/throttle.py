@@ -0,0 +1,161 @@
+import time
+import threading
+from contextlib import contextmanager
+
+from src import telemetry
+
+# -------------------------------
+# AIMD CONCURRENCY CONTROLLER
+# -------------------------------
+# TCP wala funda: jab tak calls pass ho rahi hain, window dheere dheere badhao
+# (har poori window ke success pe +1). 429 ya latency spike aaya toh window
+# seedha aadhi. Isse free-tier aur paid key dono pe apne aap sahi speed milti hai.
+# Latency = pehla token aane tak (time-to-first-token): poora stream output ki lambai ke saath
+# badhta hai, lamba chunk provider ke slow hone jaisa dikhta.
+DEFAULTS = {
+    "initial": 2,
+    "min": 1,
+    "max": 16,
+    "increase": 1.0,        # har RTT pe kitna badhana hai
+    "decrease": 0.5,        # 429 pe multiply factor
+    "latency_spike": 2.5,   # EWMA se itna guna slow = spike
+    "warmup_samples": 5,    # itne samples ke baad hi latency pe bharosa
+}
+
+
+class _Timing:
+    """slot() ke andar: stream ka pehla tukda aate hi first_token() bulao."""
+
+    def __init__(self):
+        self.start = time.monotonic()
+        self.first = None
+
+    def first_token(self):
+        if self.first is None:
+            self.first = time.monotonic() - self.start
+
+
+class AIMDController:
+    def __init__(self, provider, model, **settings):
+        cfg = {**DEFAULTS, **settings}
+        self.provider = provider
+        self.model = model
+        self._cond = threading.Condition()
+        self.in_flight = 0
+        self.latency_ewma = None
+        self.samples = 0
+        self._last_cut = 0.0
+        self.configure(**settings)
+        self.window = float(min(max(cfg["initial"], self.min_window), self.max_window))
+        self._publish()
+
+    def configure(self, **settings):
+        """Limits badlo; window/latency ka seekha hua state wahi rehta hai (sirf nayi limits me clamp)."""
+        cfg = {**DEFAULTS, **settings}
+        with self._cond:
+            self.min_window = max(1, int(cfg["min"]))
+            self.max_window = max(self.min_window, int(cfg["max"]))
+            self.increase = float(cfg["increase"])
+            self.decrease = float(cfg["decrease"])
+            self.latency_spike = float(cfg["latency_spike"])
+            self.warmup_samples = int(cfg["warmup_samples"])
+            if hasattr(self, "window"):
+                self.window = min(max(self.window, self.min_window), self.max_window)
+                self._publish()
+                self._cond.notify_all()
+
+    # --- slot management ---
+    def acquire(self):
+        with self._cond:
+            while self.in_flight >= int(self.window):
+                self._cond.wait()
+            self.in_flight += 1
+            self._publish()
+
+    def release(self):
+        with self._cond:
+            self.in_flight -= 1
+            self._publish()
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self):
+        # Success sirf tab count hoga jab andar ka code bina exception ke nikle.
+        # Controller ko TTFT milta hai; first_token() na bula ho (non-stream) toh poora time.
+        self.acquire()
+        timing = _Timing()
+        try:
+            yield timing
+        except BaseException:
+            self.release()
+            raise
+        self.release()
+        latency = time.monotonic() - timing.start
+        telemetry.observe("request_latency_seconds", latency, provider=self.provider, model=self.model)
+        self.on_success(timing.first if timing.first is not None else latency)
+
+    # --- feedback ---
+    def on_success(self, latency):
+        with self._cond:
+            self.samples += 1
+            spiked = (
+                self.samples > self.warmup_samples
+                and self.latency_ewma is not None
+                and latency > self.latency_ewma * self.latency_spike
+            )
+            # EWMA baseline update (spike ko baseline me ghusne nahi dete)
+            if not spiked:
+                if self.latency_ewma is None:
+                    self.latency_ewma = latency
+                else:
+                    self.latency_ewma = 0.8 * self.latency_ewma + 0.2 * latency
+
+        if spiked:
+            telemetry.incr("latency_spikes", provider=self.provider, model=self.model)
+            self._cut()
+            return
+
+        with self._cond:
+            self.window = min(self.max_window, self.window + self.increase / self.window)
+            self._publish()
+            self._cond.notify_all()
+
+    def on_rate_limit(self):
+        telemetry.incr("rate_limits", provider=self.provider, model=self.model)
+        self._cut()
+
+    def _cut(self):
+        with self._cond:
+            # Ek hi burst ke saare 429 pe baar baar mat kaato - ek RTT me ek cut kaafi hai
+            now = time.monotonic()
+            cooldown = self.latency_ewma or 1.0
+            if now - self._last_cut < cooldown:
+                return
+            self._last_cut = now
+            self.window = max(self.min_window, self.window * self.decrease)
+            self._publish()
+
+    def _publish(self):
+        telemetry.set_gauge("concurrency_window", round(self.window, 2), provider=self.provider, model=self.model)
+        telemetry.set_gauge("in_flight", self.in_flight, provider=self.provider, model=self.model)
+
+
+# -------------------------------
+# REGISTRY (provider + model wise)
+# -------------------------------
+_controllers = {}
+_registry_lock = threading.Lock()
+
+
+def get_controller(provider, model, **settings):
+    """
+    Ek provider+model ka ek controller poore process me (provider ki capacity sab runs me shared hai).
+    Baad ki call ke settings bhi lagte hain (configure), sirf pehli wali ke nahi.
+    """
+    key = (provider, model)
+    with _registry_lock:
+        if key not in _controllers:
+            _controllers[key] = AIMDController(provider, model, **settings)
+        elif settings:
+            _controllers[key].configure(**settings)
+        return _controllers[key]
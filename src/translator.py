@@ -1,24 +1,56 @@
 import os
 import json
 import time
+import socket
+import threading
 import google.generativeai as genai
+from google.generativeai import client as genai_client
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
 from tqdm import tqdm
 
+from src import telemetry
+from src.throttle import get_controller
+from src.keypool import KeyPool, load_keys, estimate_tokens, retry_after_seconds
+from src import streaming
+from src.streaming import PartialWriter
+from src import manifest, validator
+from src.memory import TranslationMemory
+from src.dedup import DedupPlan, passage_key
+from src.catalog import open_catalog
+from src import local_backend, planner, workqueue, metrics, shutdown, prompt_cache, router as difficulty, bitext as bilingual
+
 # -------------------------------
 # ENV + API SETUP
 # -------------------------------
 # Bhai, .env file check kar lena, API Key wahi honi chahiye!
 load_dotenv()
-API_KEY = os.getenv("GEMINI_API_KEY")
+# Ek se zyada keys ho toh GEMINI_API_KEY_1, _2... ya GEMINI_API_KEYS="k1,k2" daal de
+API_KEYS = load_keys("GEMINI_API_KEY")
+# Google ki jagah koi aur server (load test ka fake provider, proxy): GEMINI_API_ENDPOINT=http://127.0.0.1:9200
+API_ENDPOINT = os.getenv("GEMINI_API_ENDPOINT")
+
 
-if not API_KEY:
-    raise ValueError("❌ Error: API Key nahi mili! .env file check kar bhai.")
+def configure_genai(api_key):
+    # Custom endpoint sirf REST transport pe chalta hai (gRPC ko TLS wala host chahiye)
+    if API_ENDPOINT:
+        genai.configure(api_key=api_key, transport="rest", client_options={"api_endpoint": API_ENDPOINT})
+    else:
+        genai.configure(api_key=api_key)
 
-genai.configure(api_key=API_KEY)
+
+# Key na ho toh bhi import chale: local backend (offline) ko key nahi chahiye
+KEY_POOL = None
+if API_KEYS:
+    API_KEY = API_KEYS[0][1]
+    configure_genai(API_KEY)
+    KEY_POOL = KeyPool("gemini", API_KEYS)
+_configure_lock = threading.Lock()
 
 CONFIG_PATH = Path("config/prompts.json")
+MODEL_NAME = "gemini-flash-latest" # Latest stable model name use kar
+TM_DEFAULTS = {"enabled": True, "threshold": 0.5, "max_hints": 4}
 
 
 # -------------------------------
@@ -51,6 +83,13 @@ def build_system_instruction(config):
         for key, value in style_rules.items():
             style_text += f"- **{key.capitalize()}**: {value}\n"
 
+    # Glossary: validator isi list se compliance check karta hai
+    glossary_text = ""
+    for term, target in config.get("glossary", {}).items():
+        glossary_text += f"- {term} → {target}\n"
+    if glossary_text:
+        glossary_text = f"Glossary (always use exactly these renderings):\n{glossary_text}\n"
+
     return (
         f"Role: Professional Literary Translator\n\n"
         f"Project Settings:\n"
@@ -58,6 +97,7 @@ def build_system_instruction(config):
         f"- Target: {target_lang}\n\n"
         f"Base Instructions:\n{base}\n\n"
         f"Style Guidelines:\n{style_text}\n\n"
+        f"{glossary_text}"
         f"Output Requirement:\nReturn ONLY the translated text in clean Markdown format."
     )
 
@@ -110,27 +150,112 @@ def split_text_smartly(text, max_chars=7000):
     return chunks
 
 
+# -------------------------------
+# MODEL PER KEY
+# -------------------------------
+def build_model(api_key, system_instruction, generation_config, model_name=MODEL_NAME):
+    # genai.configure() global hai, isliye lock me configure karke
+    # client ko turant model pe bind kar dete hain (warna baad wali key use ho jaati)
+    with _configure_lock:
+        configure_genai(api_key)
+        model = genai.GenerativeModel(
+            model_name=model_name,
+            system_instruction=system_instruction,
+            generation_config=generation_config
+        )
+        model._client = genai_client.get_default_generative_client()
+    return model
+
+
+def gemini_client(secret, system_instruction, config, model_name=MODEL_NAME, caches=None):
+    """
+    Key ka client: prompt cache ON ho toh system prompt provider ke context cache se, warna normal model.
+    caches: is run ki registry list (prompt_cache.release_all(caches) run ke end pe).
+    """
+    settings = prompt_cache.settings_from(config)
+    if not settings["enabled"] or estimate_tokens(system_instruction) < settings["min_tokens"]:
+        return build_model(secret, system_instruction, generation_config(), model_name)
+    if settings["backend"] == "memory":
+        backend = prompt_cache.MemoryCacheBackend(
+            lambda: build_model(secret, system_instruction, generation_config(), model_name))
+    else:
+        backend = prompt_cache.GeminiCacheBackend(secret, _configure_lock, configure_genai)
+    return prompt_cache.ContextCache(backend, system_instruction, model_name, generation_config(),
+                                     settings["ttl_minutes"], settings["refresh_before_minutes"], caches).client()
+
+
 # -------------------------------
 # STRONG RETRY SYSTEM
 # -------------------------------
-def generate_with_retry(model, prompt, max_retries=7):
+def generate_with_retry(pool, prompt, max_retries=7, controller=None, writer=None):
+    """
+    Response stream hota hai: har tukda aate hi writer (PartialWriter) me chala jaata hai.
+    Return: (text, finish_reason) ya fail hone pe (None, None).
+    """
+    # Controller na diya ho toh model ke naam wala le lo
+    if controller is None:
+        controller = get_controller("gemini", MODEL_NAME)
+
+    tokens = estimate_tokens(prompt)
+
     for i in range(max_retries):
+        # Har attempt pe pool se agli free key (round-robin)
+        key = pool.acquire(tokens)
+        telemetry.incr("tokens_in", tokens, provider=pool.provider)
+        if writer:
+            writer.start()
         try:
-            res = model.generate_content(prompt)
-            return res.text
+            with controller.slot() as timing:
+                sent = time.monotonic()
+                res = key.client.generate_content(prompt, stream=True)
+                pieces = []
+                for part in res:
+                    if not pieces:
+                        # Time-to-first-token: prompt cache ka asli fayda yahin dikhta hai (AIMD bhi isi pe chalta hai)
+                        timing.first_token()
+                        telemetry.observe("first_token_seconds", time.monotonic() - sent, provider=pool.provider,
+                                          cached="yes" if getattr(key.client, "cached", False) else "no")
+                    try:
+                        delta = part.text
+                    except ValueError:
+                        # Safety block / khali candidate: text nahi hai
+                        delta = ""
+                    pieces.append(delta)
+                    if writer:
+                        writer.write(delta)
+                finish_reason = res.candidates[0].finish_reason if res.candidates else None
+            pool.report_success(key)
+            text = "".join(pieces)
+            telemetry.incr("tokens_out", estimate_tokens(text), provider=pool.provider)
+            return text, finish_reason
         except Exception as e:
             err = str(e)
             wait = (i + 1) * 8 # Thoda wait badha diya safety ke liye
 
+            if shutdown.requested():
+                # Drain chal raha hai: retry/cooldown ka wait nahi, chunk agli run me jayega
+                return None, None
+
             if "429" in err or "exhausted" in err or "Quota" in err:
-                print(f"⚠️ Quota Full / Rate Limit. Waiting {wait}s... (Chai pee le tab tak ☕)")
-                time.sleep(wait)
+                controller.on_rate_limit()
+                # Key ko cooldown pe daal do; pool.acquire() khud doosri key dega ya wait karega
+                cooldown = pool.report_rate_limit(key, retry_after=retry_after_seconds(e))
+                telemetry.incr("retries", provider=controller.provider, model=controller.model)
+                print(f"⚠️ Quota Full / Rate Limit on {key.label}. Cooldown {cooldown:g}s... (window={controller.window:.1f}, Chai pee le tab tak ☕)")
                 continue
+            elif "API key" in err or "PERMISSION_DENIED" in err or "403" in err:
+                # Key hi kharab hai: baar baar hua toh pool ise park kar dega
+                pool.report_failure(key)
+                if pool.active_count() > 1:
+                    print(f"⚠️ Key {key.label} reject hui. Agli key try kar rahe hain...")
+                    continue
+                print(f"❌ Fatal Error ({key.label}): {err}")
+                return None, None
             else:
                 print(f"❌ Fatal Error: {err}")
-                return None
+                return None, None
 
-    return None
+    return None, None
 
 
 # -------------------------------
@@ -151,16 +276,368 @@ def sanitize_output(text):
     return text.strip()
 
 
+# -------------------------------
+# PROMPT BUILDER
+# -------------------------------
+def build_prompt(chunk, part, previous_original, previous_translated, hints=None):
+    # Translation memory ke near matches: model wahi wording reuse kare
+    memory = ""
+    if hints:
+        memory = "Translation Memory (earlier translations of similar passages; reuse their wording where the source matches):\n"
+        for score, source, target in hints:
+            memory += f"EN: {source[:600]}\nHI: {target[:600]}\n\n"
+
+    return f"""
+---BEGIN---
+Previous Original Context:
+{previous_original[-1200:]}
+
+Previous Translated Context:
+{previous_translated[-1200:]}
+
+{memory}Now translate the following {part}:
+
+{chunk}
+---END---
+"""
+
+
+# -------------------------------
+# CHUNK TRANSLATOR (stream + tail continuation)
+# -------------------------------
+def translate_chunk(pool, chunk, prompt, controller, writer, expected_ratio=1.0, settings=None):
+    settings = {**streaming.DEFAULTS, **(settings or {})}
+
+    translated, finish_reason = generate_with_retry(pool, prompt, controller=controller, writer=writer)
+    if not translated:
+        return None
+    translated = sanitize_output(translated)
+
+    # Output kati hui lagi? Toh sirf bacha hua source dobara bhejo
+    for _ in range(settings["max_continuations"]):
+        if not streaming.looks_truncated(chunk, translated, finish_reason, settings["min_length_ratio"]):
+            break
+
+        tail = streaming.untranslated_tail(chunk, translated, expected_ratio, settings["overlap_chars"])
+        # Controller = asli lane (local backend ya routed tier), sirf default Gemini model nahi
+        telemetry.incr("truncations", provider=controller.provider, model=controller.model)
+        print(f"✂️ Output kata hua laga ({streaming.finish_reason_name(finish_reason) or 'short'}). Sirf tail ({len(tail)} chars) dobara bhej rahe hain...")
+        streaming.record_continuation(controller.provider, chunk, tail)
+
+        writer.write("\n")
+        writer.keep()
+        more, finish_reason = generate_with_retry(
+            pool, streaming.build_continuation_prompt(translated, tail), controller=controller, writer=writer
+        )
+        if not more:
+            break
+        translated = translated + "\n" + more
+
+    return translated
+
+
+# -------------------------------
+# ONE CHUNK: TM -> API -> VALIDATOR
+# -------------------------------
+def produce_chunk(pool, chunk, idx, total, previous_original, previous_translated,
+                  controller, writer, config, tm=None, label="", expected_ratio=1.0, router=None):
+    """Return: (translated, validator result, origin) - origin "tm" ya "api"."""
+    glossary = config.get("glossary", {})
+    checks = {**validator.DEFAULTS, **config.get("validation", {})}
+    tm_settings = {**TM_DEFAULTS, **config.get("translation_memory", {})}
+
+    # Translation memory: exact match = API call zero, near match = prompt me hint
+    tm_hit, hints = tm.lookup_chunk(chunk, tm_settings["threshold"], tm_settings["max_hints"]) if tm else (None, [])
+    translated = tm_hit
+    result = validator.validate_chunk(chunk, tm_hit, glossary, checks) if tm_hit else None
+
+    if result and result["ok"]:
+        telemetry.incr("tm_exact_hits")
+        return translated, result, "tm"
+
+    if hints:
+        telemetry.incr("tm_fuzzy_hints", len(hints))
+    part = f"(Part {idx+1}/{total})" if total > 1 else ""
+    prompt = build_prompt(chunk, part, previous_original, previous_translated, hints)
+
+    # Routing: aasaan chunk saste model pe; har reject pe agla (strong) tier
+    lanes = router.route(chunk) if router else [(MODEL_NAME, pool, controller)]
+
+    # Validator reject kare toh turant ek-do baar aur try; phir bhi fail toh manifest me "ok": false
+    for attempt in range(max(checks["max_attempts"], len(lanes))):
+        model_name, lane_pool, lane_controller = lanes[min(attempt, len(lanes) - 1)]
+        translated = translate_chunk(lane_pool, chunk, prompt, lane_controller, writer, expected_ratio, config.get("streaming"))
+        result = validator.validate_chunk(chunk, translated, glossary, checks)
+        result["model"] = model_name
+        if result["ok"] or shutdown.requested():
+            break
+        telemetry.incr("validation_failures", provider=lane_pool.provider, model=model_name)
+        print(f"🚩 {label} #{idx+1} rejected (score {result['score']}): {', '.join(result['issues'])}")
+        if attempt + 1 < len(lanes):
+            telemetry.incr("escalations", model=lanes[attempt + 1][0])
+            print(f"⬆️ {label} #{idx+1}: {model_name} -> {lanes[attempt + 1][0]}")
+
+    # Pass hua toh memory me daal do (aage ki books/editions ke kaam aayega)
+    if tm and result["ok"]:
+        tm.add_aligned(chunk, translated, book=label)
+
+    return translated, result, "api"
+
+
+# -------------------------------
+# CHAPTER TRANSLATOR (ek worker = ek chapter)
+# -------------------------------
+def translate_chapter(pool, file, output_dir, temp_dir, controller, config, tm=None, plan=None,
+                      manifest_dir=manifest.MANIFEST_DIR, router=None, bitext=None, book="book", catalog=None):
+    output_file = output_dir / f"{file.stem}.md"
+    temp_file = temp_dir / f"{file.stem}.partial.md"
+    manifest_file = manifest.manifest_path(file.stem, manifest_dir)
+
+    raw = clean_text(file.read_text(encoding="utf-8"))
+    # Dedup plan ho toh repeated passages alag chunk bante hain
+    chunks = plan.split(raw, split_text_smartly) if plan else split_text_smartly(raw)
+
+    # Pichli run ke pass hue chunks manifest se mil jaayenge
+    old_entries = {e["index"]: e for e in manifest.load(manifest_file).get("chunks", [])}
+    entries = []
+
+    # Context ab chapter ke andar hi chalta hai, kyunki chapters parallel chal rahe hain
+    previous_original = ""
+    previous_translated = ""
+    final_output = ""
+
+    # Partial file me stream seedha likha jaata hai
+    writer = PartialWriter(temp_file)
+    source_chars = 0
+    failed = 0
+    telemetry.add_gauge("chunks_pending", len(chunks))
+    if catalog:
+        catalog.chapter_status(book, file.stem, "translating", len(chunks))
+
+    for idx, chunk in enumerate(chunks):
+        if shutdown.requested():
+            # Naya chunk shuru nahi karna; ab tak ka kaam manifest + partial me hai
+            telemetry.add_gauge("chunks_pending", idx - len(chunks))
+            if catalog:
+                catalog.chapter_status(book, file.stem, "paused")
+            print(f"⏸️ {file.name}: {idx}/{len(chunks)} chunks ke baad ruka. Restart pe yahin se.")
+            return file
+
+        entry = old_entries.get(idx)
+        chunk_started = time.perf_counter()
+
+        if manifest.reusable(entry, chunk):
+            translated = entry["translation"]
+            telemetry.incr("chunks_done", origin="manifest")
+        else:
+            def produce():
+                # Is chapter me ab tak output/input ka ratio (tail ka andaza isi se)
+                expected_ratio = len(final_output) / source_chars if source_chars else 1.0
+                return produce_chunk(pool, chunk, idx, len(chunks), previous_original, previous_translated,
+                                     controller, writer, config, tm, file.stem, expected_ratio, router)
+
+            # Repeated passage (gaana/chitthi)? Poori book me ek hi baar translate hoga
+            if plan and plan.is_shared(chunk):
+                (translated, result, origin), reused = plan.get_or_translate(chunk, produce, lambda out: out[1]["ok"])
+                if reused:
+                    origin = "dedup"
+            else:
+                translated, result, origin = produce()
+
+            if not result["ok"] and shutdown.requested():
+                # Drain ke beech adhoora chunk: fail mat likho, agli run me normal chalega
+                telemetry.add_gauge("chunks_pending", -1)
+                continue
+
+            entry = {
+                "index": idx,
+                "hash": manifest.text_hash(chunk),
+                "source": chunk,
+                "translation": translated,
+                "ok": result["ok"],
+                "score": result["score"],
+                "issues": result["issues"],
+                "origin": origin,
+                "model": result.get("model"),
+            }
+            telemetry.incr("chunks_done", origin=origin)
+
+        telemetry.add_gauge("chunks_pending", -1)
+        entries.append(entry)
+        manifest.save(manifest_file, {"source_hash": manifest.text_hash(raw), "chunks": entries})
+        if catalog:
+            chunk_origin = "manifest" if entry is old_entries.get(idx) else entry["origin"]
+            catalog.record_chunk(book, file.stem, idx, entry["ok"], chunk_origin, entry.get("model"),
+                                 estimate_tokens(chunk), estimate_tokens(entry["translation"]),
+                                 time.perf_counter() - chunk_started)
+        if bitext and entry["ok"]:
+            # Review ke liye chunk + sentence alignment (reused chunk pehle se index me ho toh no-op)
+            bitext.add_chunk(book, file.stem, idx, chunk, entry["translation"])
+
+        if not entry["ok"]:
+            failed += 1
+            # Kharab translation ko context me mat daalo; agla chunk sirf source context se chalega
+            previous_original = chunk[-1500:]
+            previous_translated = ""
+            continue
+
+        final_output += translated + "\n\n"
+        source_chars += len(chunk)
+
+        # Context update
+        previous_original = chunk[-1500:]
+        previous_translated = translated[-1500:]
+
+        # Partial save (Backup) - sanitized version se stream wala text replace
+        writer.commit(final_output)
+
+    # Koi chunk fail hua toh chapter final nahi hoga; agli run sirf wahi chunks bhejegi
+    if failed:
+        print(f"⚠️ {file.name}: {failed}/{len(chunks)} chunks validation me fail. Agli run me sirf ye dobara jayenge.")
+        if catalog:
+            catalog.chapter_status(book, file.stem, "failed")
+        return file
+
+    # Final save jab saare chunks ho jayein
+    if final_output:
+        output_file.write_text(final_output.strip(), encoding="utf-8")
+        if temp_file.exists():
+            temp_file.unlink() # Temp file uda do
+    if catalog:
+        catalog.chapter_status(book, file.stem, "done")
+
+    return file
+
+
 # -------------------------------
 # MAIN TRANSLATOR (UPDATED LOGIC HERE)
 # -------------------------------
-def translate_book():
+def pending_files(all_files, output_dir, manifest_dir=manifest.MANIFEST_DIR):
+    files_to_process = []
+    for file in all_files:
+        output_file = output_dir / f"{file.stem}.md"
+
+        # Check: File exist karti hai AND khali nahi hai AND manifest me koi fail chunk nahi
+        done = output_file.exists() and output_file.stat().st_size > 0
+        if not (done and not manifest.has_failures(manifest.manifest_path(file.stem, manifest_dir))):
+            files_to_process.append(file)
+    return files_to_process
+
+
+def setup_backend(config, system_instruction, caches=None):
+    """Return: (key_pool, controller, local_model) - local_model sirf offline backend pe. caches: gemini_client dekho."""
+    local_settings = {**local_backend.DEFAULTS, **config.get("local_backend", {})}
+    if local_settings["enabled"]:
+        # Offline: CPU model ek hi "key" ke peeche; quota nahi, window = parallel batches
+        local_model = local_backend.LocalModel(config.get("glossary"), **local_settings)
+        key_pool = KeyPool("local", [("cpu", local_settings["model_dir"])], lambda _: local_model,
+                           rpm=10**9, tpm=10**12)
+        controller = get_controller("local", local_model.name,
+                                    initial=local_model.workers, min=1, max=local_model.workers)
+        print(f"🖥️ Local backend: {local_model.name} ({local_model.workers} parallel batches, CPU)")
+        return key_pool, controller, local_model
+
+    if KEY_POOL is None:
+        raise ValueError("❌ Error: API Key nahi mili! .env file check kar bhai.")
+
+    # Har key ka apna model (client us key pe bind hota hai)
+    KEY_POOL.configure(config.get("key_pool", {}).get("gemini", {}))
+    KEY_POOL.bind(lambda secret: gemini_client(secret, system_instruction, config, caches=caches))
+    print(f"🔑 {KEY_POOL.size} API key(s) loaded for Gemini.")
+
+    cache_settings = prompt_cache.settings_from(config)
+    if cache_settings["enabled"]:
+        tokens = estimate_tokens(system_instruction)
+        if tokens < cache_settings["min_tokens"]:
+            print(f"🗄️ System prompt chhota hai (~{tokens} tokens < {cache_settings['min_tokens']}), prompt cache skip.")
+        else:
+            print(f"🗄️ Prompt cache ON ({cache_settings['backend']}): ~{tokens} tokens ka system prompt har key pe ek baar.")
+
+    controller = get_controller("gemini", MODEL_NAME, **gemini_concurrency(config))
+    return KEY_POOL, controller, None
+
+
+def generation_config():
+    # Model config for safety
+    return genai.types.GenerationConfig(
+        temperature=0.3, # Thoda creative kam, accurate zyada
+    )
+
+
+def gemini_concurrency(config):
+    # AIMD controller: fixed sleep ki jagah ab window khud adjust hogi.
+    # Zyada keys = zyada capacity, isliye max window keys ke hisaab se scale hoti hai.
+    concurrency = dict(config.get("concurrency", {}))
+    concurrency["max"] = concurrency.get("max", 8) * KEY_POOL.size
+    return concurrency
+
+
+def setup_router(config, system_instruction, key_pool, controller, texts=(), caches=None):
+    """
+    Difficulty routing (config "routing"): har tier model ka apna KeyPool + AIMD controller,
+    kyunki Gemini ka quota model-wise lagta hai. Default model wala tier main pool hi use karta hai.
+    """
+    settings = difficulty.settings_from(config)
+    if not settings["enabled"] or key_pool.provider != "gemini":
+        return None
+
+    lanes = []
+    for model_name in settings["tiers"]["gemini"]:
+        if model_name == MODEL_NAME:
+            lanes.append((model_name, key_pool, controller))
+            continue
+        pool = KeyPool("gemini", API_KEYS)
+        pool.configure(config.get("key_pool", {}).get("gemini", {}))
+        pool.bind(lambda secret, name=model_name: gemini_client(secret, system_instruction, config, name, caches))
+        lanes.append((model_name, pool, get_controller("gemini", model_name, **gemini_concurrency(config))))
+
+    route = difficulty.Router(lanes, config.get("glossary"), texts, **settings)
+    route.report()
+    return route
+
+
+def setup_bitext(config):
+    settings = {**bilingual.DEFAULTS, **config.get("bitext", {})}
+    if not settings["enabled"]:
+        return None
+    index = bilingual.BilingualIndex(settings["path"])
+    print(f"🔎 Bilingual index: {index.stats()}")
+    return index
+
+
+def pending_chunks(files, plan=None, manifest_dir=manifest.MANIFEST_DIR):
+    """Dry run ke liye: har chapter ke woh chunks jo abhi API tak jaayenge (manifest/dedup wale nahi)."""
+    chapters = {}
+    seen_shared = set()
+    for file in files:
+        raw = clean_text(file.read_text(encoding="utf-8"))
+        chunks = plan.split(raw, split_text_smartly) if plan else split_text_smartly(raw)
+        old_entries = {e["index"]: e for e in manifest.load(manifest.manifest_path(file.stem, manifest_dir)).get("chunks", [])}
+
+        pending = []
+        for idx, chunk in enumerate(chunks):
+            if manifest.reusable(old_entries.get(idx), chunk):
+                continue
+            if plan and plan.is_shared(chunk):
+                # Shared block poori book me ek hi baar translate hota hai
+                if chunk in seen_shared:
+                    continue
+                seen_shared.add(chunk)
+            pending.append(chunk)
+        chapters[file.stem] = pending
+    return chapters
+
+
+def translate_book(dry_run=False, finish_by=None, input_dir="data/raw_text", output_dir="data/output_books",
+                   manifest_dir=manifest.MANIFEST_DIR, book=None, keys=None):
     print("⚙️ Settings load ho rahi hain...")
     config = load_config()
+    catalog = None if dry_run else open_catalog(config)
 
-    input_dir = Path("data/raw_text")
-    output_dir = Path("data/output_books")
-    temp_dir = Path("data/temp")
+    # Folders default "data/" wale; service har job ke liye apna folder deta hai
+    input_dir = Path(input_dir)
+    output_dir = Path(output_dir)
+    temp_dir = input_dir.parent / "temp"
     
     # Folders bana lo agar nahi hain
     output_dir.mkdir(parents=True, exist_ok=True)
@@ -173,18 +650,9 @@ def translate_book():
         return
 
     # 2. FILTER LOGIC: Jo ban chuka hai use skip karo
-    files_to_process = []
     print(f"🔍 Checking {len(all_files)} files...")
-
-    skipped_count = 0
-    for file in all_files:
-        output_file = output_dir / f"{file.stem}.md"
-        
-        # Check: File exist karti hai AND khali nahi hai
-        if output_file.exists() and output_file.stat().st_size > 0:
-            skipped_count += 1
-        else:
-            files_to_process.append(file)
+    files_to_process = pending_files(all_files, output_dir, manifest_dir)
+    skipped_count = len(all_files) - len(files_to_process)
 
     if skipped_count > 0:
         print(f"⏩ Skipped {skipped_count} files (Already Translated).")
@@ -193,78 +661,271 @@ def translate_book():
         print("\n🎉 Badhai ho! Saari files already translated hain. Project Complete! ✅")
         return
 
-    print(f"🚀 Starting translation for {len(files_to_process)} remaining files...\n")
+    # Poori book me repeated passages (gaane, refrains) - ek baar translate, har jagah reuse.
+    # Plan hamesha saare chapters se: warna chunk boundaries is pe depend karti ki kaun bacha hai,
+    # aur resume pe manifest hashes miss hoke pura kaam dobara hota.
+    plan = None
+    if config.get("dedup", {}).get("enabled", True):
+        plan = DedupPlan(
+            {f.stem: clean_text(f.read_text(encoding="utf-8")) for f in all_files},
+            config.get("dedup"),
+        )
+        plan.report()
 
-    # 3. Model Setup
     system_instruction = build_system_instruction(config)
-    
-    # Model config for safety
-    generation_config = genai.types.GenerationConfig(
-        temperature=0.3, # Thoda creative kam, accurate zyada
-    )
-
-    model = genai.GenerativeModel(
-        model_name="gemini-flash-latest", # Latest stable model name use kar
-        system_instruction=system_instruction,
-        generation_config=generation_config
-    )
-
-    previous_original = ""
-    previous_translated = ""
-
-    # 4. Processing Loop (Sirf bachi hui files pe)
-    for file in tqdm(files_to_process, desc="Translating"):
-        output_file = output_dir / f"{file.stem}.md"
-        temp_file = temp_dir / f"{file.stem}.partial.md"
+    local_settings = {**local_backend.DEFAULTS, **config.get("local_backend", {})}
 
-        raw = clean_text(file.read_text(encoding="utf-8"))
-        chunks = split_text_smartly(raw)
-
-        final_output = ""
+    # Dry run: sirf hisaab (requests, tokens, time, cost), ek bhi API call nahi
+    if dry_run:
+        provider = "local" if local_settings["enabled"] else "gemini"
+        return planner.plan_book(pending_chunks(files_to_process, plan, manifest_dir), config, system_instruction, provider,
+                                 finish_by, keys=keys)
 
-        for idx, chunk in enumerate(chunks):
-            part = f"(Part {idx+1}/{len(chunks)})" if len(chunks) > 1 else ""
-
-            prompt = f"""
----BEGIN---
-Previous Original Context:
-{previous_original[-1200:]}
-
-Previous Translated Context:
-{previous_translated[-1200:]}
+    print(f"🚀 Starting translation for {len(files_to_process)} remaining files...\n")
 
-Now translate the following {part}:
+    # 3. Model Setup (is run ke prompt caches apni list me - end pe sirf wahi release)
+    caches = []
+    key_pool, controller, local_model = setup_backend(config, system_instruction, caches)
+    metrics.start_from_config(config)
+    started = time.perf_counter()
+
+    # Translation memory (pichli books / editions ka kaam)
+    tm_settings = {**TM_DEFAULTS, **config.get("translation_memory", {})}
+    tm = TranslationMemory() if tm_settings["enabled"] else None
+    if tm:
+        print(f"🧠 Translation memory: {tm.count()} segments ready.")
+
+    # Chunk difficulty ke hisaab se model tier (config "routing")
+    route = setup_router(config, system_instruction, key_pool, controller,
+                         [f.read_text(encoding="utf-8") for f in files_to_process], caches)
+
+    # Source <-> translation alignment, review search ke liye (config "bitext")
+    index = setup_bitext(config)
+
+    # Catalog: book ka naam extraction ne raw_text folder ke saath likha tha
+    book = book or (catalog.resolve(input_dir) if catalog else None) or "book"
+    if catalog:
+        catalog.start_translation(book, output_dir)
+
+    # 4. Processing Loop (Sirf bachi hui files pe, chapters parallel)
+    # Ctrl+C / SIGTERM: naye chunks band, chal rahe chunks poore hoke manifest me (drain)
+    shutdown_settings = {**shutdown.DEFAULTS, **config.get("shutdown", {})}
+    with shutdown.guard(shutdown_settings["drain_seconds"]), ThreadPoolExecutor(max_workers=controller.max_window) as pool:
+        futures = [
+            pool.submit(translate_chapter, key_pool, file, output_dir, temp_dir, controller, config, tm, plan,
+                        manifest_dir, route, index, book, catalog)
+            for file in files_to_process
+        ]
+        with tqdm(total=len(futures), desc="Translating") as bar:
+            for future in as_completed(futures):
+                future.result()
+                bar.set_postfix(window=f"{controller.window:.1f}", in_flight=controller.in_flight)
+                bar.update(1)
+
+    prompt_cache.report()
+    prompt_cache.release_all(caches)
+    if shutdown.requested():
+        if catalog:
+            catalog.finish_translation(book, time.perf_counter() - started, "paused")
+        telemetry.dump()
+        print("\n⏸️ Drain poora. Saare completed chunks manifests me save hain; dobara chalao toh wahin se shuru.")
+        raise shutdown.Cancelled()
+
+    telemetry.observe("stage_duration_seconds", time.perf_counter() - started, stage="translate")
+    if catalog:
+        incomplete = pending_files(all_files, output_dir, manifest_dir)
+        catalog.finish_translation(book, time.perf_counter() - started, "incomplete" if incomplete else "translated")
+    if local_model:
+        print(f"🖥️ Local throughput: {local_model.throughput():.1f} sentences/sec")
+
+    telemetry.dump()
+    print("\n✅ MISSION ACCOMPLISHED. Saare books 'output_books' folder mein check kar le.")
 
-{chunk}
----END---
-"""
-            translated = generate_with_retry(model, prompt)
 
-            if not translated:
-                print(f"❌ Chunk failed in {file.name}. Skipping to next file...")
-                break # Agar ek chunk fail hua toh poora file kharab ho sakta hai, break better hai
+# -------------------------------
+# DISTRIBUTED QUEUE (kai workers / machines, ek book)
+# -------------------------------
+QUEUE_DEFAULTS = {"url": "sqlite:///data/queue.sqlite", "poll_seconds": 2, **workqueue.DEFAULTS}
 
-            translated = sanitize_output(translated)
-            final_output += translated + "\n\n"
 
-            # Context update
-            previous_original = chunk[-1500:]
-            previous_translated = translated[-1500:]
-
-            # Partial save (Backup)
-            temp_file.write_text(final_output, encoding="utf-8")
+def enqueue_book(broker, book="book"):
+    """
+    Bache hue chapters ke chunks queue me daalo. Dobara chalao toh sirf naye/fail chunks reset hote hain.
+    Dedup translate_book jaisa: shared block apna chunk, dedup_key ke saath (worker ek baar translate karta hai).
+    """
+    config = load_config()
+    input_dir = Path("data/raw_text")
+    output_dir = Path("data/output_books")
+    all_files = sorted(input_dir.glob("*.txt"))
+    files = pending_files(all_files, output_dir)
+    texts = {f.stem: clean_text(f.read_text(encoding="utf-8")) for f in all_files}
+
+    # Plan saari book se (translate_book jaisa), enqueue sirf bache chapters
+    plan = None
+    if config.get("dedup", {}).get("enabled", True):
+        plan = DedupPlan(texts, config.get("dedup"))
+        plan.report()
+
+    added = 0
+    for chapter in (f.stem for f in files):
+        raw = texts[chapter]
+        chunks = plan.split(raw, split_text_smartly) if plan else split_text_smartly(raw)
+        keys = [passage_key(c) if plan and plan.is_shared(c) else None for c in chunks]
+        added += broker.enqueue(book, chapter, chunks, keys)
+
+    broker.publish()
+    print(f"📥 Queue: {len(files)} chapters, {added} naye chunks. Status: {broker.stats()}")
+    return added
+
+
+def assemble_chapter(broker, book, chapter, output_dir, catalog=None):
+    """Chapter ke saare chunks done? Toh manifest + .md likho (koi bhi worker kar sakta hai, idempotent)."""
+    tasks = broker.chapter_tasks(book, chapter)
+    if not tasks or any(t["status"] != "done" for t in tasks):
+        return False
+
+    entries = []
+    for t in tasks:
+        result = t["result"] or {}
+        entries.append({
+            "index": t["index"],
+            "hash": manifest.text_hash(t["source"]),
+            "source": t["source"],
+            "translation": t["translation"],
+            "ok": t["ok"],
+            "score": result.get("score", 0.0),
+            "issues": result.get("issues", []),
+            "origin": result.get("origin", "api"),
+            "worker": t["worker"],
+        })
+    raw = "\n".join(t["source"] for t in tasks)
+    manifest.save(manifest.manifest_path(chapter), {"source_hash": manifest.text_hash(raw), "chunks": entries})
+
+    failed = sum(1 for e in entries if not e["ok"])
+    if catalog:
+        catalog.chapter_status(book, chapter, "failed" if failed else "done", len(entries))
+    if failed:
+        print(f"⚠️ {chapter}: {failed}/{len(entries)} chunks fail. Dobara enqueue karo, sirf wahi jayenge.")
+        return False
+
+    output_file = Path(output_dir) / f"{chapter}.md"
+    output_file.write_text("\n\n".join(e["translation"] for e in entries).strip(), encoding="utf-8")
+    print(f"📗 {chapter} ready ({len(entries)} chunks).")
+    return True
+
+
+def run_worker(broker, worker_id=None):
+    """
+    Queue se chunks lease karo jab tak kaam bacha hai. Har process controller.max_window threads chalata hai;
+    N machines = N guna workers. Lease heartbeat se zinda rehti hai; worker mara toh doosra utha lega.
+    """
+    config = load_config()
+    settings = {**QUEUE_DEFAULTS, **config.get("queue", {})}
+    worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+    output_dir = Path("data/output_books")
+    temp_dir = Path("data/temp")
+    output_dir.mkdir(parents=True, exist_ok=True)
+    temp_dir.mkdir(parents=True, exist_ok=True)
 
-            # Free tier cooldown (Rohit Sharma mode: Slow but steady)
-            time.sleep(4)
+    system_instruction = build_system_instruction(config)
+    caches = []
+    key_pool, controller, local_model = setup_backend(config, system_instruction, caches)
+    metrics.start_from_config(config)
+    tm_settings = {**TM_DEFAULTS, **config.get("translation_memory", {})}
+    tm = TranslationMemory() if tm_settings["enabled"] else None
+    # Worker ke paas poori book nahi hoti; rarity lambe words se (router.score_chunk)
+    route = setup_router(config, system_instruction, key_pool, controller, caches=caches)
+    index = setup_bitext(config)
+    catalog = open_catalog(config)
+
+    def loop(slot):
+        writer = PartialWriter(temp_dir / f"queue-{worker_id}-{slot}.partial.md")
+        done = 0
+        while not shutdown.requested():
+            task = broker.lease(worker_id, settings["lease_seconds"])
+            if task is None:
+                # Kuch chunks abhi doosre workers ke paas hain (ya pichle chunk ka wait) - thoda ruko
+                if not broker.has_work():
+                    return done
+                time.sleep(settings["poll_seconds"])
+                continue
 
-        # Final save jab saare chunks ho jayein
-        if final_output:
-            output_file.write_text(final_output.strip(), encoding="utf-8")
-            if temp_file.exists():
-                temp_file.unlink() # Temp file uda do
+            prev_o, prev_t = task["previous_original"], task["previous_translated"]
+            expected_ratio = len(prev_t) / len(prev_o) if prev_o and prev_t else 1.0
+            chunk_started = time.perf_counter()
+            # Shared block kisi aur chapter me pass ho chuka hai toh wahi translation (DedupPlan.get_or_translate jaisa)
+            shared = task["dedup_key"] and broker.shared_translation(task["book"], task["dedup_key"])
+            with broker.hold(task, settings["lease_seconds"]) as keeper:
+                if shared:
+                    translated, result = shared
+                    origin = "dedup"
+                    telemetry.incr("dedup_reused")
+                else:
+                    translated, result, origin = produce_chunk(
+                        key_pool, task["source"], task["index"], task["total"], prev_o[-1500:], prev_t[-1500:],
+                        controller, writer, config, tm, task["chapter"], expected_ratio, route,
+                    )
+
+            if not result["ok"] and shutdown.requested():
+                # Drain me adhoora chunk: lease turant wapas, doosra worker / restart utha lega
+                broker.release(task["id"], task["token"])
+                break
+
+            if keeper.lost or not broker.complete(task["id"], task["token"], translated, {**result, "origin": origin}):
+                # Lease kisi aur ke paas chali gayi; uska result hi maana jaayega
+                print(f"⚠️ {task['chapter']} #{task['index'] + 1}: lease chali gayi, result discard.")
+                continue
 
-    print("\n✅ MISSION ACCOMPLISHED. Saare books 'output_books' folder mein check kar le.")
+            done += 1
+            telemetry.incr("queue_chunks_done", worker=worker_id)
+            if index and result["ok"]:
+                index.add_chunk(task["book"], task["chapter"], task["index"], task["source"], translated)
+            if catalog:
+                catalog.record_chunk(task["book"], task["chapter"], task["index"], result["ok"], origin,
+                                     result.get("model"), estimate_tokens(task["source"]), estimate_tokens(translated),
+                                     time.perf_counter() - chunk_started)
+            assemble_chapter(broker, task["book"], task["chapter"], output_dir, catalog)
+            broker.publish()
+        return done
+
+    print(f"👷 Worker {worker_id}: {controller.max_window} threads, queue {broker.stats()}")
+    # Signal pe naye leases band; haath wale chunks complete karke nikalte hain
+    shutdown_settings = {**shutdown.DEFAULTS, **config.get("shutdown", {})}
+    with shutdown.guard(shutdown_settings["drain_seconds"]), ThreadPoolExecutor(max_workers=controller.max_window) as pool:
+        total = sum(pool.map(loop, range(controller.max_window)))
+
+    prompt_cache.report()
+    prompt_cache.release_all(caches)
+    telemetry.dump()
+    if shutdown.requested():
+        print(f"⏸️ Worker {worker_id}: drain ke baad band ({total} chunks kiye). Baaki queue me hai.")
+        return total
+    print(f"✅ Worker {worker_id}: {total} chunks translate kiye. Queue khatam.")
+    return total
 
 
 if __name__ == "__main__":
-    translate_book()
\ No newline at end of file
+    import argparse
+    parser = argparse.ArgumentParser(description="Raw text chapters ko translate karo")
+    parser.add_argument("--dry-run", action="store_true", help="Sirf time/cost ka andaza, koi API call nahi")
+    parser.add_argument("--finish-by", help="Deadline: '6h', '90m' ya '2026-10-20T18:00' (dry run ke saath)")
+    parser.add_argument("--keys", type=int, help="Dry run: provider ki itni keys maan ke hisaab (default: env se, warna 1)")
+    parser.add_argument("--enqueue", action="store_true", help="Bache chunks distributed queue me daalo")
+    parser.add_argument("--worker", action="store_true", help="Queue se chunks utha ke translate karo")
+    parser.add_argument("--queue", help="Broker URL (default: config 'queue.url')")
+    parser.add_argument("--worker-id", help="Worker ka naam (default: host-pid)")
+    parser.add_argument("--book", help="Book ka naam (queue, bilingual index, catalog). Default: catalog se / 'book'")
+    args = parser.parse_args()
+
+    if args.enqueue or args.worker:
+        queue_settings = {**QUEUE_DEFAULTS, **load_config().get("queue", {})}
+        broker = workqueue.get_broker(args.queue or queue_settings["url"], max_attempts=queue_settings["max_attempts"])
+        if args.enqueue:
+            enqueue_book(broker, args.book or "book")
+        if args.worker:
+            run_worker(broker, args.worker_id)
+    else:
+        try:
+            translate_book(dry_run=args.dry_run, finish_by=args.finish_by, book=args.book, keys=args.keys)
+        except shutdown.Cancelled:
+            pass
\ No newline at end of file
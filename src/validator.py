@@ -0,0 +1,143 @@
+import re
+import sys
+from pathlib import Path
+
+from src import manifest
+
+# -------------------------------
+# OFFLINE OUTPUT VALIDATOR
+# -------------------------------
+# Har chunk ki translation ko bina API call ke check karta hai:
+# script (Devanagari ratio), length ratio, prompt ka kachra, refusal, glossary.
+# Fail hua chunk manifest me "ok": false ke saath jaata hai aur agli run me sirf wahi dobara banta hai.
+DEFAULTS = {
+    "min_devanagari_ratio": 0.6,
+    "min_length_ratio": 0.5,
+    "max_length_ratio": 2.5,
+    "min_glossary_ratio": 0.8,
+    "max_attempts": 2,
+}
+
+# Humare prompt ke markers - output me aaye matlab model ne prompt echo kar diya
+SCAFFOLD_MARKERS = [
+    "---BEGIN---", "---END---",
+    "Previous Original Context", "Previous Translated Context",
+    "Now translate the following",
+    "Translation so far ends with", "Remaining source text",
+    "Translation Memory (", "EN: ",
+]
+
+REFUSAL_PATTERNS = re.compile(
+    r"\b(I cannot|I can't|I'm sorry|I am sorry|As an AI|I am unable|I'm unable)\b",
+    flags=re.IGNORECASE,
+)
+
+
+def devanagari_ratio(text):
+    # Matras (Mc/Mn) isalpha() nahi hote, isliye poora Devanagari block letter maana hai
+    deva = 0
+    letters = 0
+    for c in text:
+        if "ऀ" <= c <= "ॿ":
+            deva += 1
+            letters += 1
+        elif c.isalpha():
+            letters += 1
+    return deva / letters if letters else 0.0
+
+
+def glossary_compliance(source, translated, glossary):
+    """Source me jo glossary terms aaye, unka fixed translation output me hai ya nahi."""
+    expected = [(term, target) for term, target in glossary.items() if term.lower() in source.lower()]
+    if not expected:
+        return 1.0, []
+    missing = [term for term, target in expected if target not in translated]
+    return 1 - len(missing) / len(expected), missing
+
+
+def validate_chunk(source, translated, glossary=None, settings=None):
+    """
+    Return: {"ok": bool, "score": 0..1, "issues": [...], "metrics": {...}}
+    Koi bhi issue = ok False. Score sirf ranking ke liye hai; scaffolding/refusal pe seedha 0.
+    """
+    cfg = {**DEFAULTS, **(settings or {})}
+    issues = []
+    translated = translated or ""
+
+    if not translated.strip():
+        return {"ok": False, "score": 0.0, "issues": ["empty output"], "metrics": {}}
+
+    # 1. Script check
+    script = devanagari_ratio(translated)
+    script_score = min(1.0, script / cfg["min_devanagari_ratio"])
+    if script < cfg["min_devanagari_ratio"]:
+        issues.append(f"low devanagari ratio ({script:.2f})")
+
+    # 2. Length ratio
+    ratio = len(translated.strip()) / max(1, len(source.strip()))
+    if ratio < cfg["min_length_ratio"]:
+        length_score = ratio / cfg["min_length_ratio"]
+        issues.append(f"too short (ratio {ratio:.2f})")
+    elif ratio > cfg["max_length_ratio"]:
+        length_score = cfg["max_length_ratio"] / ratio
+        issues.append(f"too long (ratio {ratio:.2f})")
+    else:
+        length_score = 1.0
+
+    # 3. Prompt scaffolding leak + refusal (hard fail)
+    leaked = [m for m in SCAFFOLD_MARKERS if m in translated]
+    if leaked:
+        issues.append(f"prompt scaffolding leaked: {', '.join(leaked)}")
+    refusal = REFUSAL_PATTERNS.search(translated)
+    if refusal:
+        issues.append(f"refusal: '{refusal.group()}'")
+
+    # 4. Glossary
+    glossary_score, missing = glossary_compliance(source, translated, glossary or {})
+    if glossary_score < cfg["min_glossary_ratio"]:
+        issues.append(f"glossary terms missing: {', '.join(missing)}")
+
+    score = round(0.4 * script_score + 0.3 * length_score + 0.3 * glossary_score, 3)
+    hard_fail = bool(leaked or refusal)
+
+    return {
+        "ok": not issues,
+        "score": 0.0 if hard_fail else score,
+        "issues": issues,
+        "metrics": {
+            "devanagari_ratio": round(script, 3),
+            "length_ratio": round(ratio, 3),
+            "glossary_ratio": round(glossary_score, 3),
+        },
+    }
+
+
+# -------------------------------
+# RE-VALIDATE (glossary/threshold badalne ke baad)
+# -------------------------------
+def revalidate(manifest_dir=manifest.MANIFEST_DIR, glossary=None, settings=None):
+    """
+    Saare manifests dobara score karo. Jo chunk ab fail hai use "ok": false kar do,
+    taaki translate_book() agli baar sirf wahi chunks dobara bheje.
+    """
+    failing = 0
+    for path in sorted(Path(manifest_dir).glob("*.json")):
+        data = manifest.load(path)
+        for entry in data.get("chunks", []):
+            if entry.get("translation") is None:
+                continue
+            result = validate_chunk(entry["source"], entry["translation"], glossary, settings)
+            entry.update(ok=result["ok"], score=result["score"], issues=result["issues"])
+            if not result["ok"]:
+                failing += 1
+                print(f"🚩 {path.stem} #{entry['index'] + 1}: {', '.join(result['issues'])}")
+        manifest.save(path, data)
+    print(f"📋 Re-validation done. Failing chunks: {failing}")
+    return failing
+
+
+if __name__ == "__main__":
+    import json
+    config = json.loads(Path("config/prompts.json").read_text(encoding="utf-8"))
+    bad = revalidate(glossary=config.get("glossary"), settings=config.get("validation"))
+    sys.exit(1 if bad else 0)
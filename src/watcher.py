@@ -0,0 +1,139 @@
+import json
+import time
+import hashlib
+import threading
+from pathlib import Path
+
+from src import telemetry
+
+# -------------------------------
+# WATCH-FOLDER DAEMON
+# -------------------------------
+# data/input_pdfs me PDF daalo, baaki kaam apne aap: naya ya badla hua PDF service ke
+# JobStore me job ban jaata hai (wahi global max_jobs limit lagti hai).
+# Linux pe inotify (inotify_simple install ho toh), warna polling.
+# Debounce: file ka size+mtime settle_seconds tak na badle tabhi uthate hain,
+# taaki aadha copy hua PDF pipeline me na jaaye.
+WATCH_STATE = Path("data/watch_state.json")
+
+DEFAULTS = {
+    "folder": "data/input_pdfs",
+    "settle_seconds": 5,
+    "poll_seconds": 2,
+}
+
+
+def file_sha(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _inotify(folder):
+    try:
+        from inotify_simple import INotify, flags
+    except ImportError:
+        return None
+    watcher = INotify()
+    watcher.add_watch(str(folder), flags.CLOSE_WRITE | flags.MOVED_TO | flags.CREATE | flags.MODIFY)
+    return watcher
+
+
+class FolderWatcher:
+    def __init__(self, store, folder=DEFAULTS["folder"], settle_seconds=DEFAULTS["settle_seconds"],
+                 poll_seconds=DEFAULTS["poll_seconds"], state_path=WATCH_STATE):
+        self.store = store
+        self.folder = Path(folder)
+        self.folder.mkdir(parents=True, exist_ok=True)
+        self.settle_seconds = settle_seconds
+        self.poll_seconds = poll_seconds
+        self.state_path = Path(state_path)
+        self.state = json.loads(self.state_path.read_text(encoding="utf-8")) if self.state_path.exists() else {}
+        self._seen = {}   # name -> ((size, mtime), pehli baar kab dikha)
+        self._stop = threading.Event()
+
+    def _save_state(self):
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.state_path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(self.state, indent=2), encoding="utf-8")
+        tmp.replace(self.state_path)
+
+    def _settled(self, path, now):
+        """Size/mtime settle_seconds se same hai? Tabhi file poori copy hui maanenge."""
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            self._seen.pop(path.name, None)
+            return False
+        snapshot = (stat.st_size, stat.st_mtime)
+        previous = self._seen.get(path.name)
+        if previous is None or previous[0] != snapshot:
+            self._seen[path.name] = (snapshot, now)
+            return False
+        return stat.st_size > 0 and now - previous[1] >= self.settle_seconds
+
+    def scan(self, now=None):
+        """Ek pass: settle ho chuke naye/badle PDFs ko job bana do. Return: naye job ids."""
+        now = now or time.time()
+        submitted = []
+        for path in sorted(self.folder.glob("*.pdf")):
+            if not self._settled(path, now):
+                continue
+            sha = file_sha(path)
+            if self.state.get(path.name, {}).get("sha") == sha:
+                continue
+
+            data = path.read_bytes()
+            if not data.startswith(b"%PDF"):
+                print(f"⚠️ {path.name} PDF nahi lagti, skip.")
+                self.state[path.name] = {"sha": sha, "job": None}
+                self._save_state()
+                continue
+
+            job = self.store.submit(data, path.name, path.stem)
+            self.state[path.name] = {"sha": sha, "job": job["id"]}
+            self._save_state()
+            self._seen.pop(path.name, None)
+            telemetry.incr("watch_jobs_submitted")
+            print(f"👀 {path.name} -> job {job['id']}")
+            submitted.append(job["id"])
+        return submitted
+
+    def run(self):
+        notify = _inotify(self.folder)
+        print(f"👀 Watching {self.folder} ({'inotify' if notify else 'polling'}, settle {self.settle_seconds}s)")
+        while not self._stop.is_set():
+            if notify:
+                # Event aaye ya timeout - dono me scan; settle check ke liye timeout zaroori hai
+                notify.read(timeout=int(self.poll_seconds * 1000))
+            else:
+                self._stop.wait(self.poll_seconds)
+            self.scan()
+        if notify:
+            notify.close()
+
+    def start(self):
+        thread = threading.Thread(target=self.run, name="watcher", daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self):
+        self._stop.set()
+
+
+if __name__ == "__main__":
+    # python -m src.watcher  -> sirf daemon (HTTP ke bina); jobs data/jobs/<id>/ me banenge
+    from src.service import JobStore, DEFAULTS as SERVICE_DEFAULTS
+    from src.translator import load_config
+
+    config = load_config()
+    service_settings = {**SERVICE_DEFAULTS, **config.get("service", {})}
+    settings = {**DEFAULTS, **config.get("watch", {})}
+    store = JobStore(service_settings["jobs_dir"], service_settings["max_jobs"])
+    watcher = FolderWatcher(store, settings["folder"], settings["settle_seconds"], settings["poll_seconds"])
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        print("\n🛑 Watcher band.")
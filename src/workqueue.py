@@ -0,0 +1,433 @@
+import abc
+import json
+import time
+import uuid
+import sqlite3
+import threading
+from pathlib import Path
+
+from src import telemetry, manifest
+
+# -------------------------------
+# DISTRIBUTED CHUNK QUEUE
+# -------------------------------
+# Ek book, kai workers (kai machines bhi). Har chunk ek task hai:
+# worker lease leta hai (TTL ke saath), beech me heartbeat bhejta hai, aur result commit karta hai.
+# Worker mar gaya toh lease expire hoke task wapas pending - koi chunk gum nahi hota.
+# Commit sirf wahi worker kar sakta hai jiske paas current lease token hai (fencing),
+# isliye late aaya purana worker doosri baar result nahi likh sakta.
+#
+# Chapter ke andar order: chunk tabhi milta hai jab pichla chunk done ho (translated context ke liye).
+# Parallelism chapters ke across hai - jaise translate_book() me.
+#
+# Dedup (dedup.DedupPlan) bhi queue me: shared block ka task dedup_key ke saath aata hai.
+# Same key ka ek task leased ho toh baaki ruk jaate hain; done (ok) ho gaya toh unki translation wahi.
+QUEUE_PATH = Path("data/queue.sqlite")
+
+DEFAULTS = {
+    "lease_seconds": 120,    # itni der heartbeat na aaye toh lease expire
+    "max_attempts": 5,       # itni baar lease expire = chunk fail maan lo
+}
+
+
+class Broker(abc.ABC):
+    """
+    Broker interface. SQLiteBroker (single node, file lock) aur MemoryBroker (same process)
+    dono yahi methods dete hain; koi aur backend (Redis, HTTP) bhi isi shape me plug ho sakta hai.
+    """
+
+    @abc.abstractmethod
+    def enqueue(self, book, chapter, chunks, dedup_keys=None):
+        """dedup_keys: chunks ke barabar list, shared block ka passage_key warna None."""
+
+    @abc.abstractmethod
+    def lease(self, worker, ttl):
+        """Agla ready task (pichla chunk done, same dedup_key kisi aur ke paas nahi) ya None."""
+
+    @abc.abstractmethod
+    def heartbeat(self, task_id, token, ttl):
+        pass
+
+    @abc.abstractmethod
+    def complete(self, task_id, token, translation, result):
+        pass
+
+    @abc.abstractmethod
+    def release(self, task_id, token):
+        """Lease wapas (shutdown/drain): task turant pending, attempt gina nahi jaata."""
+
+    @abc.abstractmethod
+    def shared_translation(self, book, dedup_key):
+        """Same dedup_key ka pass hua task: (translation, result) ya None."""
+
+    @abc.abstractmethod
+    def chapter_tasks(self, book, chapter):
+        pass
+
+    @abc.abstractmethod
+    def stats(self):
+        pass
+
+    # --- helpers (sab backends ke liye same) ---
+    def hold(self, task, ttl, interval=None):
+        return LeaseKeeper(self, task, ttl, interval)
+
+    def has_work(self):
+        counts = self.stats()
+        return counts.get("pending", 0) + counts.get("leased", 0) > 0
+
+    def publish(self):
+        for status, count in self.stats().items():
+            telemetry.set_gauge("queue_tasks", count, status=status)
+
+
+class LeaseKeeper:
+    """Chunk translate hote waqt background me heartbeat; lease chhin gayi toh .lost = True."""
+
+    def __init__(self, broker, task, ttl, interval=None):
+        self.broker = broker
+        self.task = task
+        self.ttl = ttl
+        self.interval = interval or max(1.0, ttl / 3)
+        self.lost = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._beat, daemon=True)
+
+    def _beat(self):
+        while not self._stop.wait(self.interval):
+            if not self.broker.heartbeat(self.task["id"], self.task["token"], self.ttl):
+                self.lost = True
+                telemetry.incr("queue_leases_lost")
+                return
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        return False
+
+
+# -------------------------------
+# SQLITE BROKER (single node, kai processes)
+# -------------------------------
+class SQLiteBroker(Broker):
+    def __init__(self, path=QUEUE_PATH, max_attempts=DEFAULTS["max_attempts"]):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        # isolation_level=None: transactions hum khud BEGIN IMMEDIATE se chalate hain
+        self.db = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS tasks (
+                id INTEGER PRIMARY KEY,
+                book TEXT,
+                chapter TEXT,
+                idx INTEGER,
+                total INTEGER,
+                hash TEXT,
+                source TEXT,
+                status TEXT DEFAULT 'pending',
+                worker TEXT,
+                token TEXT,
+                lease_until REAL,
+                attempts INTEGER DEFAULT 0,
+                ok INTEGER,
+                translation TEXT,
+                result TEXT,
+                dedup_key TEXT,
+                UNIQUE(book, chapter, idx)
+            );
+            CREATE INDEX IF NOT EXISTS tasks_status ON tasks(status, book, chapter, idx);
+            """
+        )
+        # Purani queue file (dedup_key se pehle ki)
+        if "dedup_key" not in [row[1] for row in self.db.execute("PRAGMA table_info(tasks)")]:
+            self.db.execute("ALTER TABLE tasks ADD COLUMN dedup_key TEXT")
+        self.db.execute("CREATE INDEX IF NOT EXISTS tasks_dedup ON tasks(book, dedup_key, status)")
+
+    def _tx(self):
+        return _Transaction(self.db, self._lock)
+
+    def enqueue(self, book, chapter, chunks, dedup_keys=None):
+        """Naye chunks daalo; source badla ya pichli baar fail hua toh task reset."""
+        dedup_keys = dedup_keys or [None] * len(chunks)
+        added = 0
+        with self._tx() as db:
+            for idx, (chunk, key) in enumerate(zip(chunks, dedup_keys)):
+                digest = manifest.text_hash(chunk)
+                row = db.execute(
+                    "SELECT hash, status, ok FROM tasks WHERE book = ? AND chapter = ? AND idx = ?",
+                    (book, chapter, idx),
+                ).fetchone()
+                if row is None:
+                    db.execute(
+                        "INSERT INTO tasks (book, chapter, idx, total, hash, source, dedup_key) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (book, chapter, idx, len(chunks), digest, chunk, key),
+                    )
+                    added += 1
+                elif row[0] != digest or (row[1] == "done" and not row[2]):
+                    db.execute(
+                        "UPDATE tasks SET total = ?, hash = ?, source = ?, dedup_key = ?, status = 'pending', "
+                        "worker = NULL, token = NULL, attempts = 0, ok = NULL, translation = NULL, result = NULL "
+                        "WHERE book = ? AND chapter = ? AND idx = ?",
+                        (len(chunks), digest, chunk, key, book, chapter, idx),
+                    )
+                    added += 1
+                else:
+                    db.execute("UPDATE tasks SET dedup_key = ? WHERE book = ? AND chapter = ? AND idx = ?",
+                               (key, book, chapter, idx))
+            # Chapter chhota ho gaya ho toh purane extra chunks hata do
+            db.execute("DELETE FROM tasks WHERE book = ? AND chapter = ? AND idx >= ?", (book, chapter, len(chunks)))
+        return added
+
+    def _reclaim(self, db, now):
+        expired = db.execute(
+            "SELECT id, attempts FROM tasks WHERE status = 'leased' AND lease_until < ?", (now,)
+        ).fetchall()
+        for task_id, attempts in expired:
+            telemetry.incr("queue_leases_reclaimed")
+            if attempts >= self.max_attempts:
+                db.execute(
+                    "UPDATE tasks SET status = 'done', ok = 0, token = NULL, result = ? WHERE id = ?",
+                    (json.dumps({"ok": False, "score": 0.0, "issues": ["lease expired too many times"]}), task_id),
+                )
+            else:
+                db.execute("UPDATE tasks SET status = 'pending', worker = NULL, token = NULL WHERE id = ?", (task_id,))
+
+    def lease(self, worker, ttl=DEFAULTS["lease_seconds"]):
+        now = time.time()
+        with self._tx() as db:
+            self._reclaim(db, now)
+            row = db.execute(
+                """
+                SELECT t.id, t.book, t.chapter, t.idx, t.total, t.source, p.source, p.translation, p.ok, t.dedup_key
+                FROM tasks t
+                LEFT JOIN tasks p ON p.book = t.book AND p.chapter = t.chapter AND p.idx = t.idx - 1
+                WHERE t.status = 'pending' AND (p.id IS NULL OR p.status = 'done')
+                  AND (t.dedup_key IS NULL OR NOT EXISTS (
+                      SELECT 1 FROM tasks s WHERE s.book = t.book AND s.dedup_key = t.dedup_key AND s.status = 'leased'))
+                ORDER BY t.attempts, t.book, t.chapter, t.idx
+                LIMIT 1
+                """
+            ).fetchone()
+            if row is None:
+                return None
+            token = uuid.uuid4().hex
+            db.execute(
+                "UPDATE tasks SET status = 'leased', worker = ?, token = ?, lease_until = ?, attempts = attempts + 1 WHERE id = ?",
+                (worker, token, now + ttl, row[0]),
+            )
+        return _task(row, token)
+
+    def heartbeat(self, task_id, token, ttl=DEFAULTS["lease_seconds"]):
+        with self._tx() as db:
+            cur = db.execute(
+                "UPDATE tasks SET lease_until = ? WHERE id = ? AND token = ? AND status = 'leased'",
+                (time.time() + ttl, task_id, token),
+            )
+            return cur.rowcount == 1
+
+    def complete(self, task_id, token, translation, result):
+        with self._tx() as db:
+            cur = db.execute(
+                "UPDATE tasks SET status = 'done', token = NULL, ok = ?, translation = ?, result = ? "
+                "WHERE id = ? AND token = ? AND status = 'leased'",
+                (1 if result["ok"] else 0, translation, json.dumps(result, ensure_ascii=False), task_id, token),
+            )
+            return cur.rowcount == 1
+
+    def release(self, task_id, token):
+        with self._tx() as db:
+            cur = db.execute(
+                "UPDATE tasks SET status = 'pending', worker = NULL, token = NULL, attempts = MAX(attempts - 1, 0) "
+                "WHERE id = ? AND token = ? AND status = 'leased'",
+                (task_id, token),
+            )
+            return cur.rowcount == 1
+
+    def shared_translation(self, book, dedup_key):
+        with self._lock:
+            row = self.db.execute(
+                "SELECT translation, result FROM tasks WHERE book = ? AND dedup_key = ? AND status = 'done' AND ok = 1 "
+                "LIMIT 1",
+                (book, dedup_key),
+            ).fetchone()
+        return (row[0], json.loads(row[1])) if row else None
+
+    def chapter_tasks(self, book, chapter):
+        with self._lock:
+            rows = self.db.execute(
+                "SELECT idx, total, source, status, ok, translation, result, worker FROM tasks "
+                "WHERE book = ? AND chapter = ? ORDER BY idx",
+                (book, chapter),
+            ).fetchall()
+        return [
+            {"index": r[0], "total": r[1], "source": r[2], "status": r[3], "ok": bool(r[4]),
+             "translation": r[5], "result": json.loads(r[6]) if r[6] else None, "worker": r[7]}
+            for r in rows
+        ]
+
+    def stats(self):
+        with self._lock:
+            return dict(self.db.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status").fetchall())
+
+
+class _Transaction:
+    # BEGIN IMMEDIATE = write lock pehle hi; do processes ek hi task lease nahi kar sakte
+    def __init__(self, db, lock):
+        self.db = db
+        self.lock = lock
+
+    def __enter__(self):
+        self.lock.acquire()
+        self.db.execute("BEGIN IMMEDIATE")
+        return self.db
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self.db.execute("ROLLBACK" if exc_type else "COMMIT")
+        finally:
+            self.lock.release()
+        return False
+
+
+def _task(row, token):
+    return {
+        "id": row[0], "book": row[1], "chapter": row[2], "index": row[3], "total": row[4],
+        "source": row[5], "token": token, "dedup_key": row[9],
+        # Pichla chunk fail hua tha toh uska translation context me nahi jaata (translate_chapter jaisa)
+        "previous_original": row[6] or "",
+        "previous_translated": (row[7] or "") if row[8] else "",
+    }
+
+
+# -------------------------------
+# MEMORY BROKER (local stand-in, ek process)
+# -------------------------------
+class MemoryBroker(Broker):
+    def __init__(self, max_attempts=DEFAULTS["max_attempts"]):
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self._tasks = {}   # (book, chapter, idx) -> dict
+        self._next_id = 1
+
+    def enqueue(self, book, chapter, chunks, dedup_keys=None):
+        dedup_keys = dedup_keys or [None] * len(chunks)
+        added = 0
+        with self._lock:
+            for idx, (chunk, dedup_key) in enumerate(zip(chunks, dedup_keys)):
+                key = (book, chapter, idx)
+                old = self._tasks.get(key)
+                digest = manifest.text_hash(chunk)
+                if old and old["hash"] == digest and not (old["status"] == "done" and not old["ok"]):
+                    old["dedup_key"] = dedup_key
+                    continue
+                self._tasks[key] = {
+                    "id": old["id"] if old else self._next_id, "book": book, "chapter": chapter, "index": idx,
+                    "total": len(chunks), "hash": digest, "source": chunk, "status": "pending", "worker": None,
+                    "token": None, "lease_until": 0.0, "attempts": 0, "ok": False, "translation": None, "result": None,
+                    "dedup_key": dedup_key,
+                }
+                if not old:
+                    self._next_id += 1
+                added += 1
+            for key in [k for k in self._tasks if k[:2] == (book, chapter) and k[2] >= len(chunks)]:
+                del self._tasks[key]
+        return added
+
+    def _by_id(self, task_id):
+        return next((t for t in self._tasks.values() if t["id"] == task_id), None)
+
+    def lease(self, worker, ttl=DEFAULTS["lease_seconds"]):
+        now = time.time()
+        with self._lock:
+            for task in self._tasks.values():
+                if task["status"] == "leased" and task["lease_until"] < now:
+                    telemetry.incr("queue_leases_reclaimed")
+                    if task["attempts"] >= self.max_attempts:
+                        task.update(status="done", ok=False, token=None,
+                                    result={"ok": False, "score": 0.0, "issues": ["lease expired too many times"]})
+                    else:
+                        task.update(status="pending", worker=None, token=None)
+
+            busy = {(t["book"], t["dedup_key"]) for t in self._tasks.values()
+                    if t["status"] == "leased" and t["dedup_key"]}
+            ready = []
+            for (book, chapter, idx), task in self._tasks.items():
+                prev = self._tasks.get((book, chapter, idx - 1))
+                if (task["status"] == "pending" and (prev is None or prev["status"] == "done")
+                        and (book, task["dedup_key"]) not in busy):
+                    ready.append((task["attempts"], book, chapter, idx))
+            if not ready:
+                return None
+
+            _, book, chapter, idx = min(ready)
+            task = self._tasks[(book, chapter, idx)]
+            prev = self._tasks.get((book, chapter, idx - 1))
+            token = uuid.uuid4().hex
+            task.update(status="leased", worker=worker, token=token, lease_until=now + ttl, attempts=task["attempts"] + 1)
+            row = (task["id"], book, chapter, idx, task["total"], task["source"],
+                   prev and prev["source"], prev and prev["translation"], prev and prev["ok"], task["dedup_key"])
+        return _task(row, token)
+
+    def heartbeat(self, task_id, token, ttl=DEFAULTS["lease_seconds"]):
+        with self._lock:
+            task = self._by_id(task_id)
+            if not task or task["status"] != "leased" or task["token"] != token:
+                return False
+            task["lease_until"] = time.time() + ttl
+            return True
+
+    def complete(self, task_id, token, translation, result):
+        with self._lock:
+            task = self._by_id(task_id)
+            if not task or task["status"] != "leased" or task["token"] != token:
+                return False
+            task.update(status="done", token=None, ok=bool(result["ok"]), translation=translation, result=result)
+            return True
+
+    def release(self, task_id, token):
+        with self._lock:
+            task = self._by_id(task_id)
+            if not task or task["status"] != "leased" or task["token"] != token:
+                return False
+            task.update(status="pending", worker=None, token=None, attempts=max(task["attempts"] - 1, 0))
+            return True
+
+    def shared_translation(self, book, dedup_key):
+        with self._lock:
+            for task in self._tasks.values():
+                if task["book"] == book and task["dedup_key"] == dedup_key and task["status"] == "done" and task["ok"]:
+                    return task["translation"], task["result"]
+        return None
+
+    def chapter_tasks(self, book, chapter):
+        with self._lock:
+            tasks = sorted((t for k, t in self._tasks.items() if k[:2] == (book, chapter)), key=lambda t: t["index"])
+            return [
+                {key: t[key] for key in ("index", "total", "source", "status", "ok", "translation", "result", "worker")}
+                for t in tasks
+            ]
+
+    def stats(self):
+        counts = {}
+        with self._lock:
+            for task in self._tasks.values():
+                counts[task["status"]] = counts.get(task["status"], 0) + 1
+        return counts
+
+
+def get_broker(url="sqlite:///" + str(QUEUE_PATH), **settings):
+    """'sqlite:///data/queue.sqlite' ya 'memory://' (tests / ek process)."""
+    if url.startswith("memory://"):
+        return MemoryBroker(**settings)
+    if url.startswith("sqlite:///"):
+        return SQLiteBroker(url[len("sqlite:///"):], **settings)
+    raise ValueError(f"❌ Unknown queue broker: {url}")
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Tests repo root se "from src import ..." karte hain (jaise main.py)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
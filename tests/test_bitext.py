@@ -0,0 +1,57 @@
+from src.bitext import BilingualIndex, align_chunk, align_sentences, split_sentences
+
+
+def test_split_sentences_handles_purn_viram():
+    assert split_sentences("वह आया। फिर गया! क्यों?") == ["वह आया।", "फिर गया!", "क्यों?"]
+    assert split_sentences('He said "go." Then left.') == ['He said "go."', "Then left."]
+
+
+def test_align_one_to_one():
+    src = ["The sun rose.", "Bilbo woke up late that morning.", "He was hungry."]
+    tgt = ["सूरज निकला।", "उस सुबह बिल्बो देर से उठा।", "उसे भूख लगी थी।"]
+    assert align_sentences(src, tgt) == list(zip(src, tgt))
+
+
+def test_align_merges_two_to_one():
+    src = ["He ran.", "He ran fast through the long dark tunnel under the mountain.", "Done."]
+    tgt = ["वह पहाड़ के नीचे लंबी अंधेरी सुरंग से तेज़ी से भागा और भागता रहा।", "खत्म।"]
+    pairs = align_sentences(src, tgt)
+    assert pairs[-1] == ("Done.", "खत्म।")
+    assert pairs[0][0] == "He ran. He ran fast through the long dark tunnel under the mountain."
+
+
+def test_align_empty_side():
+    assert align_sentences(["Only source."], []) == [("Only source.", "")]
+
+
+def test_align_chunk_falls_back_when_paragraphs_differ():
+    pairs = align_chunk("One. Two.\nThree.", "एक। दो। तीन।")
+    assert [s for s, _ in pairs] and all(t for _, t in pairs)
+
+
+def test_fts_search_devanagari_words_whole(tmp_path):
+    index = BilingualIndex(tmp_path / "bitext.sqlite")
+    index.add_chunk("hobbit", "ch01", 0, "He lived in a hole. It was comfortable.",
+                    "वह एक बिल में रहता था। वह आरामदायक था।")
+    index.add_chunk("hobbit", "ch02", 0, "The dragon slept.", "ड्रैगन सो रहा था।")
+
+    hits = index.search("बिल में")
+    assert len(hits) == 1
+    assert hits[0]["source"] == "He lived in a hole."
+    assert hits[0]["match"] == "वह एक [बिल में] रहता था।"
+
+    # Matra tokenizer ne nahi toda: "म" akela match nahi hota
+    assert index.search("म") == []
+    assert index.search("dragon")[0]["target"] == "ड्रैगन सो रहा था।"
+    assert index.search("hole", book="other") == []
+    index.close()
+
+
+def test_add_chunk_skips_unchanged_and_replaces_changed(tmp_path):
+    index = BilingualIndex(tmp_path / "bitext.sqlite")
+    assert index.add_chunk("b", "c", 0, "Hello.", "नमस्ते।")
+    assert not index.add_chunk("b", "c", 0, "Hello.", "नमस्ते।")
+    assert index.add_chunk("b", "c", 0, "Hello.", "नमस्कार।")
+    assert index.stats() == {"books": 1, "chunks": 1, "sentences": 1}
+    assert index.search("नमस्ते") == []
+    index.close()
@@ -0,0 +1,49 @@
+from src.catalog import Catalog
+
+
+def chapter(name, words):
+    return {"filename": f"{name}.txt", "title": name.upper(), "word_count": words, "tokens": words * 2, "pages": [1, 2]}
+
+
+def test_progress_counts_chapters_chunks_and_artifacts(tmp_path):
+    catalog = Catalog(tmp_path / "catalog.sqlite")
+    catalog.record_extraction("hobbit", "hobbit.pdf", tmp_path / "raw", [chapter("ch01", 100), chapter("ch02", 50)], 1.5)
+    catalog.start_translation("hobbit", tmp_path / "out")
+    catalog.chapter_status("hobbit", "ch01", "done", 2)
+    catalog.chapter_status("hobbit", "ch02", "failed", 1)
+    catalog.record_chunk("hobbit", "ch01", 0, True, "api", "m", 10, 20, 1.0)
+    catalog.record_chunk("hobbit", "ch01", 1, True, "api", "m", 10, 20, 1.0)
+    catalog.record_chunk("hobbit", "ch02", 0, False, "api", "m", 5, 0, 0.5)
+    artifact = tmp_path / "hobbit.epub"
+    artifact.write_bytes(b"epub")
+    catalog.record_artifact("hobbit", "epub", artifact, 0.2)
+
+    [item] = catalog.progress("hobbit")
+    assert item["status"] == "translating"
+    assert (item["chapters"], item["words"], item["tokens"]) == (2, 150, 300)
+    assert (item["chapters_done"], item["chunks_total"]) == (1, 3)
+    assert (item["chunks_done"], item["chunks_failed"]) == (2, 1)
+    assert (item["tokens_in"], item["tokens_out"]) == (25, 40)
+    assert item["artifacts"] == ["epub"]
+    catalog.close()
+
+
+def test_manifest_chunk_does_not_overwrite_recorded_one(tmp_path):
+    catalog = Catalog(tmp_path / "catalog.sqlite")
+    catalog.start_translation("b", tmp_path / "out")
+    catalog.record_chunk("b", "c", 0, True, "api", "m", 10, 20, 3.0)
+    catalog.record_chunk("b", "c", 0, True, "manifest")
+    catalog.chapter_status("b", "c", "done", 1)
+    [item] = catalog.progress()
+    assert (item["tokens_in"], item["chunk_seconds"]) == (10, 3.0)
+    catalog.close()
+
+
+def test_progress_empty_book_and_resolve(tmp_path):
+    catalog = Catalog(tmp_path / "catalog.sqlite")
+    catalog.start_translation("empty", tmp_path / "out")
+    [item] = catalog.progress()
+    assert (item["chunks_done"], item["chunks_failed"], item["artifacts"]) == (0, 0, [])
+    assert catalog.resolve(tmp_path / "out") == "empty"
+    assert catalog.resolve(tmp_path / "nowhere") is None
+    catalog.close()
@@ -0,0 +1,63 @@
+from src.dedup import DedupPlan, passage_key
+
+
+SONG = "Far over the misty mountains cold\nTo dungeons deep and caverns old"
+
+
+def chapters():
+    return {
+        "ch01": f"The dwarves began to sing in the dark.\n{SONG}\nBilbo listened for a long while.",
+        "ch02": f"Later, by the fire, they sang again.\n{SONG}\nThe fire burned low and red.",
+        "ch03": "Nothing repeated in this chapter at all, only plain narration.",
+    }
+
+
+def chunker(text):
+    return [text]
+
+
+def test_passage_key_ignores_case_punctuation_whitespace():
+    assert passage_key("Far over,  the Misty\nmountains!") == passage_key("far over the misty mountains")
+    assert passage_key("far over") != passage_key("far under")
+
+
+def test_repeated_block_becomes_own_chunk():
+    plan = DedupPlan(chapters())
+    assert len(plan.blocks) == 1
+    chunks = plan.split(chapters()["ch01"], chunker)
+    assert chunks == ["The dwarves began to sing in the dark.", SONG, "Bilbo listened for a long while."]
+    assert plan.is_shared(SONG)
+
+
+def test_plan_stable_across_runs_and_pending_subsets():
+    # Resume run me chapters wahi; chunks aur keys byte-for-byte same (manifest reuse)
+    first = DedupPlan(chapters())
+    second = DedupPlan(chapters())
+    assert first.blocks == second.blocks
+    for name, text in chapters().items():
+        assert first.split(text, chunker) == second.split(text, chunker)
+
+    # Sirf ek chapter se plan banao toh song shared nahi dikhta - isliye plan poori book se
+    partial = DedupPlan({"ch02": chapters()["ch02"]})
+    assert partial.split(chapters()["ch02"], chunker) != first.split(chapters()["ch02"], chunker)
+
+
+def test_short_paragraphs_not_deduped():
+    plan = DedupPlan({"a": "Yes.\nNo.", "b": "Yes.\nNo."})
+    assert plan.blocks == {}
+
+
+def test_get_or_translate_reuses_only_ok_outcomes():
+    plan = DedupPlan(chapters())
+    calls = []
+
+    def translate(result):
+        def run():
+            calls.append(result)
+            return result
+        return run
+
+    assert plan.get_or_translate(SONG, translate(None), bool) == (None, False)
+    assert plan.get_or_translate(SONG, translate("गीत"), bool) == ("गीत", False)
+    assert plan.get_or_translate(SONG, translate("dobara"), bool) == ("गीत", True)
+    assert calls == [None, "गीत"]
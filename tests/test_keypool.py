@@ -0,0 +1,88 @@
+import time
+
+import pytest
+
+from src.keypool import KeyPool, retry_after_seconds
+
+
+def make_pool(**settings):
+    return KeyPool("test", [("K1", "secret-1"), ("K2", "secret-2")], **settings)
+
+
+def test_round_robin_across_keys():
+    pool = make_pool()
+    assert [pool.acquire().label for _ in range(4)] == ["K1", "K2", "K1", "K2"]
+
+
+def test_rate_limit_sets_cooldown_without_parking():
+    pool = make_pool(cooldown=30, park_after=1)
+    key = pool.keys[0]
+    assert pool.report_rate_limit(key) == 30
+    assert key.cooldown_until > time.monotonic() + 25
+    assert key.parked_until == 0.0
+    assert key.failures == 0
+    assert pool.active_count() == 2
+    # Cooldown wali key skip
+    assert pool.acquire().label == "K2"
+
+
+def test_rate_limit_uses_provider_retry_after():
+    pool = make_pool(cooldown=30)
+    key = pool.keys[0]
+    assert pool.report_rate_limit(key, retry_after=2.5) == 2.5
+    assert key.cooldown_until < time.monotonic() + 3
+
+
+def test_repeated_failures_park_key():
+    pool = make_pool(park_after=3, park_seconds=900)
+    key = pool.keys[0]
+    for _ in range(2):
+        pool.report_failure(key)
+    assert key.parked_until == 0.0
+    pool.report_failure(key)
+    assert key.parked_until > time.monotonic() + 800
+    assert key.failures == 0
+    assert pool.active_count() == 1
+
+
+def test_success_resets_failures():
+    pool = make_pool(park_after=2)
+    key = pool.keys[0]
+    pool.report_failure(key)
+    pool.report_success(key)
+    pool.report_failure(key)
+    assert key.parked_until == 0.0
+
+
+def test_rpm_limit_waits_for_other_key():
+    pool = make_pool(rpm=1)
+    assert pool.acquire().label == "K1"
+    assert pool.acquire().label == "K2"
+    assert pool.keys[0].ready_at(time.monotonic(), 1) > time.monotonic() + 50
+
+
+def test_empty_pool_rejected():
+    with pytest.raises(ValueError):
+        KeyPool("test", [])
+
+
+class _Response:
+    def __init__(self, headers):
+        self.headers = headers
+
+
+class _Error(Exception):
+    def __init__(self, message, headers=None):
+        super().__init__(message)
+        self.response = _Response(headers or {})
+
+
+@pytest.mark.parametrize("error, expected", [
+    (_Error("429", {"retry-after": "12"}), 12.0),
+    (_Error("Rate limit reached. Please try again in 750ms."), 0.75),
+    (_Error("429 RESOURCE_EXHAUSTED retry_delay { seconds: 23 }"), 23.0),
+    (_Error("Please retry in 23.5s."), 23.5),
+    (_Error("429 Too Many Requests"), None),
+])
+def test_retry_after_seconds(error, expected):
+    assert retry_after_seconds(error) == expected
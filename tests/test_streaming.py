@@ -0,0 +1,46 @@
+from src.streaming import PartialWriter, looks_truncated, untranslated_tail
+
+
+SOURCE = "\n".join(f"Paragraph {n} has a few plain sentences. It ends here." for n in range(20))
+
+
+def test_truncated_by_finish_reason():
+    assert looks_truncated(SOURCE, SOURCE, "length")
+    assert looks_truncated(SOURCE, SOURCE, "MAX_TOKENS")
+
+
+def test_truncated_by_length_ratio():
+    assert looks_truncated(SOURCE, SOURCE[:100], "stop")
+    assert not looks_truncated(SOURCE, SOURCE, "stop")
+    assert not looks_truncated(SOURCE, SOURCE, None)
+
+
+def test_tail_starts_at_boundary_and_keeps_end():
+    half = "x" * (len(SOURCE) // 2)
+    tail = untranslated_tail(SOURCE, half, overlap_chars=50)
+    assert SOURCE.endswith(tail)
+    assert tail.startswith("Paragraph") or tail.startswith("It ends")
+    assert len(tail) < len(SOURCE)
+
+
+def test_tail_respects_expected_ratio():
+    translated = "x" * 400
+    plain = untranslated_tail(SOURCE, translated, expected_ratio=1.0, overlap_chars=0)
+    wordy = untranslated_tail(SOURCE, translated, expected_ratio=2.0, overlap_chars=0)
+    # Hindi lambi ho toh utne hi output me source kam cover hua
+    assert len(wordy) > len(plain)
+
+
+def test_tail_with_nothing_translated_is_whole_source():
+    assert untranslated_tail(SOURCE, "") == SOURCE.strip()
+
+
+def test_partial_writer_drops_unfinished_stream(tmp_path):
+    writer = PartialWriter(tmp_path / "ch.partial.md", "pehla chunk\n\n")
+    writer.start()
+    writer.write("adhoora stream")
+    writer.start()
+    writer.write("doosra")
+    writer.keep()
+    writer.start()
+    assert writer.path.read_text(encoding="utf-8") == "pehla chunk\n\ndoosra"
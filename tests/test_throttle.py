@@ -0,0 +1,74 @@
+import time
+
+import pytest
+
+from src.throttle import AIMDController, get_controller
+
+
+def test_window_grows_by_one_per_full_window():
+    controller = AIMDController("test", "aimd-grow", initial=2, max=8)
+    controller.on_success(0.1)
+    controller.on_success(0.1)
+    assert controller.window == pytest.approx(2 + 1 / 2 + 1 / 2.5)
+
+
+def test_window_clamped_to_max():
+    controller = AIMDController("test", "aimd-max", initial=2, max=3)
+    for _ in range(50):
+        controller.on_success(0.1)
+    assert controller.window == 3
+
+
+def test_rate_limit_halves_once_per_rtt():
+    controller = AIMDController("test", "aimd-cut", initial=8, max=16)
+    controller.on_rate_limit()
+    assert controller.window == 4
+    # Same burst ka doosra 429: cut nahi
+    controller.on_rate_limit()
+    assert controller.window == 4
+
+
+def test_window_never_below_min():
+    controller = AIMDController("test", "aimd-min", initial=2, min=2)
+    controller.on_rate_limit()
+    assert controller.window == 2
+
+
+def test_latency_spike_after_warmup_cuts_window():
+    controller = AIMDController("test", "aimd-spike", initial=4, max=16, warmup_samples=3, latency_spike=2.0)
+    for _ in range(4):
+        controller.on_success(1.0)
+    before = controller.window
+    controller.on_success(5.0)
+    assert controller.window == pytest.approx(before * 0.5)
+    # Spike baseline me nahi ghusta
+    assert controller.latency_ewma == pytest.approx(1.0)
+
+
+def test_slot_reports_time_to_first_token():
+    controller = AIMDController("test", "aimd-ttft")
+    seen = []
+    controller.on_success = seen.append
+    with controller.slot() as timing:
+        timing.first_token()
+        time.sleep(0.05)
+    assert seen[0] < 0.05
+    assert controller.in_flight == 0
+
+
+def test_slot_failure_is_not_a_success():
+    controller = AIMDController("test", "aimd-fail")
+    seen = []
+    controller.on_success = seen.append
+    with pytest.raises(RuntimeError):
+        with controller.slot():
+            raise RuntimeError("boom")
+    assert seen == []
+    assert controller.in_flight == 0
+
+
+def test_get_controller_reconfigures_existing():
+    first = get_controller("test", "aimd-registry", max=4)
+    second = get_controller("test", "aimd-registry", max=10)
+    assert first is second
+    assert second.max_window == 10
@@ -0,0 +1,51 @@
+from src.validator import devanagari_ratio, glossary_compliance, validate_chunk
+
+
+SOURCE = "Bilbo Baggins lived in a hole in the ground under the hill."
+HINDI = "बिल्बो बैगिन्स पहाड़ी के नीचे ज़मीन के एक बिल में रहता था।"
+
+
+def test_devanagari_ratio_counts_matras():
+    assert devanagari_ratio(HINDI) == 1.0
+    assert devanagari_ratio("abc") == 0.0
+    assert devanagari_ratio("") == 0.0
+
+
+def test_good_translation_passes():
+    result = validate_chunk(SOURCE, HINDI)
+    assert result["ok"]
+    assert result["issues"] == []
+    assert result["score"] == 1.0
+
+
+def test_empty_output_fails():
+    result = validate_chunk(SOURCE, "   ")
+    assert not result["ok"]
+    assert result["issues"] == ["empty output"]
+
+
+def test_untranslated_output_fails_script_check():
+    result = validate_chunk(SOURCE, SOURCE)
+    assert not result["ok"]
+    assert "low devanagari ratio" in result["issues"][0]
+
+
+def test_length_ratio_bounds():
+    assert "too short" in validate_chunk(SOURCE * 4, HINDI)["issues"][0]
+    assert "too long" in validate_chunk(SOURCE, HINDI * 4)["issues"][0]
+
+
+def test_scaffolding_and_refusal_are_hard_fails():
+    leaked = validate_chunk(SOURCE, "---BEGIN--- " + HINDI)
+    assert not leaked["ok"] and leaked["score"] == 0.0
+    refused = validate_chunk(SOURCE, "I'm sorry " + HINDI)
+    assert not refused["ok"] and refused["score"] == 0.0
+
+
+def test_glossary_terms_enforced():
+    glossary = {"Bilbo": "बिल्बो", "hill": "टीला"}
+    ratio, missing = glossary_compliance(SOURCE, HINDI, glossary)
+    assert ratio == 0.5 and missing == ["hill"]
+    result = validate_chunk(SOURCE, HINDI, glossary=glossary)
+    assert not result["ok"]
+    assert validate_chunk(SOURCE, HINDI, glossary=glossary, settings={"min_glossary_ratio": 0.5})["ok"]
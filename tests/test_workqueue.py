@@ -0,0 +1,82 @@
+import time
+
+import pytest
+
+from src.workqueue import SQLiteBroker
+
+
+OK = {"ok": True, "score": 1.0, "issues": []}
+
+
+@pytest.fixture
+def broker(tmp_path):
+    return SQLiteBroker(tmp_path / "queue.sqlite", max_attempts=2)
+
+
+def test_chunks_leased_in_chapter_order(broker):
+    broker.enqueue("book", "ch01", ["one", "two"])
+    first = broker.lease("w1", ttl=60)
+    assert first["index"] == 0
+    # Pichla chunk done hone tak agla nahi milta
+    assert broker.lease("w2", ttl=60) is None
+    assert broker.complete(first["id"], first["token"], "एक", OK)
+    second = broker.lease("w2", ttl=60)
+    assert second["index"] == 1
+    assert second["previous_translated"] == "एक"
+
+
+def test_expired_lease_reclaimed_and_old_token_fenced(broker):
+    broker.enqueue("book", "ch01", ["one"])
+    stale = broker.lease("w1", ttl=0.01)
+    time.sleep(0.05)
+    fresh = broker.lease("w2", ttl=60)
+    assert fresh["id"] == stale["id"]
+    assert fresh["token"] != stale["token"]
+    assert not broker.heartbeat(stale["id"], stale["token"])
+    assert not broker.complete(stale["id"], stale["token"], "late", OK)
+    assert broker.complete(fresh["id"], fresh["token"], "एक", OK)
+    assert broker.chapter_tasks("book", "ch01")[0]["translation"] == "एक"
+
+
+def test_heartbeat_keeps_lease(broker):
+    broker.enqueue("book", "ch01", ["one"])
+    task = broker.lease("w1", ttl=0.2)
+    time.sleep(0.1)
+    assert broker.heartbeat(task["id"], task["token"], ttl=60)
+    time.sleep(0.15)
+    assert broker.lease("w2", ttl=60) is None
+
+
+def test_too_many_expiries_fail_the_chunk(broker):
+    broker.enqueue("book", "ch01", ["one"])
+    for _ in range(2):
+        assert broker.lease("w", ttl=0.01)
+        time.sleep(0.05)
+    assert broker.lease("w", ttl=60) is None
+    task = broker.chapter_tasks("book", "ch01")[0]
+    assert task["status"] == "done" and not task["ok"]
+
+
+def test_release_returns_task_without_using_attempt(broker):
+    broker.enqueue("book", "ch01", ["one"])
+    task = broker.lease("w1", ttl=60)
+    assert broker.release(task["id"], task["token"])
+    assert broker.lease("w2", ttl=60)["id"] == task["id"]
+
+
+def test_enqueue_keeps_done_and_resets_changed(broker):
+    broker.enqueue("book", "ch01", ["one"])
+    task = broker.lease("w", ttl=60)
+    broker.complete(task["id"], task["token"], "एक", OK)
+    assert broker.enqueue("book", "ch01", ["one"]) == 0
+    assert broker.enqueue("book", "ch01", ["one changed"]) == 1
+    assert broker.stats() == {"pending": 1}
+
+
+def test_shared_block_leased_once(broker):
+    broker.enqueue("book", "ch01", ["song"], dedup_keys=["k"])
+    broker.enqueue("book", "ch02", ["song"], dedup_keys=["k"])
+    task = broker.lease("w1", ttl=60)
+    assert broker.lease("w2", ttl=60) is None
+    broker.complete(task["id"], task["token"], "गीत", OK)
+    assert broker.shared_translation("book", "k") == ("गीत", OK)